@@ -0,0 +1,46 @@
+import argparse  # CLI flags
+import json  # machine-readable report
+
+import pandas as pd  # summary table
+
+from src.backtest import run_backtest
+
+FOLD_COLUMNS = [
+    "test_year",
+    "train_years",
+    "rows",
+    "log_rmse",
+    "outcome_accuracy",
+    "fit_seconds",
+    "predict_seconds",
+    "peak_rss_mb",
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Walk-forward backtest: train on earlier years, predict each year."
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=2,
+        help="training years before each test year (0 = all earlier years)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: one per fold, up to CPU count)"
+    )
+    parser.add_argument(
+        "--out", default="backtest_report.json", help="path for the JSON report"
+    )
+    args = parser.parse_args()
+
+    report = run_backtest(window=args.window, workers=args.workers)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBacktest folds:")
+    print(pd.DataFrame(report["folds"])[FOLD_COLUMNS].to_string(index=False))
+    print("\nSummary:")
+    print(json.dumps(report["summary"], indent=2))
+    print(f"\nReport written to {args.out} ({report['wall_seconds']:.1f}s wall)")
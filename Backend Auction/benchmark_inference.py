@@ -0,0 +1,103 @@
+import argparse  # CLI flags
+import json  # machine-readable output
+import os  # artifact paths
+import sys  # exit code
+import time  # wall-clock timings
+
+import numpy as np  # percentiles
+import pandas as pd  # results table
+from sklearn.pipeline import Pipeline  # the pre-export inference path
+
+from src.config import PREDICTION_YEAR
+from src.features import load_and_prepare_master
+from src.inference import NATIVE_MODEL_FILE, NativeLgbmPredictor
+from src.model import AuctionPriceModel
+from src.registry import resolve
+
+
+def time_calls(fn, repeats: int) -> dict:
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    ms = np.array(times) * 1e3
+    return {"p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99))}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="LightGBM inference: sklearn pipeline vs native Booster (parity + latency)."
+    )
+    parser.add_argument("--year", type=int, default=PREDICTION_YEAR)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000, help="rows in the batch benchmark")
+    parser.add_argument(
+        "--tolerance", type=float, default=1e-6, help="max |log-price diff| allowed"
+    )
+    parser.add_argument("--json", help="optional path for the raw results")
+    args = parser.parse_args()
+
+    resolved = resolve(args.year)
+    if resolved is None:
+        raise SystemExit(f"No trained model for {args.year}. Train it first.")
+    model_dir = resolved[1]
+    model = AuctionPriceModel()
+    model.load(model_dir)
+
+    # Before: preprocess + LightGBM through sklearn (the old lgbm_pipeline)
+    pipeline = Pipeline(
+        steps=[("preprocess", model.preprocessor), ("model", model.lgbm_model)]
+    )
+    # After: exported text model + encoding table (exported on the fly for
+    # artifacts saved before the export existed)
+    if os.path.exists(os.path.join(model_dir, NATIVE_MODEL_FILE)):
+        native = NativeLgbmPredictor.load(model_dir)
+    else:
+        native = NativeLgbmPredictor.from_model(model)
+
+    X = load_and_prepare_master()[model.feature_cols].reset_index(drop=True)
+    records = X.to_dict("records")
+
+    # Parity: whole table, batch and single-row paths
+    expected = pipeline.predict(X)
+    batch_diff = float(np.max(np.abs(native.predict_frame(X) - expected)))
+    row_diff = float(
+        max(abs(native.predict_row(r) - e) for r, e in zip(records, expected))
+    )
+
+    rng = np.random.default_rng(0)
+    X_batch = X.iloc[rng.integers(0, len(X), args.batch)].reset_index(drop=True)
+    one = X.iloc[[0]]
+    one_record = records[0]
+
+    results = pd.DataFrame(
+        [
+            {"case": "single_row", "path": "pipeline", **time_calls(lambda: pipeline.predict(one), args.repeats)},
+            {"case": "single_row", "path": "native", **time_calls(lambda: native.predict_row(one_record), args.repeats)},
+            {"case": f"{args.batch}_rows", "path": "pipeline", **time_calls(lambda: pipeline.predict(X_batch), max(args.repeats // 10, 5))},
+            {"case": f"{args.batch}_rows", "path": "native", **time_calls(lambda: native.predict_frame(X_batch), max(args.repeats // 10, 5))},
+        ]
+    )
+
+    parity_ok = max(batch_diff, row_diff) <= args.tolerance
+    print(f"Model: {model_dir}")
+    print(f"Parity vs pipeline (max |log diff|): batch={batch_diff:.3g} row={row_diff:.3g} "
+          f"-> {'OK' if parity_ok else 'FAILED'} (tolerance {args.tolerance:g})")
+    print(results.to_string(index=False))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "model_dir": model_dir,
+                    "batch_max_abs_diff": batch_diff,
+                    "row_max_abs_diff": row_diff,
+                    "parity_ok": parity_ok,
+                    "results": results.to_dict(orient="records"),
+                },
+                f,
+                indent=2,
+            )
+
+    sys.exit(0 if parity_ok else 1)
@@ -0,0 +1,101 @@
+import argparse  # CLI flags
+import itertools  # scenario grid
+import json  # machine-readable output
+import statistics  # medians
+import time  # wall-clock timings
+
+import pandas as pd  # results table
+
+from src.config import PREDICTION_YEAR
+from src.features import load_and_prepare_master
+from src.model import AuctionPriceModel
+from src.registry import resolve
+from src.squad import SquadCandidates, build_squad
+
+PURSES = [100_000_000, 250_000_000, 500_000_000, 1_000_000_000]  # INR
+SQUAD_SIZES = [9, 11, 15]
+OVERSEAS = [(1, 3), (2, 4)]  # (min_overseas, max_overseas)
+
+
+def run_benchmark(preds_df: pd.DataFrame, year: int, repeats: int) -> pd.DataFrame:
+    # Built once, like the API's prediction snapshot does
+    candidates = SquadCandidates(preds_df, year)
+
+    records = []
+    for purse, size, (min_os, max_os) in itertools.product(
+        PURSES, SQUAD_SIZES, OVERSEAS
+    ):
+        scenario = {
+            "total_purse": purse,
+            "squad_size": size,
+            "min_overseas": min_os,
+            "max_overseas": max_os,
+        }
+        for mode in ("greedy", "exact"):
+            latencies = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                squad_df, info = build_squad(
+                    preds_df, year=year, mode=mode, candidates=candidates, **scenario
+                )
+                latencies.append(time.perf_counter() - t0)
+            records.append(
+                {
+                    **scenario,
+                    "mode": mode,
+                    "status": info["status"],
+                    "players": len(squad_df),
+                    "spent": float(squad_df["predicted_price"].sum()),
+                    "total_impact": info["total_impact"],
+                    "median_ms": 1000 * statistics.median(latencies),
+                }
+            )
+    return pd.DataFrame(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare greedy vs exact squad selection (quality + latency)."
+    )
+    parser.add_argument("--year", type=int, default=PREDICTION_YEAR)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="optional path for the raw results")
+    args = parser.parse_args()
+
+    resolved = resolve(args.year)
+    if resolved is None:
+        raise SystemExit(f"No trained model for {args.year}. Train it first.")
+    model = AuctionPriceModel()
+    model.load(resolved[1])
+    preds_df = model.predict_prices(load_and_prepare_master())
+
+    results = run_benchmark(preds_df, args.year, args.repeats)
+
+    keys = ["total_purse", "squad_size", "min_overseas", "max_overseas"]
+    greedy = results[results["mode"] == "greedy"].set_index(keys)
+    exact = results[results["mode"] == "exact"].set_index(keys)
+    summary = pd.DataFrame(
+        {
+            "greedy_impact": greedy["total_impact"],
+            "exact_impact": exact["total_impact"],
+            "impact_gain_pct": 100 * (exact["total_impact"] / greedy["total_impact"] - 1),
+            "exact_status": exact["status"],
+            "greedy_ms": greedy["median_ms"],
+            "exact_ms": exact["median_ms"],
+        }
+    ).reset_index()
+
+    pd.set_option("display.width", 160)
+    print(summary.round(2).to_string(index=False))
+    print(
+        f"\nMedian latency: greedy {greedy['median_ms'].median():.2f} ms, "
+        f"exact {exact['median_ms'].median():.2f} ms"
+    )
+    print(
+        f"Mean impact gain of exact over greedy: "
+        f"{summary['impact_gain_pct'].mean():.1f}%"
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results.to_dict(orient="records"), f, indent=2)
@@ -0,0 +1,44 @@
+import argparse  # CLI flags
+import json  # pretty output
+
+from src import features, master_cache  # ingest switches, cache status
+from src.features import (  # master table + cache key inputs
+    SOURCE_PATHS,
+    load_and_prepare_master,
+    master_cache_version,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Inspect or rebuild the cached master table."
+    )
+    parser.add_argument(
+        "--load", action="store_true", help="load the master table (builds on miss)"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="force a rebuild from the CSVs"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="aggregate player_match_stats.csv in chunks (bounded memory)",
+    )
+    parser.add_argument(
+        "--clear", action="store_true", help="delete cached tables and manifest"
+    )
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f"Removed {master_cache.clear_cache()} cache file(s).")
+
+    if args.stream:
+        features.MATCH_STATS_STREAMING = True
+
+    if args.load or args.rebuild:
+        load_and_prepare_master(force_rebuild=args.rebuild)
+        print(json.dumps(master_cache.last_load_info, indent=2))
+        if features.last_ingest_report:
+            print(json.dumps(features.last_ingest_report, indent=2))
+    else:
+        status = master_cache.cache_status(SOURCE_PATHS, master_cache_version())
+        print(json.dumps(status, indent=2))
@@ -0,0 +1,58 @@
+import argparse  # CLI flags
+import sys
+import time
+
+from src.config import EXPORT_CHUNK_ROWS, PREDICTION_YEAR
+from src.export import EXPORT_FORMATS, encode_chunks, scored_chunks
+from src.features import load_and_prepare_master
+from src.model import AuctionPriceModel
+from src.registry import resolve
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Score every auction year with a registered model and stream the rows as NDJSON or Arrow IPC."
+    )
+    parser.add_argument("--year", type=int, default=PREDICTION_YEAR, help="prediction year of the model to use")
+    parser.add_argument(
+        "--years", default=None, help="comma-separated auction years to export (default: all)"
+    )
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS, help="rows scored per chunk")
+    parser.add_argument("--out", default="-", help="output path ('-' = stdout)")
+    args = parser.parse_args()
+
+    resolved = resolve(args.year)
+    if resolved is None:
+        sys.exit(f"No model registered for {args.year}. Run train.py (or POST /train?year={args.year}) first.")
+    key, model_dir = resolved
+
+    model = AuctionPriceModel()
+    model.load(model_dir)
+    master_df = load_and_prepare_master()
+    years = [int(y) for y in args.years.split(",")] if args.years else None
+
+    start = time.perf_counter()
+    rows = 0
+
+    def counted(chunks):
+        global rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    try:
+        chunks = scored_chunks(model, master_df, years=years, chunk_rows=args.chunk_rows)
+        for block in encode_chunks(counted(chunks), args.format):
+            out.write(block)
+        out.flush()
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    seconds = time.perf_counter() - start
+    print(
+        f"Exported {rows} rows with model {key.dirname} in {seconds:.2f}s "
+        f"({rows / seconds if seconds else 0:.0f} rows/s)",
+        file=sys.stderr,
+    )
@@ -1,24 +1,63 @@
 # main.py
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from typing import Optional
+import functools
+import math
 import os
+import time
 import pandas as pd
 import numpy as np
 
 from fastapi.middleware.cors import CORSMiddleware
-
-from src.model import AuctionPriceModel, train_full_model
-from src.features import load_and_prepare_master
-from src.squad import select_squad
-from src.config import MODEL_DIR, PREDICTION_YEAR
+from fastapi.responses import StreamingResponse
+
+from src.model import train_and_register
+from src.jobs import JobConflict, TrainingJob, TrainingJobs
+from src.registry import list_models
+from src.serving import ModelCache, ServingModel
+from src.snapshot import PredictionSnapshot
+from src.executor import BoundedExecutor
+from src.export import EXPORT_FORMATS, encode_chunks, frame_chunks
+from src.features import SOURCE_PATHS, master_cache_version
+from src.master_cache import cache_status
+from src.metrics import TABLE_RESPONSES, observe_request, render_latest, span
+from src.profiling import (
+    REQUEST_ID_HEADER,
+    ProfiledRoute,
+    profiles,
+    profiling_allowed,
+    start_session,
+)
+from src.squad import build_squad, constraint_errors, SQUAD_MODES, EXACT_TIME_LIMIT_SECONDS
+from src.schemas import PlayerBatchRequest, PlayerFeaturesRequest, SquadSweepRequest
+from src.table import CATEGORY_FILTERS, SORT_KEYS, TABLE_PAGE_SIZE, etag_matches
+from src.sweep import SWEEP_PARAMS, run_sweep, scenario_grid, shutdown_pool
+from src.training import shutdown_pool as shutdown_training_pool
+from src.config import (
+    COMPUTE_MAX_QUEUE,
+    COMPUTE_MAX_WORKERS,
+    EXACT_MAX_TIME_LIMIT_SECONDS,
+    EXPORT_CHUNK_ROWS,
+    HEAVY_MAX_QUEUE,
+    HEAVY_MAX_WORKERS,
+    MODEL_CACHE_MAX_LOADED,
+    MODEL_DIR,
+    PREDICTION_YEAR,
+    SWEEP_EXACT_MAX_SOLVER_SECONDS,
+    SWEEP_MAX_SCENARIOS,
+    SWEEP_MAX_WORKERS,
+)
 
 app = FastAPI(
     title="Auction ML Backend",
-    description="Hybrid LightGBM + KNN model for player price & squad selection (locked to 2025 predictions)",
+    description="Hybrid LightGBM + KNN model for player price & squad selection (per-year models, 2025 live)",
     version="1.0.0",
 )
 
+# Every route declared below can be profiled on request (see src/profiling.py)
+app.router.route_class = ProfiledRoute
+
 # --- CORS so React (Vite) can call this API ---
 app.add_middleware(
     CORSMiddleware,
@@ -28,252 +67,546 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global model instance reused across requests
-model = AuctionPriceModel()
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    Request latency histogram per route template (not per concrete path,
+    so /players/2025 and /players/2024 share a series).
+    """
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    observe_request(
+        request.method,
+        getattr(route, "path", "unmatched"),
+        response.status_code,
+        time.perf_counter() - start,
+    )
+    return response
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """
+    Opt-in profiling: with X-Profile: 1 (or ?profile=1) from an allowlisted
+    client, the endpoint runs under cProfile + tracemalloc and the report is
+    stored under the request id (X-Request-Id, generated if absent).
+    """
+    session = start_session(request)
+    response = await call_next(request)
+    if session is not None:
+        response.headers[REQUEST_ID_HEADER] = session.request_id
+        if session.report is not None:
+            profiles.put(session.report)
+            response.headers["X-Profile-Url"] = f"/profiles/{session.request_id}"
+    return response
+
+
+# Per-prediction-year models (model + scored snapshot + predictor), loaded
+# lazily from the registry and kept in a bounded LRU. Entries are always
+# replaced as a whole.
+models = ModelCache(max_loaded=MODEL_CACHE_MAX_LOADED)
 
-def model_files_exist() -> bool:
-    required = [
-        os.path.join(MODEL_DIR, "lgbm_price_model.joblib"),
-        os.path.join(MODEL_DIR, "knn_price_model.joblib"),
-        os.path.join(MODEL_DIR, "feature_columns.joblib"),
-        os.path.join(MODEL_DIR, "eff_threshold.joblib"),
-    ]
-    return all(os.path.exists(p) for p in required)
+# Background /train jobs (one at a time)
+training_jobs = TrainingJobs()
+
+# CPU-bound handler work runs on these, never on the event loop; beyond
+# workers + queue, requests get 503 (see src/executor.py). Cheap handlers
+# (health, lookups, /metrics) stay on the loop.
+compute = BoundedExecutor("compute", COMPUTE_MAX_WORKERS, COMPUTE_MAX_QUEUE)
+heavy = BoundedExecutor("heavy", HEAVY_MAX_WORKERS, HEAVY_MAX_QUEUE, kind="process")
+
+
+async def get_serving(year: int) -> ServingModel:
+    """
+    Serving model for `year`, or 400 if no model has been trained for it.
+    A model that is not loaded yet is loaded on the compute executor.
+    """
+    serving = models.get_loaded(year)
+    if serving is None:
+        try:
+            serving = await compute.run(models.get, year)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"❌ Error while loading model for {year}:", e)
+            raise HTTPException(status_code=500, detail=str(e))
+    if serving is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Models not trained yet for {year}. Call /train?year={year} first.",
+        )
+    return serving
+
+
+async def get_snapshot(year: int) -> PredictionSnapshot:
+    return (await get_serving(year)).snapshot
 
 
 @app.on_event("startup")
 def load_model_if_available() -> None:
     os.makedirs(MODEL_DIR, exist_ok=True)
 
-    if model_files_exist():
-        try:
-            model.load()
-            print("✅ Loaded pretrained models from disk.")
-        except Exception as e:
-            print("⚠️ Error while loading models on startup:", e)
+    # Warm the live year only; other years load on first request
+    try:
+        serving = models.get(PREDICTION_YEAR)
+    except Exception as e:
+        print("⚠️ Error while loading models on startup:", e)
+        return
+
+    if serving is not None:
+        print(
+            f"✅ Loaded pretrained models from disk "
+            f"({len(serving.snapshot)} players scored for {PREDICTION_YEAR})."
+        )
     else:
         print("⚠️ No pretrained models found. Call /train first.")
 
 
-@app.post("/train")
-def train_endpoint():
-    try:
-        preds_df = train_full_model()
+@app.on_event("shutdown")
+def stop_worker_pools() -> None:
+    compute.shutdown()
+    heavy.shutdown()
+    shutdown_pool()
+    shutdown_training_pool()
+    training_jobs.shutdown()
 
-        sold_mask = preds_df["final_price"] > 0
-        sold = preds_df.loc[sold_mask]
 
-        rmse_info = {}
-        if not sold.empty:
-            from sklearn.metrics import mean_squared_error
-            import math
-
-            rmse = math.sqrt(
-                mean_squared_error(
-                    sold["final_price"],
-                    sold["predicted_price"],
-                )
+def run_training(job: TrainingJob, year: int) -> dict:
+    """
+    Body of a background training job: train and register a model for
+    `year`, then hot-swap it into the model cache. Requests keep using the
+    old entry until the single put() below.
+    """
+    model, key, model_dir, preds_df = train_and_register(
+        prediction_year=year, progress=job.start_stage
+    )
+
+    job.start_stage("swap")
+    snapshot = PredictionSnapshot(preds_df, year=year)
+    snapshot.table()  # serialize the table before the new model goes live
+    models.put(ServingModel(key, model_dir, model, snapshot))
+
+    sold_mask = preds_df["final_price"] > 0
+    sold = preds_df.loc[sold_mask]
+
+    rmse_info = {}
+    if not sold.empty:
+        from sklearn.metrics import mean_squared_error
+        import math
+
+        rmse = math.sqrt(
+            mean_squared_error(
+                sold["final_price"],
+                sold["predicted_price"],
             )
-            rmse_info["rmse_on_sold"] = rmse
+        )
+        rmse_info["rmse_on_sold"] = rmse
+
+    return {
+        "message": f"Model trained and saved to {os.path.relpath(model_dir)}.",
+        **key.to_dict(),
+        "rows_trained_on": int(sold_mask.sum()),
+        **rmse_info,
+        "fit_timings": model.fit_timings_,
+    }
 
+
+@app.post("/train", status_code=202)
+async def train_endpoint(year: int = PREDICTION_YEAR):
+    """
+    Start training a model for prediction year `year` in the background
+    and return its job id right away. If a job for the same year is already
+    queued or running, that job is returned instead; a job for another year
+    gives 409 with its id.
+    """
+    try:
+        job, created = training_jobs.submit(
+            functools.partial(run_training, year=year), params={"year": year}
+        )
         return {
-            "status": "ok",
-            "message": "Model trained and saved to models/ directory.",
-            "rows_trained_on": int(sold_mask.sum()),
-            **rmse_info,
+            "job_id": job.id,
+            "status": job.status,
+            "created": created,
+            "message": (
+                "Training started." if created else "Training already in progress."
+            ),
+            "poll": f"/train/{job.id}",
         }
+    except JobConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": f"{e} Wait for it before training another year.",
+                "job_id": e.job.id,
+                "params": e.job.params,
+                "poll": f"/train/{e.job.id}",
+            },
+        )
     except Exception as e:
         print("❌ Error in /train:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/players/2025")
-def get_player_2025(name: str):
-    if not model_files_exist():
+@app.get("/train/{job_id}")
+async def train_status(job_id: str):
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job '{job_id}' not found.")
+    return job.to_dict()
+
+
+@app.post("/predict")
+async def predict_player(payload: PlayerFeaturesRequest, year: int = PREDICTION_YEAR):
+    """
+    Price and SOLD/UNSOLD for a hypothetical player from raw features, using
+    the model for prediction year `year` (single-row path: no DataFrame,
+    no table scan). At ~0.1 ms it runs inline: cheaper than an executor hop.
+    """
+    current = (await get_serving(year)).predictor
+    if current is None:
         raise HTTPException(
             status_code=400,
-            detail="Models not trained yet. Call /train first.",
+            detail="Models not trained yet (or trained before /predict existed). Call /train first.",
         )
 
     try:
-        model.load()
+        values = payload.model_dump(exclude={"name"})
+        result = current.predict(values)
 
-        master_df = load_and_prepare_master()
-        preds_df = model.predict_prices(master_df)
+        outcome = result["predicted_auction_outcome"]
+        return {
+            "name": payload.name,
+            "year": year,
+            "base_price": payload.base_price,
+            "predicted_auction_outcome": outcome,
+            "predicted_price": result["predicted_price"],
+            "predicted_price_lgbm": result["predicted_price_lgbm"],
+            "predicted_price_knn": result["predicted_price_knn"],
+            "impact_score": _finite_or_none(result["impact_score"]),
+            "efficiency_score": _finite_or_none(result["efficiency_score"]),
+        }
+    except Exception as e:
+        print("❌ Error in /predict:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return None if value is None or not np.isfinite(value) else float(value)
 
-        year_df = preds_df[preds_df["year"] == PREDICTION_YEAR].copy()
-        if year_df.empty:
+
+@app.get("/players/{year}")
+async def get_player(year: int, name: str):
+    current = await get_snapshot(year)
+
+    try:
+        if current.year_df.empty:
             raise HTTPException(
                 status_code=404,
-                detail=f"No players found for prediction year {PREDICTION_YEAR}.",
+                detail=f"No players found for prediction year {year}.",
             )
 
-        mask = year_df["name"].str.lower() == name.lower()
-        player_df = year_df[mask]
-
-        if player_df.empty:
+        record = current.get(name)
+        if record is None:
             raise HTTPException(
                 status_code=404,
-                detail=f"Player '{name}' not found for year {PREDICTION_YEAR}.",
+                detail=f"Player '{name}' not found for year {year}.",
             )
 
-        row = player_df.iloc[0]
-
-        outcome = row["predicted_auction_outcome"]
-        predicted_price = (
-            float(row["predicted_price"]) if outcome == "SOLD" else None
-        )
-
-        base_price = (
-            float(row["base_price"])
-            if "base_price" in row and not pd.isna(row["base_price"])
-            else None
-        )
+        return record
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in /players/{year}:", e)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        impact_score = (
-            float(row["impact_score"])
-            if "impact_score" in row and not pd.isna(row["impact_score"])
-            else None
-        )
 
-        efficiency_score = (
-            float(row["efficiency_score"])
-            if "efficiency_score" in row and not pd.isna(row["efficiency_score"])
-            else None
-        )
+@app.post("/players/{year}/batch")
+async def get_players_batch(year: int, payload: PlayerBatchRequest):
+    """
+    Look up many players of one year at once. Each entry in `players` has
+    the same fields as GET /players/{year}; unknown names are listed in
+    `not_found`.
+    """
+    current = await get_snapshot(year)
 
+    try:
+        players, not_found = await compute.run(current.get_many, payload.names)
         return {
-            "name": row["name"],
-            "year": int(row["year"]),
-            "base_price": base_price,
-            "predicted_auction_outcome": outcome,
-            "predicted_price": predicted_price,
-            "impact_score": impact_score,
-            "efficiency_score": efficiency_score,
+            "year": year,
+            "players": players,
+            "not_found": not_found,
         }
     except HTTPException:
         raise
     except Exception as e:
-        print("❌ Error in /players/2025:", e)
+        print(f"❌ Error in /players/{year}/batch:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/players/2025/table")
-def get_players_2025_table():
+@app.get("/players/{year}/{name}/comparables")
+async def get_player_comparables(year: int, name: str, k: int = Query(10, ge=1, le=100)):
     """
-    Return ALL 2025 players for the Auction table.
+    The k nearest historical sales to a player of prediction year `year`
+    in the KNN feature space, closest first, with their final prices.
     """
-    if not model_files_exist():
+    index = (await get_serving(year)).model.comparables_
+    if index is None:
         raise HTTPException(
             status_code=400,
-            detail="Models not trained yet. Call /train first.",
+            detail="Comparables index not built. Call /train first.",
         )
 
     try:
-        model.load()
+        comparables = await compute.run(index.query, name, k=k)
+        if comparables is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Player '{name}' not found for year {year}.",
+            )
+
+        return {
+            "name": name,
+            "year": year,
+            "k": len(comparables),
+            "comparables": comparables,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in /players/{year}/{{name}}/comparables:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/players/{year}/table")
+async def get_players_table(
+    year: int,
+    request: Request,
+    role: Optional[str] = Query(None, description="comma-separated roles"),
+    country_bucket: Optional[str] = Query(None, description="Indian / Overseas"),
+    outcome: Optional[str] = Query(None, description="SOLD / UNSOLD"),
+    min_base_price_cr: Optional[float] = None,
+    max_base_price_cr: Optional[float] = None,
+    min_predicted_price_cr: Optional[float] = None,
+    max_predicted_price_cr: Optional[float] = None,
+    min_impact_score: Optional[float] = None,
+    max_impact_score: Optional[float] = None,
+    min_efficiency_score: Optional[float] = None,
+    max_efficiency_score: Optional[float] = None,
+    sort: Optional[str] = Query(None, description=f"one of {SORT_KEYS}"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """
+    Return ALL players of prediction year `year` for the Auction table.
 
-        master_df = load_and_prepare_master()
-        preds_df = model.predict_prices(master_df)
+    The body is serialized once per model version (gzip / brotli variants
+    included) and served with a strong ETag; a matching If-None-Match gets
+    304 Not Modified. Retraining swaps in a new snapshot, and with it a
+    new payload and ETag.
 
-        year_df = preds_df[preds_df["year"] == PREDICTION_YEAR].copy()
-        if year_df.empty:
+    With any filter, sort, limit or cursor parameter, returns one page
+    instead: {"year", "players", "total", "next_cursor"}. Pass next_cursor
+    back (with the same filters and sort) for the following page.
+    """
+    current = await get_snapshot(year)
+
+    try:
+        if current.year_df.empty:
             raise HTTPException(
                 status_code=404,
-                detail=f"No players found for prediction year {PREDICTION_YEAR}.",
+                detail=f"No players found for prediction year {year}.",
             )
 
-        def to_crore(x):
-            if pd.isna(x):
-                return None
-            try:
-                return float(x) / 1e7
-            except Exception:
-                return None
-
-        if "base_price" in year_df.columns:
-            year_df["base_price_cr"] = year_df["base_price"].apply(to_crore)
-        else:
-            year_df["base_price_cr"] = None
-
-        if "predicted_price" in year_df.columns:
-            year_df["predicted_price_cr"] = year_df["predicted_price"].apply(
-                to_crore
-            )
-        else:
-            year_df["predicted_price_cr"] = None
-
-        out_cols = [
-            "name",
-            "role",
-            "country_bucket",
-            "base_price_cr",
-            "predicted_price_cr",
-            "impact_score",
-            "efficiency_score",
-            "predicted_auction_outcome",
-        ]
-        out_cols = [c for c in out_cols if c in year_df.columns]
-
-        raw_players = year_df[out_cols].to_dict(orient="records")
-
-        players = []
-        for rec in raw_players:
-            clean = {}
-            for k, v in rec.items():
-                if isinstance(v, (np.integer,)):
-                    clean[k] = int(v)
-                elif isinstance(v, (np.floating, float)):
-                    clean[k] = None if pd.isna(v) else float(v)
-                elif isinstance(v, pd.Timestamp):
-                    clean[k] = v.isoformat()
-                else:
-                    # plain Python types (str, bool, None, etc.) pass through
-                    clean[k] = v
-            players.append(clean)
+        # Built on first use after a model load (on the executor), then read
+        # directly, so a 304 revalidation never waits for or is shed by it
+        payload = current.cached_table()
+        if payload is None:
+            payload = await compute.run(current.table)
 
-        return {
-            "year": int(PREDICTION_YEAR),
-            "players": players,
+        filter_args = {
+            "role": role,
+            "country_bucket": country_bucket,
+            "outcome": outcome,
+        }
+        range_args = {
+            "base_price_cr": (min_base_price_cr, max_base_price_cr),
+            "predicted_price_cr": (min_predicted_price_cr, max_predicted_price_cr),
+            "impact_score": (min_impact_score, max_impact_score),
+            "efficiency_score": (min_efficiency_score, max_efficiency_score),
+        }
+        paged = (
+            any(v is not None for v in filter_args.values())
+            or any(lo is not None or hi is not None for lo, hi in range_args.values())
+            or sort is not None
+            or limit is not None
+            or cursor is not None
+        )
+        if paged:
+            categories = {
+                CATEGORY_FILTERS[param]: [v for v in value.split(",") if v.strip()]
+                for param, value in filter_args.items()
+                if value is not None
+            }
+            ranges = {
+                col: bounds
+                for col, bounds in range_args.items()
+                if bounds[0] is not None or bounds[1] is not None
+            }
+            try:
+                page = await compute.run(
+                    payload.index.query,
+                    categories,
+                    ranges,
+                    sort=sort or "row",
+                    order=order,
+                    limit=limit or TABLE_PAGE_SIZE,
+                    cursor=cursor,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return {"year": year, **page}
+        coding = payload.choose_encoding(request.headers.get("accept-encoding"))
+        etag = payload.etags[coding]
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",  # always revalidate (cheap 304)
         }
 
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            TABLE_RESPONSES.labels(status="304", encoding=coding).inc()
+            return Response(status_code=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        TABLE_RESPONSES.labels(status="200", encoding=coding).inc()
+        return Response(
+            content=payload.bodies[coding],
+            media_type="application/json",
+            headers=headers,
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
-        print("❌ Error in /players/2025/table:", e)
+        print(f"❌ Error in /players/{year}/table:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/squad/2025")
-def get_squad_2025(
+def _parse_years(years: Optional[str]) -> Optional[list[int]]:
+    if years is None or not years.strip():
+        return None
+    try:
+        return [int(y) for y in years.split(",") if y.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="years must be comma-separated integers.")
+
+
+@app.get("/export/{year}")
+async def export_predictions(
+    year: int,
+    fmt: str = Query("ndjson", alias="format", description=f"one of {list(EXPORT_FORMATS)}"),
+    years: Optional[str] = Query(None, description="comma-separated; default all years"),
+    chunk_rows: int = Query(EXPORT_CHUNK_ROWS, ge=1, le=100_000),
+):
+    """
+    Stream every row scored by the model for prediction year `year` (all
+    auction years unless `years` is given) as NDJSON or an Arrow IPC
+    stream, chunk_rows rows at a time.
+
+    Rows come from the already scored snapshot, so the first chunk goes out
+    right away and only one serialized chunk is held at a time. Chunks are
+    serialized on the compute executor; only the first one can be shed.
+    """
+    current = await get_snapshot(year)
+
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format '{fmt}'. Use one of {list(EXPORT_FORMATS)}.",
+        )
+    selected = _parse_years(years)
+
+    try:
+        chunks = frame_chunks(current.preds_df, years=selected, chunk_rows=chunk_rows)
+        blocks = encode_chunks(chunks, fmt)
+        first = await compute.run(next, blocks, None)
+
+        async def stream():
+            block = first
+            while block is not None:
+                yield block
+                block = await compute.run(next, blocks, None, shed=False)
+
+        extension = "ndjson" if fmt == "ndjson" else "arrows"
+        return StreamingResponse(
+            stream(),
+            media_type=EXPORT_FORMATS[fmt],
+            headers={
+                "Content-Disposition": f'attachment; filename="predictions-{year}.{extension}"'
+            },
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in /export/{year}:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/squad/{year}")
+async def get_squad(
+    year: int,
     total_purse: float = 500_000_000,
     squad_size: int = 9,
     max_overseas: int = 3,
     min_overseas: int = 1,
+    mode: str = "greedy",
+    time_limit: float = Query(EXACT_TIME_LIMIT_SECONDS, gt=0, le=EXACT_MAX_TIME_LIMIT_SECONDS),
 ):
-    if not model_files_exist():
+    """
+    Build a squad for prediction year `year` under purse / size / overseas
+    constraints.
+
+    mode=greedy: efficiency-ordered heuristic (fast).
+    mode=exact: integer program maximizing total impact_score within
+    `time_limit` seconds, falling back to greedy if no squad is found.
+    Exact solves run on the heavy (process) executor, greedy on compute.
+    """
+    current = await get_snapshot(year)
+
+    if mode not in SQUAD_MODES:
         raise HTTPException(
             status_code=400,
-            detail="Models not trained yet. Call /train first.",
+            detail=f"Unknown mode '{mode}'. Use one of {list(SQUAD_MODES)}.",
         )
+    errors = constraint_errors(squad_size, max_overseas, min_overseas, mode=mode)
+    if errors:
+        raise HTTPException(status_code=422, detail=" ".join(errors))
 
     try:
-        model.load()
-
-        master_df = load_and_prepare_master()
-        preds_df = model.predict_prices(master_df)
-
-        squad_df = select_squad(
-            preds_df,
-            year=PREDICTION_YEAR,
+        # The prebuilt candidates are all build_squad needs; the process
+        # pool gets them instead of the whole scored frame
+        executor = heavy if mode == "exact" else compute
+        squad_df, solve_info = await executor.run(
+            build_squad,
+            None if mode == "exact" else current.preds_df,
+            year=year,
             total_purse=total_purse,
             squad_size=squad_size,
             max_overseas=max_overseas,
             min_overseas=min_overseas,
+            mode=mode,
+            time_limit=time_limit,
+            candidates=current.squad_candidates,
         )
 
         total_spent = float(squad_df["predicted_price"].sum())
 
         return {
-            "year": PREDICTION_YEAR,
+            "year": year,
             "squad_size": int(len(squad_df)),
             "total_spent": total_spent,
             "purse_remaining": float(total_purse - total_spent),
@@ -282,6 +615,10 @@ def get_squad_2025(
             ),
             "min_overseas_target": min_overseas,
             "max_overseas": max_overseas,
+            "mode": solve_info["mode"],
+            "solver_status": solve_info["status"],
+            "solve_seconds": solve_info["solve_seconds"],
+            "total_impact": solve_info["total_impact"],
             "players": squad_df[
                 [
                     "name",
@@ -293,11 +630,193 @@ def get_squad_2025(
                 ]
             ].to_dict(orient="records"),
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        print("❌ Error in /squad/2025:", e)
+        print(f"❌ Error in /squad/{year}:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/squad/{year}/sweep")
+async def sweep_squad(year: int, payload: SquadSweepRequest):
+    """
+    Evaluate /squad/{year} over a grid of total_purse x squad_size x
+    max_overseas x min_overseas (lists or {start, stop, step} ranges).
+
+    Returns one column per metric, aligned with `scenarios`.
+
+    The sweep (which fans out to its own process pool) and the response
+    assembly run on the compute executor.
+    """
+    current = await get_snapshot(year)
+
+    if payload.mode not in SQUAD_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode '{payload.mode}'. Use one of {list(SQUAD_MODES)}.",
+        )
+
+    # Size the grid arithmetically first: a range like 0..1e12 step 1 must
+    # be rejected before any value list is built
+    counts = payload.axis_counts()
+    total = math.prod(counts.values())
+    if total == 0:
+        raise HTTPException(status_code=400, detail="Sweep grid is empty.")
+    too_big = [f"{name} has {n} values" for name, n in counts.items() if n > SWEEP_MAX_SCENARIOS]
+    if too_big or total > SWEEP_MAX_SCENARIOS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Sweep has {'; '.join(too_big) if too_big else f'{total} scenarios'}; "
+                f"the limit is {SWEEP_MAX_SCENARIOS}."
+            ),
+        )
+    scenarios = scenario_grid(payload.grid())
+    if payload.mode == "exact":
+        # Every solve may run to its time limit
+        worst_case = len(scenarios) * payload.time_limit / SWEEP_MAX_WORKERS
+        if worst_case > SWEEP_EXACT_MAX_SOLVER_SECONDS:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Exact sweep of {len(scenarios)} scenarios at time_limit "
+                    f"{payload.time_limit}s could take {worst_case:.0f}s; the limit is "
+                    f"{SWEEP_EXACT_MAX_SOLVER_SECONDS:.0f}s. Use fewer scenarios, a "
+                    f"lower time_limit or mode=greedy."
+                ),
+            )
+    # Constraint combinations (squad_size, max_overseas, min_overseas) that
+    # no candidate pool can meet
+    errors = {
+        key: constraint_errors(*key, mode=payload.mode) for key in {s[1:] for s in scenarios}
+    }
+    invalid = [s for s in scenarios if errors[s[1:]]]
+    if invalid:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"{len(invalid)} of {len(scenarios)} scenarios can never be met, "
+                f"e.g. {dict(zip(SWEEP_PARAMS, invalid[0]))}: "
+                + " ".join(errors[invalid[0][1:]])
+            ),
+        )
+
+    def sweep() -> dict:
+        start = time.perf_counter()
+        candidates = current.squad_candidates
+        results = run_sweep(
+            candidates,
+            scenarios,
+            mode=payload.mode,
+            time_limit=payload.time_limit,
+        )
+
+        def player_id(pos: int):
+            pid = candidates.player_ids[pos]
+            return None if np.isnan(pid) else int(pid)
+
+        player_ids = [[player_id(p) for p in r["positions"]] for r in results]
+        names = {}
+        for r in results:
+            for p in r["positions"]:
+                pid = player_id(p)
+                if pid is not None:
+                    names[str(pid)] = candidates.frame["name"].iat[p]
+
+        return {
+            "year": year,
+            "mode": payload.mode,
+            "params": SWEEP_PARAMS,
+            "scenario_count": len(scenarios),
+            "scenarios": [list(s) for s in scenarios],
+            "spend": [r["spend"] for r in results],
+            "impact": [r["impact"] for r in results],
+            "status": [r["status"] for r in results],
+            "player_ids": player_ids,
+            "players": names,
+            "elapsed_seconds": time.perf_counter() - start,
+        }
+
+    try:
+        return await compute.run(sweep)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in /squad/{year}/sweep:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/models")
+async def get_models():
+    """
+    Registered artifact sets (newest first) and the models currently loaded
+    in the LRU cache.
+    """
+    try:
+        return {
+            "registered": await compute.run(list_models),
+            "cache": models.status(),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("❌ Error in /models:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/cache/master")
+async def get_master_cache_status():
+    """
+    Master table cache: whether the next load would hit, and how the
+    last load in this process went (hit/miss, rebuild time).
+    """
+    try:
+        return await compute.run(cache_status, SOURCE_PATHS, master_cache_version())
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("❌ Error in /cache/master:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus metrics: per-stage and per-route latency histograms, model
+    and master cache hits / misses, model load times.
+    """
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+def require_profiling_client(request: Request) -> None:
+    client = request.client.host if request.client else None
+    if not profiling_allowed(client):
+        raise HTTPException(status_code=403, detail="Profiling is not enabled for this client.")
+
+
+@app.get("/profiles")
+async def list_profiles(request: Request):
+    """
+    Stored request profiles, newest first (allowlisted clients only).
+    """
+    require_profiling_client(request)
+    return {"profiles": profiles.list()}
+
+
+@app.get("/profiles/{request_id}")
+async def get_profile(request_id: str, request: Request):
+    """
+    One profile: top functions by cumulative and self time, pandas call
+    counts, and the largest allocations during the request.
+    """
+    require_profiling_client(request)
+    report = profiles.get(request_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"No profile stored for request {request_id}.")
+    return report
+
+
 @app.get("/")
-def health_check():
+async def health_check():
     return {"status": "ok", "message": "Auction ML API is running."}
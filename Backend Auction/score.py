@@ -0,0 +1,46 @@
+import argparse  # CLI flags
+import json  # machine-readable report
+import sys
+
+from src.bulk import score_file
+from src.config import BULK_SCORE_CHUNK_ROWS, PREDICTION_YEAR
+from src.registry import resolve
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Score a player file (CSV / Parquet / Feather) with a registered model and write Parquet or Feather."
+    )
+    parser.add_argument("input", help="player file: .csv[.gz], .parquet or .feather / .arrow")
+    parser.add_argument("output", help="output file: .parquet or .feather / .arrow")
+    parser.add_argument("--year", type=int, default=PREDICTION_YEAR, help="prediction year of the model to use")
+    parser.add_argument(
+        "--model-dir", default=None, help="artifact directory (default: the registered model for --year)"
+    )
+    parser.add_argument("--chunk-rows", type=int, default=BULK_SCORE_CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: BULK_SCORE_MAX_WORKERS, 1 = inline)"
+    )
+    args = parser.parse_args()
+
+    model_dir = args.model_dir
+    if model_dir is None:
+        resolved = resolve(args.year)
+        if resolved is None:
+            sys.exit(f"No model registered for {args.year}. Run train.py (or POST /train?year={args.year}) first.")
+        model_dir = resolved[1]
+
+    def progress(stats: dict) -> None:
+        print(
+            f"  chunk {stats['chunks']}: {stats['rows']} rows, {stats['rows_per_sec']:.0f} rows/s",
+            file=sys.stderr,
+        )
+
+    stats = score_file(
+        model_dir,
+        args.input,
+        args.output,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        progress=progress,
+    )
+    print(json.dumps({"model_dir": model_dir, "output": args.output, **stats}, indent=2))
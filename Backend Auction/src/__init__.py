@@ -0,0 +1,8 @@
+# The repo-root shared/ package (code both backends use) must be importable
+# however the app is started: uvicorn, pytest, scripts, spawned workers
+import os
+import sys
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
@@ -0,0 +1,278 @@
+# src/aggregation.py
+
+import joblib  # for saving/loading aggregator state
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+
+KEY_COLS = ["player_id", "player_name"]
+
+# Columns read from player_match_stats.csv
+INPUT_COLS = KEY_COLS + [
+    "match_id",
+    "runs_scored",
+    "balls_faced",
+    "overs_bowled",
+    "wicket_taken",
+    "runs_conceded",
+    "Dismissal_Status",
+]
+
+# Running-sum columns, in output order (matches_played is tracked separately)
+SUM_COLS = [
+    "innings_batted",
+    "innings_bowled",
+    "total_runs",
+    "total_balls_batted",
+    "total_wickets",
+    "total_balls_bowled",
+    "total_runs_conceded",
+    "outs",
+]
+
+# Sum column -> source column whose dtype decides int vs float output
+# (None: always an integer count)
+_SUM_SOURCES = {
+    "innings_batted": None,
+    "innings_bowled": None,
+    "total_runs": "runs_scored",
+    "total_balls_batted": "balls_faced",
+    "total_wickets": "wicket_taken",
+    "total_balls_bowled": None,
+    "total_runs_conceded": "runs_conceded",
+    "outs": None,
+}
+
+
+def overs_to_balls_series(s: pd.Series) -> pd.Series:
+    s = s.fillna(0)
+    overs = np.floor(s).astype(int)
+    balls = np.rint((s - overs) * 10).astype(int)
+    return overs * 6 + balls
+
+
+def _overs_to_balls(values: np.ndarray) -> np.ndarray:
+    # ndarray twin of overs_to_balls_series (cricket notation 3.4 = 3 overs 4 balls)
+    s = np.nan_to_num(values.astype(np.float64), nan=0.0)
+    overs = np.floor(s).astype(np.int64)
+    balls = np.rint((s - overs) * 10).astype(np.int64)
+    return overs * 6 + balls
+
+
+def _nan_if_zero(values: np.ndarray) -> np.ndarray:
+    return np.where(values == 0, np.nan, values)
+
+
+def rate_columns(matches: np.ndarray, totals: dict) -> dict:
+    """
+    Per-match / per-ball rates from the running totals (ndarray columns).
+    """
+    overs_total = totals["total_balls_bowled"] / 6.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "runs_per_match": totals["total_runs"] / matches,
+            "wickets_per_match": totals["total_wickets"] / matches,
+            "batting_average": totals["total_runs"] / _nan_if_zero(totals["outs"]),
+            "batting_strike_rate": (
+                100 * totals["total_runs"] / _nan_if_zero(totals["total_balls_batted"])
+            ),
+            "overs_bowled_total": overs_total,
+            "bowling_economy": (
+                totals["total_runs_conceded"] / _nan_if_zero(overs_total)
+            ),
+            "overs_per_match": overs_total / matches,
+        }
+
+
+def _row_contributions(cols: dict) -> np.ndarray:
+    """
+    Per-row contribution to each SUM_COLS total, shape (n_rows, len(SUM_COLS)).
+    Same NaN semantics as a pandas groupby: sums skip NaN, "> 0" counts
+    treat NaN as False and "!= 0" treats NaN as True.
+    """
+    balls_faced = cols["balls_faced"].astype(np.float64)
+    balls_bowled = _overs_to_balls(cols["overs_bowled"])
+
+    columns = [
+        balls_faced > 0,
+        balls_bowled > 0,
+        cols["runs_scored"],
+        balls_faced,
+        cols["wicket_taken"],
+        balls_bowled,
+        cols["runs_conceded"],
+        cols["Dismissal_Status"] != 0,
+    ]
+    return np.nan_to_num(
+        np.column_stack([np.asarray(c, dtype=np.float64) for c in columns]),
+        nan=0.0,
+    )
+
+
+class PlayerStatsAggregator:
+    """
+    Vectorized, incremental version of the per-player match aggregation.
+
+    State is one row per (player_id, player_name):
+    - running totals for SUM_COLS in a float64 array
+    - distinct match counts, backed by a sorted array of seen
+      (player row, match) pairs encoded as int64
+
+    update() folds in a batch of match rows and touches only the players
+    in that batch; to_frame() materializes the full aggregate table with
+    the same columns and values as build_aggregated_stats().
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._index: dict[tuple, int] = {}  # (player_id, player_name) -> row
+        self._keys: list[tuple] = []
+        self._sums = np.zeros((capacity, len(SUM_COLS)), dtype=np.float64)
+        self._matches = np.zeros(capacity, dtype=np.int64)
+
+        self._match_codes: dict = {}  # match_id -> dense int code
+        self._seen_pairs = np.empty(0, dtype=np.int64)  # sorted (row << 32 | match)
+
+        # Output columns that saw float input (otherwise emitted as int64)
+        self._float_cols: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._sums.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        sums = np.zeros((new_capacity, len(SUM_COLS)), dtype=np.float64)
+        sums[:capacity] = self._sums
+        matches = np.zeros(new_capacity, dtype=np.int64)
+        matches[:capacity] = self._matches
+        self._sums, self._matches = sums, matches
+
+    def _rows_for(self, uniques: list) -> np.ndarray:
+        """
+        Global row for each unique batch key, registering new players.
+        """
+        rows = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            row = self._index.get(key)
+            if row is None:
+                row = len(self._keys)
+                self._index[key] = row
+                self._keys.append(key)
+            rows[i] = row
+        self._grow(len(self._keys))
+        return rows
+
+    def _codes_for_matches(self, match_ids: np.ndarray) -> np.ndarray:
+        codes, uniques = pd.factorize(match_ids)  # NaN -> -1
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, match_id in enumerate(uniques.tolist()):
+            code = self._match_codes.get(match_id)
+            if code is None:
+                code = len(self._match_codes)
+                self._match_codes[match_id] = code
+            mapping[i] = code
+        if not len(mapping):
+            return codes.astype(np.int64)  # every match id missing
+        return np.where(codes >= 0, mapping[codes], -1)
+
+    def update(self, match_stats: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fold a batch of per-match rows into the running totals.
+
+        Returns the refreshed aggregate rows for the players in the batch.
+        """
+        return self._frame_for(self.add(match_stats))
+
+    def add(self, match_stats: pd.DataFrame) -> np.ndarray:
+        """
+        Fold a batch in without materializing a frame (bulk / streaming use).
+
+        Returns the internal rows of the players in the batch.
+        """
+        # Work on plain ndarrays: per-call pandas overhead dominates small batches
+        cols = {c: match_stats[c].to_numpy() for c in INPUT_COLS}
+        keep = ~(pd.isna(cols["player_id"]) | pd.isna(cols["player_name"]))
+        if not keep.all():
+            cols = {c: v[keep] for c, v in cols.items()}
+        if len(cols["player_id"]) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        for col, source in _SUM_SOURCES.items():
+            if source is not None and not np.issubdtype(cols[source].dtype, np.integer):
+                self._float_cols.add(col)
+
+        # Batch-local player codes from the two key columns
+        id_codes, id_uniques = pd.factorize(cols["player_id"])
+        name_codes, name_uniques = pd.factorize(cols["player_name"])
+        pair_uniques, codes = np.unique(
+            id_codes.astype(np.int64) * len(name_uniques) + name_codes,
+            return_inverse=True,
+        )
+        id_values = id_uniques.tolist()
+        name_values = name_uniques.tolist()
+        n_names = len(name_uniques)
+        uniques = [
+            (id_values[p // n_names], name_values[p % n_names])
+            for p in pair_uniques.tolist()
+        ]
+        rows = self._rows_for(uniques)
+
+        # Totals: one bincount per column over the batch-local player codes
+        contrib = _row_contributions(cols)
+        n_uniques = len(uniques)
+        for j in range(len(SUM_COLS)):
+            self._sums[rows, j] += np.bincount(
+                codes, weights=contrib[:, j], minlength=n_uniques
+            )
+
+        # Distinct matches: count only (player, match) pairs not seen before
+        match_codes = self._codes_for_matches(cols["match_id"])
+        valid = match_codes >= 0
+        pairs = np.unique((rows[codes[valid]] << 32) | match_codes[valid])
+        pos = np.searchsorted(self._seen_pairs, pairs)
+        if len(self._seen_pairs):
+            pos_clipped = np.minimum(pos, len(self._seen_pairs) - 1)
+            new = self._seen_pairs[pos_clipped] != pairs
+            pairs, pos = pairs[new], pos[new]
+        if len(pairs):
+            np.add.at(self._matches, pairs >> 32, 1)
+            # Merge into the sorted array in place of a full re-sort: one
+            # linear copy per batch, no O(n log n) over everything seen
+            self._seen_pairs = np.insert(self._seen_pairs, pos, pairs)
+
+        return rows
+
+    def _frame_for(self, rows: np.ndarray) -> pd.DataFrame:
+        # Same row order as groupby(KEY_COLS): sorted by the key tuple
+        rows = sorted(rows.tolist(), key=self._keys.__getitem__)
+        keys = [self._keys[r] for r in rows]
+
+        matches = self._matches[rows]
+        sums = self._sums[rows]
+        totals = {}
+        for j, col in enumerate(SUM_COLS):
+            values = sums[:, j]
+            totals[col] = values if col in self._float_cols else values.astype(np.int64)
+
+        columns = {
+            KEY_COLS[0]: [k[0] for k in keys],
+            KEY_COLS[1]: [k[1] for k in keys],
+            "matches_played": matches,
+            **totals,
+            **rate_columns(matches, totals),
+        }
+        return pd.DataFrame(columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Full aggregate table, one row per player, sorted by the key columns.
+        """
+        return self._frame_for(np.arange(len(self._keys), dtype=np.int64))
+
+    def save(self, path: str) -> None:
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "PlayerStatsAggregator":
+        return joblib.load(path)
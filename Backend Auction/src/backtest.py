@@ -0,0 +1,202 @@
+# src/backtest.py
+
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+
+from .config import BASE_DIR, FEATURE_SET_VERSION
+from .features import load_and_prepare_master, peak_rss_mb
+from .model import AuctionPriceModel
+from .training import lgbm_threads
+
+
+def backtest_folds(years, window: int = 2) -> list[dict]:
+    """
+    Walk-forward folds: every year with at least one earlier year is a test
+    year, trained on the `window` years before it (0 = all earlier years).
+    """
+    years = sorted(int(y) for y in set(years))
+    folds = []
+    for i, year in enumerate(years):
+        past = years[:i]
+        if not past:
+            continue
+        train_years = past if window <= 0 else past[-window:]
+        folds.append({"test_year": year, "train_years": train_years})
+    return folds
+
+
+def _rss_mb() -> float | None:
+    # Current resident set size (Linux only; None elsewhere)
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def evaluate_predictions(preds: pd.DataFrame) -> dict:
+    """
+    Quality metrics for one test year:
+    - log_rmse: RMSE of log1p(price) on players that actually sold
+    - outcome accuracy of SOLD/UNSOLD against final_price > 0
+    """
+    actual_sold = (preds["final_price"] > 0).to_numpy()
+    predicted_sold = (preds["predicted_auction_outcome"] == "SOLD").to_numpy()
+
+    sold = preds.loc[actual_sold]
+    if len(sold):
+        err = np.log1p(sold["predicted_price"].to_numpy()) - np.log1p(
+            sold["final_price"].to_numpy()
+        )
+        log_rmse = float(math.sqrt(np.mean(err**2)))
+    else:
+        log_rmse = None
+
+    n = len(preds)
+    return {
+        "rows": int(n),
+        "rows_sold": int(actual_sold.sum()),
+        "log_rmse": log_rmse,
+        "outcome_accuracy": float((actual_sold == predicted_sold).mean()) if n else None,
+        "sold_predicted_sold": int((actual_sold & predicted_sold).sum()),
+        "sold_predicted_unsold": int((actual_sold & ~predicted_sold).sum()),
+        "unsold_predicted_sold": int((~actual_sold & predicted_sold).sum()),
+        "unsold_predicted_unsold": int((~actual_sold & ~predicted_sold).sum()),
+    }
+
+
+def run_fold(
+    test_year: int,
+    train_years: list[int],
+    fit_workers: int | None = None,
+    fit_threads: int | None = None,
+) -> dict:
+    """
+    Train on train_years, predict test_year, and time both. Rows after
+    test_year are never seen. Meant to run in its own worker process, so
+    peak RSS is the fold's own peak.
+
+    fit_workers / fit_threads: processes and threads per fit for the
+    model's own CV / final-fit tasks (see AuctionPriceModel.fit).
+    """
+    t0 = time.perf_counter()
+    master_df = load_and_prepare_master()
+    master_df = master_df[master_df["year"] <= test_year]
+    load_seconds = time.perf_counter() - t0
+    rss_before_fit = _rss_mb()
+
+    model = AuctionPriceModel()
+    t0 = time.perf_counter()
+    cv_rmse_log = model.fit(
+        master_df,
+        train_years=train_years,
+        prediction_year=test_year,
+        workers=fit_workers,
+        n_jobs=fit_threads,
+    )
+    fit_seconds = time.perf_counter() - t0
+
+    test_df = master_df[master_df["year"] == test_year]
+    t0 = time.perf_counter()
+    preds = model.predict_prices(test_df)
+    predict_seconds = time.perf_counter() - t0
+
+    return {
+        "test_year": int(test_year),
+        "train_years": [int(y) for y in train_years],
+        **evaluate_predictions(preds),
+        "cv_rmse_log": float(cv_rmse_log),
+        "load_seconds": load_seconds,
+        "fit_seconds": fit_seconds,  # includes the 5-fold CV inside fit()
+        "fit_timings": model.fit_timings_,
+        "predict_seconds": predict_seconds,
+        "predict_rows_per_second": len(test_df) / predict_seconds if predict_seconds else None,
+        "rss_before_fit_mb": rss_before_fit,
+        "peak_rss_mb": peak_rss_mb(),
+        "pid": os.getpid(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_backtest(window: int = 2, workers: int | None = None) -> dict:
+    """
+    Run every walk-forward fold, in parallel worker processes, and return
+    a JSON-ready report.
+
+    Workers are spawned (not forked: LightGBM's OpenMP threads do not
+    survive a fork) and replaced after each fold, so each fold's memory
+    numbers are its own.
+    """
+    # Warm the master cache once so workers only memory-map it
+    years = load_and_prepare_master()["year"].dropna().unique()
+    folds = backtest_folds(years, window=window)
+    if not folds:
+        raise ValueError("Need at least two auction years to backtest.")
+
+    workers = workers or min(len(folds), os.cpu_count() or 1)
+    t0 = time.perf_counter()
+    if workers <= 1:
+        results = [run_fold(f["test_year"], f["train_years"]) for f in folds]
+    else:
+        # Folds already fill the cores: each fold trains inline, on its
+        # share of the threads
+        fit_threads = lgbm_threads(workers)
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, max_tasks_per_child=1
+        ) as pool:
+            futures = [
+                pool.submit(run_fold, f["test_year"], f["train_years"], 1, fit_threads)
+                for f in folds
+            ]
+            results = [fut.result() for fut in futures]
+    wall_seconds = time.perf_counter() - t0
+
+    def mean(key: str):
+        values = [r[key] for r in results if r[key] is not None]
+        return float(np.mean(values)) if values else None
+
+    return {
+        "generated_at": time.time(),
+        "git_commit": _git_commit(),
+        "feature_set_version": FEATURE_SET_VERSION,
+        "window": window,
+        "workers": workers,
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "wall_seconds": wall_seconds,
+        "summary": {
+            "folds": len(results),
+            "mean_log_rmse": mean("log_rmse"),
+            "mean_outcome_accuracy": mean("outcome_accuracy"),
+            "mean_fit_seconds": mean("fit_seconds"),
+            "mean_predict_seconds": mean("predict_seconds"),
+            "max_peak_rss_mb": max(
+                (r["peak_rss_mb"] for r in results if r["peak_rss_mb"] is not None),
+                default=None,
+            ),
+        },
+        "folds": results,
+    }
@@ -0,0 +1,261 @@
+# src/bulk.py
+
+import multiprocessing  # spawn context for the worker pool
+import os
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional
+
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+import pyarrow as pa  # Arrow IPC / Feather output
+import pyarrow.parquet as pq  # Parquet input / output
+
+from .aggregation import rate_columns
+from .config import BULK_SCORE_CHUNK_ROWS, BULK_SCORE_MAX_WORKERS
+from .export import EXPORT_SCHEMA, export_frame
+from .inference import RATE_INPUTS
+from .model import IMPACT_STAT_COLS, AuctionPriceModel, minmax_stats
+from .training import lgbm_threads
+
+INPUT_FORMATS = {
+    ".csv": "csv",
+    ".gz": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "arrow",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+}
+OUTPUT_FORMATS = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+# Model loaded once per worker process (see _init_worker)
+_worker_model: Optional[AuctionPriceModel] = None
+
+
+def file_format(path: str, formats: dict) -> str:
+    ext = os.path.splitext(path.lower())[1]
+    if ext not in formats:
+        raise ValueError(f"Unsupported file type '{ext}' for {path}. Use one of {sorted(formats)}.")
+    return formats[ext]
+
+
+def read_chunks(path: str, chunk_rows: int = BULK_SCORE_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Input rows chunk_rows at a time, without reading the whole file:
+    CSV via chunked read_csv, Parquet batch by batch, Feather / Arrow IPC
+    files memory-mapped.
+    """
+    fmt = file_format(path, INPUT_FORMATS)
+    if fmt == "csv":
+        # round_trip: parse floats exactly as written, so a stat on a split
+        # threshold scores the same as it would from the master table
+        yield from pd.read_csv(path, chunksize=chunk_rows, float_precision="round_trip")
+    elif fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for start in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(start, chunk_rows).to_pandas()
+
+
+def prepare_features(model: AuctionPriceModel, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Make an arbitrary player file scoreable: add missing feature columns as
+    missing values (imputed like at training time), country_bucket from
+    country, and rate stats from matches_played + totals where not given.
+    """
+    df = df.copy()
+    if "country_bucket" not in df.columns and "country" in df.columns:
+        df["country_bucket"] = np.where(df["country"].fillna("") == "India", "Indian", "Overseas")
+
+    for col in model.feature_cols:
+        if col not in df.columns:
+            df[col] = np.nan
+        if col in model.categorical_features:
+            # Strings, missing kept as NaN (imputed like at training time);
+            # astype(str) alone turns NaN into "nan" on pandas 2
+            missing = df[col].isna()
+            df[col] = df[col].astype(str).astype(object).where(~missing, np.nan)
+        else:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # Each rate from the inputs it needs; absent inputs leave it NaN
+    def column(c: str) -> np.ndarray:
+        if c not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[c], errors="coerce").to_numpy(np.float64)
+
+    totals = {c: column(c) for c in RATE_INPUTS}
+    rates = rate_columns(column("matches_played"), totals)
+    for col, values in rates.items():
+        df[col] = df[col].fillna(pd.Series(values, index=df.index))
+    return df
+
+
+def file_norm_stats(model: AuctionPriceModel, input_path: str, chunk_rows: int) -> dict:
+    """
+    Impact normalization (min, max) per IMPACT_STAT_COLS column over the
+    whole input file, in one extra pass.
+
+    For models saved before norm_stats existed: predict_prices would
+    otherwise normalize every chunk over itself.
+    """
+    lows = {col: [] for col in IMPACT_STAT_COLS}
+    highs = {col: [] for col in IMPACT_STAT_COLS}
+    for chunk in read_chunks(input_path, chunk_rows):
+        df = prepare_features(model, chunk)
+        for col in IMPACT_STAT_COLS:
+            low, high = minmax_stats(df[col])
+            if not np.isnan(low):
+                lows[col].append(low)
+                highs[col].append(high)
+    return {
+        col: (min(lows[col]), max(highs[col])) if lows[col] else (np.nan, np.nan)
+        for col in IMPACT_STAT_COLS
+    }
+
+
+def _init_worker(model_dir: str, n_jobs: int, norm_stats: Optional[dict] = None) -> None:
+    global _worker_model
+    model = AuctionPriceModel()
+    model.load(model_dir)
+    if model.norm_stats_ is None:
+        model.norm_stats_ = norm_stats
+    # Several workers predict at once: split the cores between them
+    model.lgbm_model.set_params(n_jobs=n_jobs)
+    model.knn_model.set_params(n_jobs=n_jobs)
+    if model.native_lgbm_ is not None:
+        model.native_lgbm_.n_jobs = n_jobs
+    _worker_model = model
+
+
+def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Worker task: predictions, impact and efficiency for one input chunk,
+    as EXPORT_SCHEMA columns.
+    """
+    model = _worker_model
+    return export_frame(model.predict_prices(prepare_features(model, chunk)))
+
+
+class ColumnarWriter:
+    """
+    Streams chunks into a Parquet or Feather (Arrow IPC) file, written to a
+    temporary path and moved into place on close.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.format = file_format(path, OUTPUT_FORMATS)
+        self.tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(self.tmp_path, EXPORT_SCHEMA, compression="zstd")
+        else:
+            self._sink = pa.OSFile(self.tmp_path, "wb")
+            self._writer = pa.ipc.new_file(
+                self._sink, EXPORT_SCHEMA, options=pa.ipc.IpcWriteOptions(compression="lz4")
+            )
+
+    def write(self, frame: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(frame, schema=EXPORT_SCHEMA, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+        if self.format == "feather":
+            self._sink.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        try:
+            self._writer.close()
+            if self.format == "feather":
+                self._sink.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+
+def score_file(
+    model_dir: str,
+    input_path: str,
+    output_path: str,
+    chunk_rows: int = BULK_SCORE_CHUNK_ROWS,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Score every row of input_path with the model in model_dir and write
+    the results to output_path (.parquet or .feather).
+
+    Chunks are scored in `workers` spawned processes (1 = inline), at most
+    2 x workers chunks in flight, and written in input order, so memory is
+    bounded by a few chunks however large the input is.
+
+    Models without fitted impact normalization (older artifacts) get it
+    computed over the whole input first (file_norm_stats), so chunking does
+    not change their scores.
+
+    progress(stats) is called after each chunk is written.
+    """
+    workers = max(1, int(workers or BULK_SCORE_MAX_WORKERS))
+    n_jobs = lgbm_threads(workers)
+    start = time.perf_counter()
+    stats = {"rows": 0, "chunks": 0, "seconds": 0.0, "rows_per_sec": 0.0, "workers": workers}
+
+    model = AuctionPriceModel()
+    model.load(model_dir)
+    norm_stats = None
+    if model.norm_stats_ is None:
+        print(
+            "Model has no fitted impact normalization; computing it over the input file.",
+            file=sys.stderr,
+        )
+        norm_stats = file_norm_stats(model, input_path, chunk_rows)
+    del model
+
+    writer = ColumnarWriter(output_path)
+
+    def write(frame: pd.DataFrame) -> None:
+        writer.write(frame)
+        stats["rows"] += len(frame)
+        stats["chunks"] += 1
+        stats["seconds"] = time.perf_counter() - start
+        stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        if progress is not None:
+            progress(dict(stats))
+
+    try:
+        if workers == 1:
+            _init_worker(model_dir, n_jobs, norm_stats)
+            for chunk in read_chunks(input_path, chunk_rows):
+                write(score_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_dir, n_jobs, norm_stats),
+            ) as pool:
+                pending = deque()
+                for chunk in read_chunks(input_path, chunk_rows):
+                    pending.append(pool.submit(score_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    except BaseException:
+        writer.abort()
+        raise
+
+    writer.close()
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
@@ -0,0 +1,106 @@
+# src/comparables.py
+
+from typing import Optional
+
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+from sklearn.neighbors import KDTree  # exact nearest-neighbour index
+
+from .config import PREDICTION_YEAR
+from .snapshot import normalize_name
+
+# Columns returned with each comparable sale
+COMPARABLE_COLS = ["name", "year", "role", "country_bucket", "base_price", "final_price"]
+
+
+def _json_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating,)):
+        return float(value)
+    return value
+
+
+class ComparablesIndex:
+    """
+    Nearest historical sales in the KNN feature space (the shared
+    preprocessor's output, i.e. what the KNN regressor sees).
+
+    - tree: KDTree over transformed rows of SOLD players from years before
+      the prediction year
+    - sales: one record per indexed row (name, year, role, prices)
+    - queries: normalized name -> transformed prediction-year row, so a
+      lookup never re-transforms the table
+
+    Built at train time from the fitted preprocessor and saved with the model.
+    """
+
+    def __init__(
+        self,
+        X_sales: np.ndarray,
+        sales: list[dict],
+        query_rows: np.ndarray,
+        query_names: list[str],
+        year: int = PREDICTION_YEAR,
+        leaf_size: int = 16,
+    ) -> None:
+        self.year = int(year)
+        self.tree = KDTree(np.ascontiguousarray(X_sales, dtype=np.float64), leaf_size=leaf_size)
+        self.sales = sales
+
+        self.query_rows = np.ascontiguousarray(query_rows, dtype=np.float64)
+        self.query_index: dict[str, int] = {}
+        for i, name in enumerate(query_names):
+            # First row per name wins, like the snapshot lookups
+            self.query_index.setdefault(normalize_name(name), i)
+
+    @classmethod
+    def build(
+        cls,
+        preprocessor,
+        feature_cols: list[str],
+        master_df: pd.DataFrame,
+        year: int = PREDICTION_YEAR,
+    ) -> "ComparablesIndex":
+        X_all = preprocessor.transform(master_df[feature_cols])
+        if hasattr(X_all, "toarray"):
+            X_all = X_all.toarray()
+
+        sold = ((master_df["final_price"] > 0) & (master_df["year"] < year)).to_numpy()
+        current = (master_df["year"] == year).to_numpy()
+
+        cols = [c for c in COMPARABLE_COLS if c in master_df.columns]
+        sales = [
+            {c: _json_value(v) for c, v in rec.items()}
+            for rec in master_df.loc[sold, cols].to_dict("records")
+        ]
+        return cls(
+            X_all[sold],
+            sales,
+            X_all[current],
+            master_df.loc[current, "name"].tolist(),
+            year=year,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sales)
+
+    def query(self, name: str, k: int = 10) -> Optional[list[dict]]:
+        """
+        k nearest historical sales for a prediction-year player, closest
+        first, or None if the name is not in the prediction year.
+        """
+        i = self.query_index.get(normalize_name(name))
+        if i is None:
+            return None
+
+        k = min(k, len(self.sales))
+        if k <= 0:
+            return []
+        dist, ind = self.tree.query(self.query_rows[i : i + 1], k=k)
+        return [
+            {**self.sales[j], "distance": float(d)}
+            for d, j in zip(dist[0].tolist(), ind[0].tolist())
+        ]
@@ -5,14 +5,62 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 MODEL_DIR = os.path.join(BASE_DIR, "models")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
 
 PLAYERS_PATH = os.path.join(DATA_DIR, "players.csv")
 MATCH_STATS_PATH = os.path.join(DATA_DIR, "player_match_stats.csv")
 AUCTION_SUMMARY_PATH = os.path.join(DATA_DIR, "auction_summary.csv")
 
+# Streaming ingest of player_match_stats.csv (bounded memory, chunked reads)
+MATCH_STATS_STREAMING = False
+MATCH_STATS_CHUNKSIZE = 500_000  # rows per chunk
+
+# Master table cache (Arrow IPC file keyed by the source CSVs' content)
+MASTER_CACHE_ENABLED = True
+
 # Efficiency unsold percentile
 EFFICIENCY_UNSOLD_PERCENTILE = 0.25
 
+# Model registry: one directory per (train years, prediction year, feature set)
+REGISTRY_DIR = os.path.join(MODEL_DIR, "registry")
+FEATURE_SET_VERSION = "1"  # bump when model features change
+MODEL_CACHE_MAX_LOADED = 3  # models kept in memory (LRU)
+
+# Training: CV folds and the final LightGBM / KNN fits run concurrently
+TRAIN_MAX_WORKERS = os.cpu_count() or 1  # worker processes (1 = inline)
+
+# On-demand request profiling (X-Profile: 1 header or ?profile=1).
+# Comma-separated client hosts allowed to use it; "*" = any, empty = off.
+PROFILING_ALLOWED_CLIENTS = [
+    h.strip() for h in os.environ.get("AUCTION_PROFILING_ALLOWED_CLIENTS", "").split(",") if h.strip()
+]
+PROFILE_STORE_SIZE = 50  # reports kept in memory, newest first
+PROFILE_TOP_N = 25  # rows per table in a report
+
+# Request executors: CPU-bound handler work runs here, off the event loop.
+# Calls beyond workers + queue are shed with 503 (Retry-After below).
+COMPUTE_MAX_WORKERS = max(2, os.cpu_count() or 1)  # threads: pandas / lookups
+COMPUTE_MAX_QUEUE = 32
+HEAVY_MAX_WORKERS = os.cpu_count() or 1  # processes: exact squad solves
+HEAVY_MAX_QUEUE = 8
+OVERLOAD_RETRY_AFTER_SECONDS = 1
+
+# Prediction exports (/export/{year}, export.py): rows per streamed chunk
+EXPORT_CHUNK_ROWS = 5_000
+
+# Offline bulk scoring (score.py): rows per chunk, worker processes
+BULK_SCORE_CHUNK_ROWS = 50_000
+BULK_SCORE_MAX_WORKERS = os.cpu_count() or 1  # 1 = inline
+
 # 🔒 HARD-LOCKED TRAIN & PREDICTION YEARS
-TRAIN_YEARS = [2023, 2024]   # model learns from these years' sold players
-PREDICTION_YEAR = 2025       # ALL predictions exposed by API are for 2025 only
+TRAIN_YEARS = [2023, 2024]   # model learns from these years' sold players (for PREDICTION_YEAR)
+PREDICTION_YEAR = 2025       # default / live prediction year
+
+# Exact (MILP) squad solves: largest time_limit a request may ask for
+EXACT_MAX_TIME_LIMIT_SECONDS = 30.0
+
+# Squad scenario sweeps (/squad/2025/sweep)
+SWEEP_MAX_WORKERS = os.cpu_count() or 1  # worker processes
+SWEEP_MAX_SCENARIOS = 20_000  # reject larger grids
+SWEEP_EXACT_MAX_SOLVER_SECONDS = 300.0  # exact sweeps: worst-case scenarios x time_limit / workers
+SWEEP_INLINE_MAX_SCENARIOS = 256  # greedy grids up to this size skip the pool
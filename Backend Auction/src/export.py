@@ -0,0 +1,154 @@
+# src/export.py
+
+import io
+from typing import Iterable, Iterator, Optional
+
+import numpy as np  # row positions
+import pandas as pd  # dataframes
+import pyarrow as pa  # Arrow IPC stream
+
+from .config import EXPORT_CHUNK_ROWS
+from .metrics import span  # per-stage latency histograms
+
+# Columns of a prediction export, in output order, with their Arrow types
+EXPORT_SCHEMA = pa.schema(
+    [
+        ("player_id", pa.int64()),
+        ("name", pa.string()),
+        ("year", pa.int64()),
+        ("role", pa.string()),
+        ("country_bucket", pa.string()),
+        ("base_price", pa.float64()),
+        ("final_price", pa.float64()),
+        ("predicted_price", pa.float64()),
+        ("predicted_price_lgbm", pa.float64()),
+        ("predicted_price_knn", pa.float64()),
+        ("batting_impact", pa.float64()),
+        ("bowling_impact", pa.float64()),
+        ("impact_score", pa.float64()),
+        ("efficiency_score", pa.float64()),
+        ("predicted_unsold_flag", pa.bool_()),
+        ("predicted_auction_outcome", pa.string()),
+    ]
+)
+EXPORT_COLUMNS = EXPORT_SCHEMA.names
+
+# format -> media type
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    predict_prices output reduced to EXPORT_COLUMNS (missing columns as
+    nulls), with player_id as a nullable integer.
+    """
+    out = df.reindex(columns=EXPORT_COLUMNS)
+    out["player_id"] = pd.to_numeric(out["player_id"], errors="coerce").round().astype("Int64")
+    for field in EXPORT_SCHEMA:
+        if pa.types.is_floating(field.type):
+            out[field.name] = pd.to_numeric(out[field.name], errors="coerce").astype(np.float64)
+    return out
+
+
+def row_chunks(
+    df: pd.DataFrame,
+    years: Optional[list[int]] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Rows of df (optionally only `years`), chunk_rows at a time.
+    """
+    if years is None:
+        positions = np.arange(len(df))
+    else:
+        positions = np.flatnonzero(df["year"].isin(years).to_numpy())
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start : start + chunk_rows]]
+
+
+def frame_chunks(
+    preds_df: pd.DataFrame,
+    years: Optional[list[int]] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Export chunks of an already scored frame (e.g. a snapshot's preds_df).
+    Only the current chunk is copied.
+    """
+    for chunk in row_chunks(preds_df, years, chunk_rows):
+        yield export_frame(chunk)
+
+
+def scored_chunks(
+    model,
+    master_df: pd.DataFrame,
+    years: Optional[list[int]] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Score master_df with `model` chunk_rows at a time, so only one chunk of
+    predictions is held in memory.
+
+    Chunks give the same scores as one predict_prices call because impact
+    normalization uses the model's fitted stats; older artifacts without
+    them are scored in one piece.
+    """
+    if model.norm_stats_ is None:
+        chunk_rows = max(len(master_df), 1)
+    for chunk in row_chunks(master_df, years, chunk_rows):
+        with span("export.score"):
+            scored = model.predict_prices(chunk)
+        yield export_frame(scored)
+
+
+def ndjson_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    One JSON object per row (NaN as null), one bytes block per chunk.
+    """
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        with span("export.ndjson"):
+            text = chunk.to_json(
+                orient="records", lines=True, double_precision=15, force_ascii=False
+            )
+            if not text.endswith("\n"):
+                text += "\n"
+        yield text.encode("utf-8")
+
+
+def arrow_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Arrow IPC stream: the schema message first (before any row is scored),
+    then one record batch per chunk, then the end-of-stream marker.
+    """
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    writer = pa.ipc.new_stream(sink, EXPORT_SCHEMA)
+    yield drain()
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        with span("export.arrow"):
+            batch = pa.RecordBatch.from_pandas(chunk, schema=EXPORT_SCHEMA, preserve_index=False)
+            writer.write_batch(batch)
+        yield drain()
+    writer.close()
+    yield drain()
+
+
+def encode_chunks(chunks: Iterable[pd.DataFrame], fmt: str) -> Iterator[bytes]:
+    if fmt == "ndjson":
+        return ndjson_chunks(chunks)
+    if fmt == "arrow":
+        return arrow_chunks(chunks)
+    raise ValueError(f"Unknown export format '{fmt}'. Use one of {list(EXPORT_FORMATS)}.")
@@ -1,47 +1,160 @@
+import sys
+import time
+
 import numpy as np  # numeric arrays
 import pandas as pd  # dataframes
-from .config import PLAYERS_PATH, MATCH_STATS_PATH, AUCTION_SUMMARY_PATH  # paths
+from .config import (  # paths + ingest / cache switches
+    PLAYERS_PATH,
+    MATCH_STATS_PATH,
+    AUCTION_SUMMARY_PATH,
+    MATCH_STATS_STREAMING,
+    MATCH_STATS_CHUNKSIZE,
+    MASTER_CACHE_ENABLED,
+)
+from .master_cache import load_or_build  # on-disk master table cache
+from .metrics import span  # per-stage latency histograms
+from .aggregation import (  # incremental per-player aggregation
+    INPUT_COLS,
+    PlayerStatsAggregator,
+    overs_to_balls_series,
+)
+
+try:
+    import resource  # peak RSS (POSIX only)
+except ImportError:
+    resource = None
+
+SOURCE_PATHS = [PLAYERS_PATH, MATCH_STATS_PATH, AUCTION_SUMMARY_PATH]
+DATE_OF_BIRTH_FORMAT = "%d/%m/%y"  # players.csv stores e.g. 24/01/02
+
+# Bump when build_master() output changes so cached tables are rebuilt
+MASTER_SCHEMA_VERSION = "2"
+
+# Narrow dtypes for the streaming reader: float32 keeps NaN-able stat columns
+# at 4 bytes, nullable Int32 ids tolerate missing values (those rows are
+# dropped or skipped exactly as in the in-memory path)
+MATCH_STATS_DTYPES = {
+    "match_id": "Int32",
+    "player_id": "Int32",
+    "runs_scored": "float32",
+    "balls_faced": "float32",
+    "overs_bowled": "float32",
+    "wicket_taken": "float32",
+    "runs_conceded": "float32",
+    "Dismissal_Status": "float32",
+}
+
+# Report from the most recent streaming ingest in this process
+last_ingest_report: dict = {}
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Peak resident set size of this process so far, in MB (None on Windows).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
 
 
-def overs_to_balls_series(s: pd.Series) -> pd.Series:
-    s = s.fillna(0)
-    overs = np.floor(s).astype(int)
-    balls = np.rint((s - overs) * 10).astype(int)
-    return overs * 6 + balls
+def build_aggregated_stats(match_stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-player career totals and rates from per-match rows.
 
+    Runs through PlayerStatsAggregator (vectorized bincounts instead of
+    per-group Python lambdas); keep an aggregator around and call update()
+    to fold in new matches without recomputing everyone.
+    """
+    aggregator = PlayerStatsAggregator()
+    aggregator.update(match_stats)
+    return aggregator.to_frame()
+
+
+def master_cache_version() -> str:
+    """
+    Cache key version for the master table: the schema version plus the
+    ingest mode, so tables built by either path are never mixed up.
+    """
+    mode = "stream" if MATCH_STATS_STREAMING else "memory"
+    return f"{MASTER_SCHEMA_VERSION}-{mode}"
 
-def build_aggregated_stats(match_stats: pd.DataFrame) -> pd.DataFrame:
-    df = match_stats.copy()
-    df["balls_bowled"] = overs_to_balls_series(df["overs_bowled"])
-
-    agg = (
-        df.groupby(["player_id", "player_name"])
-        .agg(
-            matches_played=("match_id", "nunique"),
-            innings_batted=("balls_faced", lambda x: (x > 0).sum()),
-            innings_bowled=("balls_bowled", lambda x: (x > 0).sum()),
-            total_runs=("runs_scored", "sum"),
-            total_balls_batted=("balls_faced", "sum"),
-            total_wickets=("wicket_taken", "sum"),
-            total_balls_bowled=("balls_bowled", "sum"),
-            total_runs_conceded=("runs_conceded", "sum"),
-            outs=("Dismissal_Status", lambda x: (x != 0).sum()),
-        )
-        .reset_index()
-    )
 
-    agg["runs_per_match"] = agg["total_runs"] / agg["matches_played"]
-    agg["wickets_per_match"] = agg["total_wickets"] / agg["matches_played"]
-    agg["batting_average"] = agg["total_runs"] / agg["outs"].replace(0, np.nan)
-    agg["batting_strike_rate"] = (
-        100 * agg["total_runs"] / agg["total_balls_batted"].replace(0, np.nan)
+def _as_read_csv_dtypes(chunk: pd.DataFrame) -> tuple[pd.DataFrame, bool]:
+    """
+    A narrow-dtype chunk back in the dtypes pd.read_csv infers for the
+    same rows (int64, or float64 once a value is missing or fractional),
+    so the aggregator types its totals like the in-memory path does.
+
+    Also returns whether any player_id was missing.
+    """
+    chunk = chunk.copy()
+    ids_missing = bool(chunk["player_id"].isna().any())
+    for col, dtype in MATCH_STATS_DTYPES.items():
+        values = chunk[col]
+        if dtype == "Int32":
+            if values.isna().any():
+                chunk[col] = values.to_numpy(np.float64, na_value=np.nan)
+            else:
+                chunk[col] = values.to_numpy(np.int64)
+        else:
+            values = values.to_numpy(np.float64)
+            if not np.isnan(values).any() and (values == np.floor(values)).all():
+                chunk[col] = values.astype(np.int64)
+            else:
+                chunk[col] = values
+    return chunk, ids_missing
+
+
+def stream_aggregated_stats(
+    path: str = MATCH_STATS_PATH,
+    chunksize: int = MATCH_STATS_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Same output as build_aggregated_stats(pd.read_csv(path)), but reads the
+    file in chunks with narrow dtypes and folds each chunk into the running
+    per-player totals, so the raw rows are never all in memory at once.
+    """
+    global last_ingest_report
+
+    start = time.perf_counter()
+    aggregator = PlayerStatsAggregator()
+    rows = 0
+    chunks = 0
+    ids_missing = False
+
+    reader = pd.read_csv(
+        path,
+        usecols=INPUT_COLS,
+        dtype=MATCH_STATS_DTYPES,
+        chunksize=chunksize,
     )
-    agg["overs_bowled_total"] = agg["total_balls_bowled"] / 6.0
-    agg["bowling_economy"] = (
-        agg["total_runs_conceded"] / agg["overs_bowled_total"].replace(0, np.nan)
+    for chunk in reader:
+        chunk, chunk_ids_missing = _as_read_csv_dtypes(chunk)
+        ids_missing = ids_missing or chunk_ids_missing
+        aggregator.add(chunk)
+        rows += len(chunk)
+        chunks += 1
+
+    agg = aggregator.to_frame()
+    if ids_missing:
+        # read_csv gives a float64 player_id column as soon as one is missing
+        agg["player_id"] = agg["player_id"].astype(np.float64)
+
+    last_ingest_report = {
+        "rows": rows,
+        "chunks": chunks,
+        "chunksize": chunksize,
+        "players": len(aggregator),
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print(
+        f"Streamed {rows} match rows in {chunks} chunk(s) "
+        f"({last_ingest_report['seconds']:.2f}s, "
+        f"peak RSS {last_ingest_report['peak_rss_mb']} MB)"
     )
-    agg["overs_per_match"] = agg["overs_bowled_total"] / agg["matches_played"]
-
     return agg
 
 
@@ -65,7 +178,7 @@ def merge_master(
     )
 
     master["date_of_birth_parsed"] = pd.to_datetime(
-        master["date_of_birth"], dayfirst=True, errors="coerce"
+        master["date_of_birth"], format=DATE_OF_BIRTH_FORMAT, errors="coerce"
     )
     master["age_at_auction"] = (
         master["year"] - master["date_of_birth_parsed"].dt.year
@@ -82,15 +195,40 @@ def merge_master(
     return master
 
 
-def load_and_prepare_master() -> pd.DataFrame:
+def build_master() -> pd.DataFrame:
     """
-    Public entry for backend: load CSVs from data/ and build master table.
+    Load CSVs from data/ and build the master table from scratch.
     """
-    players_df = pd.read_csv(PLAYERS_PATH)
-    match_stats_df = pd.read_csv(MATCH_STATS_PATH)
-    auction_df = pd.read_csv(AUCTION_SUMMARY_PATH)
-
-    stats_agg_df = build_aggregated_stats(match_stats_df)
-    master_df = merge_master(players_df, stats_agg_df, auction_df)
+    with span("master.read_csv"):
+        players_df = pd.read_csv(PLAYERS_PATH)
+        auction_df = pd.read_csv(AUCTION_SUMMARY_PATH)
+
+    if MATCH_STATS_STREAMING:
+        with span("master.stream_aggregate"):
+            stats_agg_df = stream_aggregated_stats()
+    else:
+        with span("master.read_csv"):
+            match_stats_df = pd.read_csv(MATCH_STATS_PATH)
+        with span("master.aggregate"):
+            stats_agg_df = build_aggregated_stats(match_stats_df)
+
+    with span("master.merge"):
+        master_df = merge_master(players_df, stats_agg_df, auction_df)
 
     return master_df
+
+
+def load_and_prepare_master(force_rebuild: bool = False) -> pd.DataFrame:
+    """
+    Public entry for backend: master table from the on-disk cache,
+    rebuilt from the CSVs in data/ only when they changed.
+    """
+    with span("master.load"):
+        if not MASTER_CACHE_ENABLED:
+            return build_master()
+        return load_or_build(
+            SOURCE_PATHS,
+            build_master,
+            version=master_cache_version(),
+            force_rebuild=force_rebuild,
+        )
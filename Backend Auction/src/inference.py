@@ -0,0 +1,475 @@
+# src/inference.py
+
+import json
+import math
+import os
+import re
+import threading
+from typing import Optional
+
+import lightgbm as lgb  # native Booster API
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+
+from .aggregation import rate_columns
+
+
+class FeatureEncodingTable:
+    """
+    The fitted ColumnTransformer (median impute + scale, most-frequent
+    impute + one-hot) compiled into plain lookup tables:
+
+    - numeric: fill value, mean and scale per feature
+    - categorical: fill value and {category -> output column} per feature
+
+    Encodes one raw feature dict or a whole frame without sklearn, with the
+    same columns and values as preprocessor.transform(). JSON-serializable,
+    so it can ship next to the native LightGBM model file.
+    """
+
+    def __init__(
+        self,
+        numeric_features: list,
+        num_fill,
+        num_mean,
+        num_scale,
+        categorical_features: list,
+        cat_fill: list,
+        cat_columns: list,
+        n_features_out: int,
+    ) -> None:
+        self.numeric_features = list(numeric_features)
+        self.num_fill = np.asarray(num_fill, dtype=np.float64)
+        self.num_mean = np.asarray(num_mean, dtype=np.float64)
+        self.num_scale = np.asarray(num_scale, dtype=np.float64)
+        self.categorical_features = list(categorical_features)
+        self.cat_fill = list(cat_fill)
+        self.cat_columns = [dict(c) for c in cat_columns]
+        self.n_numeric = len(self.numeric_features)
+        self.n_features_out = int(n_features_out)
+
+        # Batch lookups: categories in code order, their output columns, and
+        # the code of each feature's fill value (-1 if not a known category)
+        self._cat_categories = [list(c.keys()) for c in self.cat_columns]
+        self._cat_out_cols = [
+            np.fromiter(c.values(), dtype=np.int64, count=len(c)) for c in self.cat_columns
+        ]
+        self._cat_fill_codes = [
+            cats.index(fill) if fill in columns else -1
+            for cats, fill, columns in zip(self._cat_categories, self.cat_fill, self.cat_columns)
+        ]
+
+    @classmethod
+    def from_preprocessor(
+        cls, preprocessor, numeric_features: list, categorical_features: list
+    ) -> "FeatureEncodingTable":
+        num = preprocessor.named_transformers_["num"]
+        cat = preprocessor.named_transformers_["cat"]
+        num_imputer = num.named_steps["imputer"]
+        scaler = num.named_steps["scaler"]
+        cat_imputer = cat.named_steps["imputer"]
+        onehot = cat.named_steps["onehot"]
+
+        # SimpleImputer drops columns that were all-missing at fit time
+        num_stats = np.asarray(num_imputer.statistics_, dtype=np.float64)
+        num_kept = ~np.isnan(num_stats)
+        cat_stats = list(cat_imputer.statistics_)
+        cat_kept = [not _is_missing(v) for v in cat_stats]
+
+        # feature -> {category -> output column}; unknown categories stay 0
+        offset = int(num_kept.sum())
+        cat_columns = []
+        for categories in onehot.categories_:
+            cat_columns.append(
+                {c: offset + i for i, c in enumerate(categories.tolist())}
+            )
+            offset += len(categories)
+
+        return cls(
+            [f for f, keep in zip(numeric_features, num_kept) if keep],
+            num_stats[num_kept],
+            scaler.mean_,
+            scaler.scale_,
+            [f for f, keep in zip(categorical_features, cat_kept) if keep],
+            [v for v, keep in zip(cat_stats, cat_kept) if keep],
+            cat_columns,
+            offset,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "n_features_out": self.n_features_out,
+            "numeric": [
+                {"name": f, "fill": float(fill), "mean": float(mean), "scale": float(scale)}
+                for f, fill, mean, scale in zip(
+                    self.numeric_features, self.num_fill, self.num_mean, self.num_scale
+                )
+            ],
+            "categorical": [
+                {"name": f, "fill": fill, "columns": columns}
+                for f, fill, columns in zip(
+                    self.categorical_features, self.cat_fill, self.cat_columns
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureEncodingTable":
+        numeric = data["numeric"]
+        categorical = data["categorical"]
+        return cls(
+            [n["name"] for n in numeric],
+            [n["fill"] for n in numeric],
+            [n["mean"] for n in numeric],
+            [n["scale"] for n in numeric],
+            [c["name"] for c in categorical],
+            [c["fill"] for c in categorical],
+            [c["columns"] for c in categorical],
+            data["n_features_out"],
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureEncodingTable":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def encode_into(self, values: dict, out: np.ndarray) -> None:
+        """
+        Encode one player's raw features into the 1-D row `out`
+        (missing keys count as missing).
+        """
+        out.fill(0.0)
+
+        for j, feature in enumerate(self.numeric_features):
+            value = values.get(feature)
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                value = self.num_fill[j]
+            out[j] = (float(value) - self.num_mean[j]) / self.num_scale[j]
+
+        for j, feature in enumerate(self.categorical_features):
+            value = values.get(feature)
+            if _is_missing(value):
+                value = self.cat_fill[j]
+            col = self.cat_columns[j].get(value)
+            if col is not None:
+                out[col] = 1.0
+
+    def encode_frame(self, df: pd.DataFrame, dtype=np.float32) -> np.ndarray:
+        """
+        Encode a frame of raw features into a C-contiguous (n_rows,
+        n_features_out) array. Values are computed in float64 and cast once.
+        """
+        n = len(df)
+        out = np.zeros((n, self.n_features_out), dtype=dtype)
+
+        num = df[self.numeric_features].to_numpy(dtype=np.float64, na_value=np.nan)
+        num = np.where(np.isnan(num), self.num_fill, num)
+        out[:, : self.n_numeric] = (num - self.num_mean) / self.num_scale
+
+        rows = np.arange(n)
+        for j, feature in enumerate(self.categorical_features):
+            values = df[feature]
+            # Category codes via a hash lookup; unknown and missing -> -1
+            codes = pd.Categorical(values, categories=self._cat_categories[j]).codes
+            codes = np.where(values.isna().to_numpy(), self._cat_fill_codes[j], codes)
+            known = codes >= 0
+            out[rows[known], self._cat_out_cols[j][codes[known]]] = 1.0
+
+        return out
+
+
+class RowEncoder:
+    """
+    Encodes one raw feature dict into a preallocated row, without building
+    a DataFrame (see FeatureEncodingTable).
+    """
+
+    def __init__(self, table: FeatureEncodingTable, dtype=np.float64) -> None:
+        self.table = table
+        self.dtype = dtype
+        self._local = threading.local()
+
+    def _buffer(self) -> np.ndarray:
+        # One preallocated row per thread (requests run in a threadpool)
+        buf = getattr(self._local, "row", None)
+        if buf is None:
+            buf = np.zeros((1, self.table.n_features_out), dtype=self.dtype)
+            self._local.row = buf
+        return buf
+
+    def encode(self, values: dict) -> np.ndarray:
+        """
+        Encode one player's raw features (missing keys count as missing).
+
+        Returns this thread's shared buffer: copy it to keep it past the
+        next encode() call.
+        """
+        row = self._buffer()
+        self.table.encode_into(values, row[0])
+        return row
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+# Derived per-match / per-ball rates and the totals they come from
+RATE_INPUTS = [
+    "total_runs",
+    "total_balls_batted",
+    "total_wickets",
+    "total_balls_bowled",
+    "total_runs_conceded",
+    "outs",
+]
+
+
+def fill_rates(values: dict) -> dict:
+    """
+    Fill in rate features (runs_per_match, bowling_economy, ...) that were
+    not supplied, from matches_played and the running totals, using the
+    same formulas as the match-stats aggregation. Each rate is derived from
+    the inputs it needs; a rate whose inputs are missing stays missing.
+    """
+    def column(c: str) -> np.ndarray:
+        v = values.get(c)
+        return np.array([np.nan if _is_missing(v) else float(v)])
+
+    totals = {c: column(c) for c in RATE_INPUTS}
+    rates = rate_columns(column("matches_played"), totals)
+
+    filled = dict(values)
+    for col, arr in rates.items():
+        if filled.get(col) is None and not np.isnan(arr[0]):
+            filled[col] = float(arr[0])
+    return filled
+
+
+# Distances closer than this (relative) count as tied in the KNN fast path
+KNN_TIE_TOLERANCE = 1e-7
+
+
+class SingleRowPredictor:
+    """
+    Price + SOLD/UNSOLD for one hypothetical player from raw features.
+
+    Same result as AuctionPriceModel.predict_prices on a one-row frame,
+    but encodes via RowEncoder, calls the LightGBM booster directly (the
+    model's NativeLgbmPredictor when it has one, as predict_prices does) and
+    runs the KNN search as one brute-force NumPy pass (sklearn's per-call
+    validation costs more than the search itself at this size). Queries
+    whose neighbours tie at the k-th place go through sklearn itself.
+
+    Against a multi-row predict_prices call, tied queries can still differ:
+    sklearn breaks those ties differently depending on the batch.
+    """
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self.encoder = RowEncoder(
+            FeatureEncodingTable.from_preprocessor(
+                model.preprocessor,
+                model.numeric_features,
+                model.categorical_features,
+            )
+        )
+        self.booster = model.lgbm_model.booster_
+        self.native_lgbm = getattr(model, "native_lgbm_", None)
+
+        knn = model.knn_model
+        fit_X = getattr(knn, "_fit_X", None)
+        self._knn_direct = (
+            isinstance(fit_X, np.ndarray)
+            and knn.effective_metric_ == "euclidean"
+            and knn.weights in ("uniform", "distance")
+        )
+        if self._knn_direct:
+            self._knn_X = np.ascontiguousarray(fit_X, dtype=np.float64)
+            self._knn_y = np.asarray(knn._y, dtype=np.float64).ravel()
+            self._knn_k = min(knn.n_neighbors, len(self._knn_y))
+            self._knn_distance_weights = knn.weights == "distance"
+
+    def _knn_predict(self, row: np.ndarray) -> float:
+        if not self._knn_direct:
+            return float(self.model.knn_model.predict(row)[0])
+
+        diff = self._knn_X - row
+        dist = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        k = self._knn_k
+        order = np.argsort(dist)
+        if self._knn_ambiguous(dist[order]):
+            return float(self.model.knn_model.predict(row)[0])
+
+        idx = order[:k]
+        y = self._knn_y[idx]
+        if not self._knn_distance_weights:
+            return float(y.mean())
+
+        w = 1.0 / dist[idx]
+        return float(np.dot(w, y) / w.sum())
+
+    def _knn_ambiguous(self, sorted_dist: np.ndarray) -> bool:
+        """
+        True when sklearn's answer hinges on float rounding: a tie at the
+        k-th place (equal rows, e.g. players with no match stats) or an
+        exact match. sklearn computes distances as |x|^2 - 2xy + |y|^2, so
+        which tied rows it keeps and how it weights (near-)zero distances
+        depend on rounding in that formula; those queries go through the
+        fitted estimator itself.
+        """
+        k = self._knn_k
+        tol = KNN_TIE_TOLERANCE * max(1.0, float(sorted_dist[-1]))
+        if self._knn_distance_weights and sorted_dist[0] <= tol:
+            return True
+        return k < len(sorted_dist) and sorted_dist[k] - sorted_dist[k - 1] <= tol
+
+    def predict(self, values: dict) -> dict:
+        values = fill_rates(values)
+        row = self.encoder.encode(values)
+
+        if self.native_lgbm is not None:
+            price_lgbm = math.expm1(self.native_lgbm.predict_row(values))
+        else:
+            price_lgbm = math.expm1(float(self.booster.predict(row)[0]))
+        price_knn = math.expm1(self._knn_predict(row))
+
+        # Blended with the model's (possibly tuned) weight, never below base price
+        base_price = values.get("base_price")
+        base_price = 0.0 if _is_missing(base_price) else float(base_price)
+        weight = self.model.blend_weight_
+        price = max(weight * price_lgbm + (1.0 - weight) * price_knn, base_price)
+
+        scores = self.model.score_one(values, price)
+        return {
+            "predicted_price_lgbm": price_lgbm,
+            "predicted_price_knn": price_knn,
+            "predicted_price": price,
+            **scores,
+        }
+
+
+def build_predictor(model) -> Optional[SingleRowPredictor]:
+    """
+    SingleRowPredictor for a loaded model, or None if the model predates
+    fitted normalization stats (retrain to enable /predict).
+    """
+    if getattr(model, "norm_stats_", None) is None:
+        return None
+    return SingleRowPredictor(model)
+
+
+# Native LightGBM export (written next to the joblib artifacts)
+NATIVE_MODEL_FILE = "lgbm_model.txt"
+ENCODING_TABLE_FILE = "feature_encoding.json"
+
+
+def _float32_tree_block(block: str) -> str:
+    lines = block.split("\n")
+    decision_types = []
+    for line in lines:
+        if line.startswith("decision_type="):
+            decision_types = [int(v) for v in line.split("=", 1)[1].split()]
+    for i, line in enumerate(lines):
+        if not line.startswith("threshold="):
+            continue
+        values = line.split("=", 1)[1].split()
+        out = []
+        for value, decision_type in zip(values, decision_types):
+            if decision_type & 1:  # categorical split: leave as is
+                out.append(value)
+            else:
+                out.append(repr(float(np.float32(float(value)))))
+        lines[i] = "threshold=" + " ".join(out)
+    return "\n".join(lines)
+
+
+def float32_model_string(booster: lgb.Booster) -> str:
+    """
+    The booster's text model with every numerical split threshold rounded
+    to float32.
+
+    LightGBM often puts a threshold exactly on a training value. Rounding
+    the input to float32 can push such a value just above it and flip the
+    split; rounding both sides the same way keeps "x <= t" decisions
+    identical to float64 inference (rounding is monotonic).
+    """
+    model_str = booster.model_to_string()
+    start = model_str.index("\nTree=") + 1
+    end = model_str.index("end of trees")
+
+    blocks = [
+        _float32_tree_block(b)
+        for b in re.split(r"(?m)^(?=Tree=)", model_str[start:end])
+        if b
+    ]
+    # The header lists each tree's byte size; keep it in sync
+    sizes = " ".join(str(len(b.encode("utf-8"))) for b in blocks)
+    header = re.sub(
+        r"(?m)^tree_sizes=.*$", f"tree_sizes={sizes}", model_str[:start], count=1
+    )
+    return header + "".join(blocks) + model_str[end:]
+
+
+def export_native(model, model_dir: str) -> None:
+    """
+    Save the fitted booster in LightGBM's text format (float32 thresholds)
+    plus the compiled feature-encoding table, so inference needs neither
+    sklearn nor joblib.
+    """
+    model_str = float32_model_string(model.lgbm_model.booster_)
+    with open(os.path.join(model_dir, NATIVE_MODEL_FILE), "w", encoding="utf-8") as f:
+        f.write(model_str)
+    FeatureEncodingTable.from_preprocessor(
+        model.preprocessor,
+        model.numeric_features,
+        model.categorical_features,
+    ).save(os.path.join(model_dir, ENCODING_TABLE_FILE))
+
+
+class NativeLgbmPredictor:
+    """
+    LightGBM log-price predictions through the native Booster API from
+    contiguous float32 input, encoded with a FeatureEncodingTable.
+
+    n_jobs: threads per predict call (0: LightGBM's default).
+    """
+
+    def __init__(self, booster: lgb.Booster, table: FeatureEncodingTable, n_jobs: int = 0) -> None:
+        self.booster = booster
+        self.table = table
+        self.encoder = RowEncoder(table, dtype=np.float32)
+        self.n_jobs = int(n_jobs)
+
+    @classmethod
+    def load(cls, model_dir: str) -> "NativeLgbmPredictor":
+        booster = lgb.Booster(model_file=os.path.join(model_dir, NATIVE_MODEL_FILE))
+        table = FeatureEncodingTable.load(os.path.join(model_dir, ENCODING_TABLE_FILE))
+        return cls(booster, table)
+
+    @classmethod
+    def from_model(cls, model) -> "NativeLgbmPredictor":
+        table = FeatureEncodingTable.from_preprocessor(
+            model.preprocessor,
+            model.numeric_features,
+            model.categorical_features,
+        )
+        booster = lgb.Booster(model_str=float32_model_string(model.lgbm_model.booster_))
+        return cls(booster, table)
+
+    def predict_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Log-price for every row of a raw feature frame.
+        """
+        return self.booster.predict(
+            self.table.encode_frame(df, dtype=np.float32), num_threads=self.n_jobs
+        )
+
+    def predict_row(self, values: dict) -> float:
+        """
+        Log-price for one raw feature dict.
+        """
+        return float(self.booster.predict(self.encoder.encode(values), num_threads=self.n_jobs)[0])
@@ -0,0 +1,158 @@
+# src/jobs.py
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class JobConflict(Exception):
+    """
+    Another job with different parameters is already queued or running.
+    """
+
+    def __init__(self, job: "TrainingJob") -> None:
+        super().__init__(f"Training job {job.id} is already {job.status}.")
+        self.job = job
+
+
+class TrainingJob:
+    """
+    State of one background training run.
+
+    status: queued -> running -> succeeded | failed
+    stages: one entry per stage in the order they ran, with wall-clock seconds
+    (the running stage reports seconds so far).
+    """
+
+    def __init__(self, params: Optional[dict] = None) -> None:
+        self.id = uuid.uuid4().hex
+        self.params = dict(params or {})
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.stages: list[dict] = []
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._stage_t0: Optional[float] = None
+
+    def _close_stage(self, now: float) -> None:
+        if self.stages and self._stage_t0 is not None:
+            self.stages[-1]["seconds"] = now - self._stage_t0
+            self.stages[-1]["done"] = True
+
+    def start_stage(self, name: str) -> None:
+        """
+        Progress callback: mark `name` as the current stage.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self._close_stage(now)
+            self.stage = name
+            self.stages.append(
+                {"name": name, "started_at": time.time(), "seconds": 0.0, "done": False}
+            )
+            self._stage_t0 = now
+
+    def _mark_running(self) -> None:
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+
+    def _finish(self, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._close_stage(time.perf_counter())
+            self.status = "failed" if error is not None else "succeeded"
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages = [dict(s) for s in self.stages]
+            if stages and not stages[-1]["done"] and self._stage_t0 is not None:
+                stages[-1]["seconds"] = time.perf_counter() - self._stage_t0
+
+            end = self.finished_at or time.time()
+            return {
+                "job_id": self.id,
+                "params": dict(self.params),
+                "status": self.status,
+                "stage": self.stage,
+                "stages": stages,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "elapsed_seconds": (
+                    end - self.started_at if self.started_at is not None else 0.0
+                ),
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class TrainingJobs:
+    """
+    Runs training jobs one at a time on a background thread and keeps the
+    most recent `max_history` jobs for polling.
+    """
+
+    def __init__(self, max_history: int = 20) -> None:
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="train")
+
+    def submit(
+        self, run_fn: Callable[[TrainingJob], dict], params: Optional[dict] = None
+    ) -> tuple[TrainingJob, bool]:
+        """
+        Queue run_fn(job) unless a job is already queued/running.
+
+        Returns (job, created): the new job, or the active one with
+        created=False if it was started with the same params. Raises
+        JobConflict if the active job has different params.
+        """
+        params = dict(params or {})
+        with self._lock:
+            for job in self._jobs.values():
+                if job.active:
+                    if job.params != params:
+                        raise JobConflict(job)
+                    return job, False
+
+            job = TrainingJob(params)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_history:
+                self._jobs.popitem(last=False)
+
+        self._executor.submit(self._run, job, run_fn)
+        return job, True
+
+    @staticmethod
+    def _run(job: TrainingJob, run_fn: Callable[[TrainingJob], dict]) -> None:
+        job._mark_running()
+        try:
+            result = run_fn(job)
+        except Exception as e:
+            print(f"❌ Error in training job {job.id}:", e)
+            job._finish(error=str(e))
+        else:
+            job._finish(result=result)
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,222 @@
+# src/master_cache.py
+
+import glob
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Callable, Optional
+
+import pandas as pd  # dataframes
+import pyarrow as pa  # Arrow IPC (columnar, memory-mappable)
+
+from .config import CACHE_DIR
+from .metrics import MASTER_CACHE_LOADS, span
+
+MANIFEST_PATH = os.path.join(CACHE_DIR, "master_manifest.json")
+CACHE_PREFIX = "master-"
+CACHE_SUFFIX = ".arrow"
+
+# Details of the most recent load in this process (exposed by the API / CLI)
+last_load_info: dict = {}
+
+
+def _sha256_file(path: str, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(manifest: dict) -> None:
+    tmp_path = f"{MANIFEST_PATH}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def source_fingerprints(paths: list[str], previous: Optional[dict] = None) -> dict:
+    """
+    Size, mtime and SHA-256 for every source file.
+
+    The hash of a file is only recomputed when its size or mtime differs from
+    the previous manifest entry, so a warm start does not re-read large CSVs.
+    """
+    previous = previous or {}
+    fingerprints = {}
+    for path in paths:
+        stat = os.stat(path)
+        prev = previous.get(path)
+        if (
+            prev is not None
+            and prev.get("size") == stat.st_size
+            and prev.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            digest = prev["sha256"]
+        else:
+            digest = _sha256_file(path)
+        fingerprints[path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+        }
+    return fingerprints
+
+
+def cache_key(fingerprints: dict, version: str = "") -> str:
+    """
+    Content key: only the hashes matter, so touching a file is still a hit.
+    `version` lets the builder invalidate caches when its output changes.
+    """
+    h = hashlib.sha256(version.encode("utf-8"))
+    for path in sorted(fingerprints):
+        h.update(os.path.basename(path).encode("utf-8"))
+        h.update(fingerprints[path]["sha256"].encode("ascii"))
+    return h.hexdigest()
+
+
+def cache_path_for(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{CACHE_PREFIX}{key[:16]}{CACHE_SUFFIX}")
+
+
+def _read_arrow(path: str) -> pd.DataFrame:
+    # Memory-map the file: columns are paged in lazily instead of parsed.
+    # The map stays open for as long as Arrow buffers reference it.
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def _write_arrow(df: pd.DataFrame, path: str) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _remove_stale(keep_path: str) -> None:
+    pattern = os.path.join(CACHE_DIR, f"{CACHE_PREFIX}*{CACHE_SUFFIX}")
+    for path in glob.glob(pattern):
+        if path != keep_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_or_build(
+    source_paths: list[str],
+    build_fn: Callable[[], pd.DataFrame],
+    version: str = "",
+    force_rebuild: bool = False,
+) -> pd.DataFrame:
+    """
+    Return the master table from the on-disk cache, rebuilding it with
+    build_fn() when the source CSVs changed (or force_rebuild is set).
+    """
+    global last_load_info
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    manifest = _read_manifest()
+
+    t0 = time.perf_counter()
+    with span("master.fingerprint"):
+        fingerprints = source_fingerprints(source_paths, manifest.get("sources"))
+    key = cache_key(fingerprints, version)
+    path = cache_path_for(key)
+    fingerprint_seconds = time.perf_counter() - t0
+
+    if not force_rebuild and os.path.exists(path):
+        MASTER_CACHE_LOADS.labels(result="hit").inc()
+        t0 = time.perf_counter()
+        with span("master.cache_read"):
+            df = _read_arrow(path)
+        info = {
+            "hit": True,
+            "key": key,
+            "path": path,
+            "rows": int(len(df)),
+            "fingerprint_seconds": fingerprint_seconds,
+            "load_seconds": time.perf_counter() - t0,
+            "rebuild_seconds": manifest.get("rebuild_seconds"),
+        }
+        # Keep fresh mtimes so the next start skips hashing again
+        if manifest.get("sources") != fingerprints:
+            manifest["sources"] = fingerprints
+            _write_manifest(manifest)
+    else:
+        MASTER_CACHE_LOADS.labels(result="miss").inc()
+        t0 = time.perf_counter()
+        with span("master.build"):
+            df = build_fn()
+        rebuild_seconds = time.perf_counter() - t0
+
+        with span("master.cache_write"):
+            _write_arrow(df, path)
+        _remove_stale(path)
+        _write_manifest(
+            {
+                "key": key,
+                "path": path,
+                "rows": int(len(df)),
+                "rebuild_seconds": rebuild_seconds,
+                "built_at": time.time(),
+                "sources": fingerprints,
+            }
+        )
+        info = {
+            "hit": False,
+            "key": key,
+            "path": path,
+            "rows": int(len(df)),
+            "fingerprint_seconds": fingerprint_seconds,
+            "load_seconds": None,
+            "rebuild_seconds": rebuild_seconds,
+        }
+
+    last_load_info = info
+    return df
+
+
+def cache_status(source_paths: list[str], version: str = "") -> dict:
+    """
+    Would the next load hit? Plus details of the last load in this process.
+    """
+    manifest = _read_manifest()
+    fingerprints = source_fingerprints(source_paths, manifest.get("sources"))
+    key = cache_key(fingerprints, version)
+    path = cache_path_for(key)
+    return {
+        "cache_dir": CACHE_DIR,
+        "current_key": key,
+        "would_hit": os.path.exists(path),
+        "cached_rows": manifest.get("rows"),
+        "built_at": manifest.get("built_at"),
+        "rebuild_seconds": manifest.get("rebuild_seconds"),
+        "last_load": last_load_info or None,
+    }
+
+
+def clear_cache() -> int:
+    """
+    Delete all cached master tables and the manifest. Returns files removed.
+    """
+    removed = 0
+    pattern = os.path.join(CACHE_DIR, f"{CACHE_PREFIX}*{CACHE_SUFFIX}")
+    for path in glob.glob(pattern) + [MANIFEST_PATH]:
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    return removed
@@ -0,0 +1,110 @@
+# src/metrics.py
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (  # Prometheus text exposition
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Latency buckets (seconds): sub-millisecond single-row work up to retrains
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+STAGE_SECONDS = Histogram(
+    "auction_stage_seconds",
+    "Time spent in one stage of master loading, prediction, squad selection or serialization.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "auction_http_request_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MODEL_CACHE_REQUESTS = Counter(
+    "auction_model_cache_requests_total",
+    "Model cache lookups by result (hit / miss).",
+    ["result"],
+)
+MODEL_CACHE_EVICTIONS = Counter(
+    "auction_model_cache_evictions_total",
+    "Models evicted from the LRU model cache.",
+)
+MODEL_CACHE_LOADED = Gauge(
+    "auction_model_cache_loaded",
+    "Models currently held in the model cache.",
+)
+MODEL_LOAD_SECONDS = Histogram(
+    "auction_model_load_seconds",
+    "Time to load a model from the registry and build its prediction snapshot.",
+    ["year"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TABLE_RESPONSES = Counter(
+    "auction_table_responses_total",
+    "/players/{year}/table responses by status (200 / 304) and content coding.",
+    ["status", "encoding"],
+)
+
+MASTER_CACHE_LOADS = Counter(
+    "auction_master_cache_loads_total",
+    "Master table loads by on-disk cache result (hit / miss).",
+    ["result"],
+)
+
+EXECUTOR_QUEUE_WAIT_SECONDS = Histogram(
+    "auction_executor_queue_wait_seconds",
+    "Time a request's CPU work waited for a free executor worker.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+EXECUTOR_COMPUTE_SECONDS = Histogram(
+    "auction_executor_compute_seconds",
+    "Time a request's CPU work ran on an executor worker.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+EXECUTOR_IN_FLIGHT = Gauge(
+    "auction_executor_in_flight",
+    "Calls queued or running per executor.",
+    ["pool"],
+)
+EXECUTOR_REJECTED = Counter(
+    "auction_executor_rejected_total",
+    "Calls shed with 503 because the executor was at its queue limit.",
+    ["pool"],
+)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    Time the enclosed block into auction_stage_seconds{stage=...}.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=str(status)).observe(seconds)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    (body, content type) of the current metrics in Prometheus text format.
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -3,9 +3,11 @@ import numpy as np  # for numeric arrays
 import pandas as pd  # for DataFrame handling
 import joblib  # for saving/loading model artifacts
 import os
+import time
+from typing import Callable, Optional
 
 
-from sklearn.model_selection import KFold, cross_val_score  # for cross-validation
+from sklearn.model_selection import KFold  # for cross-validation
 from sklearn.compose import ColumnTransformer  # for preprocessing pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler  # for encoding/scaling
 from sklearn.pipeline import Pipeline  # for building pipelines
@@ -17,28 +19,127 @@ from lightgbm import LGBMRegressor  # for LightGBM regressor
 from .config import (
     MODEL_DIR,
     EFFICIENCY_UNSOLD_PERCENTILE,
-    TRAIN_YEARS,
     PREDICTION_YEAR,
 )
 
 from .features import load_and_prepare_master  # function to load + merge all data
+from .metrics import span  # per-stage latency histograms
+from .comparables import ComparablesIndex  # nearest historical sales
+from .inference import (  # native LightGBM export / inference
+    NATIVE_MODEL_FILE,
+    NativeLgbmPredictor,
+    export_native,
+)
+from .training import TrainingScheduler, fit_estimator, fit_fold  # concurrent fits
+from .registry import (  # per-year artifact directories
+    ModelKey,
+    default_train_years,
+    make_key,
+    model_dir_for,
+    read_manifest,
+    write_manifest,
+)
 
 
-def minmax_normalize(series: pd.Series) -> pd.Series:
+# Stats that are min-max normalized into batting / bowling impact
+IMPACT_STAT_COLS = [
+    "runs_per_match",
+    "batting_average",
+    "batting_strike_rate",
+    "wickets_per_match",
+    "overs_per_match",
+    "bowling_economy",
+]
+
+
+# Hyperparameters of the hybrid model; tune.py searches over these and the
+# winning set is stored in the registry manifest ("params")
+DEFAULT_MODEL_PARAMS = {
+    "lgbm": {
+        "n_estimators": 500,
+        "learning_rate": 0.05,
+        "subsample": 0.8,
+        "colsample_bytree": 0.8,
+    },
+    "knn": {"n_neighbors": 25},
+    "blend_weight": 0.5,  # LightGBM's share of the price ensemble
+}
+
+
+def merge_params(params: dict | None) -> dict:
     """
-    Normalize a numeric Series to the range [0, 1] using min-max scaling.
+    DEFAULT_MODEL_PARAMS overlaid with `params` (missing keys keep defaults).
+    """
+    params = params or {}
+    return {
+        "lgbm": {**DEFAULT_MODEL_PARAMS["lgbm"], **params.get("lgbm", {})},
+        "knn": {**DEFAULT_MODEL_PARAMS["knn"], **params.get("knn", {})},
+        "blend_weight": float(params.get("blend_weight", DEFAULT_MODEL_PARAMS["blend_weight"])),
+    }
+
+
+def minmax_stats(series: pd.Series) -> tuple[float, float]:
+    """
+    (min, max) of the non-null values; (nan, nan) if there are none.
+    """
+    s = series.dropna()
+    if s.empty:
+        return (math.nan, math.nan)
+    return (float(s.min()), float(s.max()))
+
+
+def minmax_apply(series: pd.Series, stats: tuple[float, float]) -> pd.Series:
+    """
+    Scale a Series to [0, 1] with fitted (min, max) stats.
+
+    Same edge cases as minmax_normalize; values outside the fitted range
+    (rows that were not in the training frame) are clipped.
     """
-    s = series.copy()
-    mask = s.notna()
-    if mask.sum() == 0:
+    min_val, max_val = stats
+    if math.isnan(min_val):
         return pd.Series(0.0, index=series.index)
-    min_val = s[mask].min()
-    max_val = s[mask].max()
     if min_val == max_val:
         return pd.Series(0.5, index=series.index)
-    out = (s - min_val) / (max_val - min_val)
-    out[~mask] = np.nan
-    return out
+    return ((series - min_val) / (max_val - min_val)).clip(0.0, 1.0)
+
+
+def minmax_value(value, stats: tuple[float, float]) -> float:
+    """
+    Scalar twin of minmax_apply, for single-row scoring.
+    """
+    min_val, max_val = stats
+    if math.isnan(min_val):
+        return 0.0
+    if min_val == max_val:
+        return 0.5
+    if value is None or math.isnan(value):
+        return math.nan
+    return min(max((value - min_val) / (max_val - min_val), 0.0), 1.0)
+
+
+def minmax_normalize(series: pd.Series) -> pd.Series:
+    """
+    Normalize a numeric Series to the range [0, 1] using min-max scaling.
+    """
+    return minmax_apply(series, minmax_stats(series))
+
+
+def blend_prices(
+    log_pred_lgbm: np.ndarray,
+    log_pred_knn: np.ndarray,
+    base_price: np.ndarray,
+    weight: float = 0.5,
+) -> np.ndarray:
+    """
+    weight * LightGBM price + (1 - weight) * KNN price, never below base_price.
+    """
+    price = weight * np.expm1(log_pred_lgbm) + (1.0 - weight) * np.expm1(log_pred_knn)
+    return np.maximum(price, base_price)
+
+
+def _nanmean(values: list[float]) -> float:
+    present = [v for v in values if not math.isnan(v)]
+    return sum(present) / len(present) if present else math.nan
 
 
 class AuctionPriceModel:
@@ -53,7 +154,11 @@ class AuctionPriceModel:
     (e.g., if max year is 2025 → train on 2023 & 2024).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, params: dict | None = None) -> None:
+        # Hyperparameters (DEFAULT_MODEL_PARAMS unless tuned)
+        self.params_ = merge_params(params)
+        self.blend_weight_: float = self.params_["blend_weight"]
+
         # Numeric feature names used in the model
         self.numeric_features = [
             "base_price",
@@ -104,7 +209,8 @@ class AuctionPriceModel:
             ]
         )
 
-        # ColumnTransformer that applies both numeric and categorical pipelines
+        # ColumnTransformer that applies both numeric and categorical pipelines.
+        # Fitted once and shared: LightGBM and KNN both consume its output.
         self.preprocessor = ColumnTransformer(
             transformers=[
                 ("num", numeric_transformer, self.numeric_features),
@@ -114,43 +220,43 @@ class AuctionPriceModel:
 
         # LightGBM regressor (log-price)
         self.lgbm_model = LGBMRegressor(
-            n_estimators=500,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
+            **self.params_["lgbm"],
             random_state=42,
             n_jobs=-1,
         )
 
         # KNN regressor (log-price)
         self.knn_model = KNeighborsRegressor(
-            n_neighbors=25,
+            **self.params_["knn"],
             weights="distance",
             n_jobs=-1,
         )
 
-        # Full pipeline: preprocessing + LightGBM
-        self.lgbm_pipeline = Pipeline(
-            steps=[
-                ("preprocess", self.preprocessor),
-                ("model", self.lgbm_model),
-            ]
-        )
-
-        # Full pipeline: preprocessing + KNN
-        self.knn_pipeline = Pipeline(
-            steps=[
-                ("preprocess", self.preprocessor),
-                ("model", self.knn_model),
-            ]
-        )
-
         # Efficiency threshold for SOLD vs UNSOLD classification
         self.efficiency_threshold_: float | None = None
 
+        # Fitted (min, max) per IMPACT_STAT_COLS column. None (old artifacts):
+        # normalize over whatever frame is being scored.
+        self.norm_stats_: dict[str, tuple[float, float]] | None = None
+
+        # Nearest-historical-sales index in the KNN feature space
+        # (None for artifacts saved before it existed)
+        self.comparables_: ComparablesIndex | None = None
+
+        # Native LightGBM predictor (float32 thresholds) used for LightGBM
+        # predictions; built by fit() and load() (None: unfitted, or an
+        # artifact saved before the export existed)
+        self.native_lgbm_: NativeLgbmPredictor | None = None
+
         # Years actually used for training (for debugging / logging)
         self.train_years_: list[int] | None = None
 
+        # Auction year this model predicts
+        self.prediction_year_: int | None = None
+
+        # Seconds per fit() stage and per worker task (see fit)
+        self.fit_timings_: dict | None = None
+
     def _select_training_years(self, master_df: pd.DataFrame) -> list[int]:
         """
         Determine which years to use for training.
@@ -183,7 +289,15 @@ class AuctionPriceModel:
         print(f"Training on years: {train_years}, latest (prediction) year: {latest_year}")
         return train_years
 
-    def fit(self, master_df: pd.DataFrame, train_years: list[int] | None = None) -> float:
+    def fit(
+        self,
+        master_df: pd.DataFrame,
+        train_years: list[int] | None = None,
+        progress: Optional[Callable[[str], None]] = None,
+        prediction_year: int | None = None,
+        workers: int | None = None,
+        n_jobs: int | None = None,
+    ) -> float:
         """
         Train LightGBM + KNN on SOLD players from specific years.
 
@@ -191,13 +305,27 @@ class AuctionPriceModel:
         - Automatically pick the last two completed years before the latest year
           in master_df (e.g. 2023 & 2024 if latest is 2025).
 
+        prediction_year defaults to the latest year in master_df.
+
+        progress(stage) is called as each stage starts ("cv", "fit", "threshold").
+
+        The CV folds and the two final fits run concurrently on `workers`
+        processes (default TRAIN_MAX_WORKERS; 1 = inline), n_jobs threads
+        each (default: cores / workers). Stage timings are kept in
+        fit_timings_.
+
         Returns:
         - Mean cross-validation RMSE in log-price space.
         """
+        progress = progress or (lambda stage: None)
+
         # Determine training years if not provided
         if train_years is None:
             train_years = self._select_training_years(master_df)
         self.train_years_ = train_years
+        if prediction_year is None:
+            prediction_year = int(master_df["year"].max())
+        self.prediction_year_ = int(prediction_year)
 
         # Build mask: sold players AND year in train_years
         sold_mask = (master_df["final_price"] > 0) & (
@@ -214,31 +342,98 @@ class AuctionPriceModel:
         y_train = np.log1p(train_df["final_price"].values)
         X_train = train_df[self.feature_cols]
 
-        # 5-fold cross validation on LightGBM in log space
+        # "cv" and "fit" are wall seconds from the start of the concurrent
+        # section until all folds / both final fits are done; *_task(s) are
+        # the seconds each task took in its worker
+        timings: dict = {}
+        t_start = time.perf_counter()
+        scheduler = TrainingScheduler(workers, n_jobs)
+
+        # Final models: transform once, fit LightGBM and KNN as independent
+        # tasks, submitted first since they gate the artifacts
+        progress("cv")
+        t0 = time.perf_counter()
+        Xt_train = self.preprocessor.fit_transform(X_train)
+        timings["preprocess"] = time.perf_counter() - t0
+        lgbm_future = scheduler.submit(fit_estimator, self.lgbm_model, Xt_train, y_train)
+        knn_future = scheduler.submit(fit_estimator, self.knn_model, Xt_train, y_train)
+
+        # 5-fold cross validation in log space, one task per fold
+        # (preprocessor refitted inside each fold, as before). Each fold
+        # also predicts its held-out rows with KNN, for the threshold below.
         kf = KFold(n_splits=5, shuffle=True, random_state=42)
-        cv_scores = cross_val_score(
-            self.lgbm_pipeline,
-            X_train,
-            y_train,
-            scoring="neg_root_mean_squared_error",
-            cv=kf,
-        )
-        rmse_log = -cv_scores.mean()
-        print("LightGBM CV RMSE (log price):", rmse_log)
+        folds = list(kf.split(X_train))
+        fold_futures = [
+            scheduler.submit(
+                fit_fold,
+                self.preprocessor,
+                self.lgbm_model,
+                self.knn_model,
+                X_train.iloc[fit_idx],
+                y_train[fit_idx],
+                X_train.iloc[held_idx],
+            )
+            for fit_idx, held_idx in folds
+        ]
 
-        # Fit final models on all training data
-        self.lgbm_pipeline.fit(X_train, y_train)
-        self.knn_pipeline.fit(X_train, y_train)
+        oof_lgbm = np.empty(len(y_train))
+        oof_knn = np.empty(len(y_train))
+        fold_rmse = []
+        fold_seconds = []
+        for (_, held_idx), future in zip(folds, fold_futures):
+            log_pred_lgbm, log_pred_knn, seconds = future.result()
+            oof_lgbm[held_idx] = log_pred_lgbm
+            oof_knn[held_idx] = log_pred_knn
+            fold_rmse.append(
+                math.sqrt(np.mean((log_pred_lgbm - y_train[held_idx]) ** 2))
+            )
+            fold_seconds.append(seconds)
+        rmse_log = float(np.mean(fold_rmse))
+        timings["cv"] = time.perf_counter() - t0
+        print("LightGBM CV RMSE (log price):", rmse_log)
 
-        # Compute efficiency threshold using only sold players from train_years
-        master_with_preds = self.predict_prices(master_df)
-        sold_hist = master_with_preds.loc[sold_mask].copy()
+        progress("fit")
+        self.lgbm_model, timings["fit_lgbm_task"] = lgbm_future.result()
+        self.knn_model, timings["fit_knn_task"] = knn_future.result()
+        # Score through the same native predictor a reload will use
+        self.native_lgbm_ = NativeLgbmPredictor.from_model(self)
+        timings["cv_fold_tasks"] = fold_seconds
+        timings["fit"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        self.comparables_ = ComparablesIndex.build(
+            self.preprocessor, self.feature_cols, master_df, year=self.prediction_year_
+        )
+        timings["comparables"] = time.perf_counter() - t0
+
+        # Freeze the impact normalization on the full frame (all years),
+        # which is what the API scores
+        self.norm_stats_ = {
+            col: minmax_stats(master_df[col]) for col in IMPACT_STAT_COLS
+        }
+
+        # Efficiency threshold from the out-of-fold predictions of the sold
+        # players in train_years: every row is priced by models that never
+        # saw it, and no extra full predict is needed
+        progress("threshold")
+        t0 = time.perf_counter()
+        sold_hist = train_df.copy()
+        sold_hist["predicted_price"] = self._blend(
+            oof_lgbm, oof_knn, sold_hist["base_price"]
+        )
+        sold_hist = self._compute_impact_efficiency(sold_hist)
         sold_hist = sold_hist[sold_hist["efficiency_score"].notna()]
 
         self.efficiency_threshold_ = sold_hist["efficiency_score"].quantile(
             EFFICIENCY_UNSOLD_PERCENTILE
         )
         print("Efficiency unsold threshold:", self.efficiency_threshold_)
+        timings["threshold"] = time.perf_counter() - t0
+
+        timings["total"] = time.perf_counter() - t_start
+        timings["workers"] = scheduler.workers
+        timings["lgbm_threads"] = scheduler.n_jobs
+        self.fit_timings_ = timings
 
         return rmse_log
 
@@ -248,27 +443,26 @@ class AuctionPriceModel:
         for every row in master_df (all years).
         """
         df = master_df.copy()
-        X_all = df[self.feature_cols]
-
-        # LightGBM predictions in log space, then back to price
-        log_pred_lgbm = self.lgbm_pipeline.predict(X_all)
-        price_lgbm = np.expm1(log_pred_lgbm)
-
-        # KNN predictions in log space, then back to price
-        log_pred_knn = self.knn_pipeline.predict(X_all)
-        price_knn = np.expm1(log_pred_knn)
-
-        # 50-50 ensemble
-        price_ensemble = 0.5 * price_lgbm + 0.5 * price_knn
-
-        # Enforce minimum as base price
-        base_price_arr = df["base_price"].fillna(0).values
-        price_ensemble = np.maximum(price_ensemble, base_price_arr)
-
-        df["predicted_price"] = price_ensemble
+        with span("predict.transform"):
+            Xt_all = self.preprocessor.transform(df[self.feature_cols])
+
+        # LightGBM and KNN predictions in log space
+        with span("predict.lgbm"):
+            if self.native_lgbm_ is not None:
+                log_pred_lgbm = self.native_lgbm_.predict_frame(df[self.feature_cols])
+            else:
+                log_pred_lgbm = self.lgbm_model.predict(Xt_all)
+        with span("predict.knn"):
+            log_pred_knn = self.knn_model.predict(Xt_all)
+
+        df["predicted_price"] = self._blend(log_pred_lgbm, log_pred_knn, df["base_price"])
+        # Unblended components (no base-price floor), for exports / diagnostics
+        df["predicted_price_lgbm"] = np.expm1(log_pred_lgbm)
+        df["predicted_price_knn"] = np.expm1(log_pred_knn)
 
         # Add impact and efficiency scores
-        df = self._compute_impact_efficiency(df)
+        with span("predict.impact"):
+            df = self._compute_impact_efficiency(df)
 
         # If threshold is known, classify SOLD / UNSOLD
         if self.efficiency_threshold_ is not None:
@@ -286,23 +480,41 @@ class AuctionPriceModel:
 
         return df
 
+    def _blend(
+        self, log_pred_lgbm: np.ndarray, log_pred_knn: np.ndarray, base_price: pd.Series
+    ) -> np.ndarray:
+        """
+        blend_weight_ ensemble of the two log-price predictions, back in
+        price space, with the base price as the minimum.
+        """
+        return blend_prices(
+            log_pred_lgbm, log_pred_knn, base_price.fillna(0).values, self.blend_weight_
+        )
+
     def _compute_impact_efficiency(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Compute batting_impact, bowling_impact, impact_score, and efficiency_score.
         """
         out = df.copy()
 
+        stats = self.norm_stats_
+        if stats is None:
+            stats = {col: minmax_stats(out[col]) for col in IMPACT_STAT_COLS}
+
+        def norm(col: str) -> pd.Series:
+            return minmax_apply(out[col], stats[col])
+
         # Batting impact: based on runs per match, batting average, strike rate
-        bat_runs = minmax_normalize(out["runs_per_match"])
-        bat_avg = minmax_normalize(out["batting_average"])
-        bat_sr = minmax_normalize(out["batting_strike_rate"])
+        bat_runs = norm("runs_per_match")
+        bat_avg = norm("batting_average")
+        bat_sr = norm("batting_strike_rate")
         batting_stack = np.vstack([bat_runs, bat_avg, bat_sr]).T
         out["batting_impact"] = np.nanmean(batting_stack, axis=1)
 
         # Bowling impact: wickets per match, overs per match, inverted economy
-        bowl_wpm = minmax_normalize(out["wickets_per_match"])
-        bowl_ovpm = minmax_normalize(out["overs_per_match"])
-        bowl_econ = minmax_normalize(out["bowling_economy"])
+        bowl_wpm = norm("wickets_per_match")
+        bowl_ovpm = norm("overs_per_match")
+        bowl_econ = norm("bowling_economy")
         bowl_econ_inv = 1.0 - bowl_econ
         bowling_stack = np.vstack([bowl_wpm, bowl_ovpm, bowl_econ_inv]).T
         out["bowling_impact"] = np.nanmean(bowling_stack, axis=1)
@@ -320,52 +532,200 @@ class AuctionPriceModel:
 
         return out
 
-    def save(self) -> None:
+    def score_one(self, stats: dict, predicted_price: float) -> dict:
         """
-        Save trained pipelines, feature columns, and efficiency threshold to disk.
-        """
-        joblib.dump(self.lgbm_pipeline, f"{MODEL_DIR}/lgbm_price_model.joblib")
-        joblib.dump(self.knn_pipeline, f"{MODEL_DIR}/knn_price_model.joblib")
-        joblib.dump(self.feature_cols, f"{MODEL_DIR}/feature_columns.joblib")
-        joblib.dump(self.efficiency_threshold_, f"{MODEL_DIR}/eff_threshold.joblib")
-        joblib.dump(self.train_years_, f"{MODEL_DIR}/train_years.joblib")
+        Impact, efficiency and SOLD/UNSOLD for a single player, using the
+        fitted normalization stats (no frame needed, plain floats).
 
-    def load(self) -> None:
-        """
-        Load trained pipelines, feature columns, and efficiency threshold from disk.
+        stats: IMPACT_STAT_COLS values (missing keys count as NaN).
         """
-        self.lgbm_pipeline = joblib.load(
-            f"{MODEL_DIR}/lgbm_price_model.joblib"
+        if self.norm_stats_ is None:
+            raise ValueError("Normalization stats not fitted; retrain the model.")
+
+        def norm(col: str) -> float:
+            value = stats.get(col)
+            value = math.nan if value is None else float(value)
+            return minmax_value(value, self.norm_stats_[col])
+
+        batting_impact = _nanmean(
+            [norm("runs_per_match"), norm("batting_average"), norm("batting_strike_rate")]
         )
-        self.knn_pipeline = joblib.load(
-            f"{MODEL_DIR}/knn_price_model.joblib"
+        bowling_impact = _nanmean(
+            [
+                norm("wickets_per_match"),
+                norm("overs_per_match"),
+                1.0 - norm("bowling_economy"),
+            ]
         )
+        impact_score = batting_impact + bowling_impact
+
+        price_crore = predicted_price / 1e7
+        efficiency_score = impact_score / price_crore if price_crore != 0 else math.nan
+
+        unsold = False
+        if self.efficiency_threshold_ is not None:
+            eff = 0.0 if math.isnan(efficiency_score) else efficiency_score
+            unsold = bool(eff < self.efficiency_threshold_)
+
+        return {
+            "batting_impact": batting_impact,
+            "bowling_impact": bowling_impact,
+            "impact_score": impact_score,
+            "predicted_price_crore": price_crore,
+            "efficiency_score": efficiency_score,
+            "predicted_unsold_flag": unsold,
+            "predicted_auction_outcome": "UNSOLD" if unsold else "SOLD",
+        }
+
+    def save(self, model_dir: str = MODEL_DIR) -> None:
+        """
+        Save the fitted preprocessor, both regressors, feature columns, and
+        efficiency threshold to model_dir.
+        """
+        os.makedirs(model_dir, exist_ok=True)
+        joblib.dump(self.preprocessor, os.path.join(model_dir, "preprocessor.joblib"))
+        joblib.dump(self.lgbm_model, os.path.join(model_dir, "lgbm_price_model.joblib"))
+        joblib.dump(self.knn_model, os.path.join(model_dir, "knn_price_model.joblib"))
+        joblib.dump(self.feature_cols, os.path.join(model_dir, "feature_columns.joblib"))
+        joblib.dump(self.efficiency_threshold_, os.path.join(model_dir, "eff_threshold.joblib"))
+        joblib.dump(self.norm_stats_, os.path.join(model_dir, "norm_stats.joblib"))
+        joblib.dump(self.comparables_, os.path.join(model_dir, "comparables.joblib"))
+        joblib.dump(self.train_years_, os.path.join(model_dir, "train_years.joblib"))
+
+        # LightGBM text model + compiled encoding table (sklearn-free inference)
+        export_native(self, model_dir)
+
+    def load(self, model_dir: str = MODEL_DIR) -> None:
+        """
+        Load the preprocessor, regressors, feature columns, and efficiency
+        threshold from model_dir.
+
+        Older artifacts stored a full Pipeline (preprocess + model) per
+        regressor; those are split here, taking the preprocessor from the
+        LightGBM pipeline (both were fitted on the same rows).
+        """
+        lgbm = joblib.load(os.path.join(model_dir, "lgbm_price_model.joblib"))
+        knn = joblib.load(os.path.join(model_dir, "knn_price_model.joblib"))
+
+        if isinstance(lgbm, Pipeline):
+            self.preprocessor = lgbm.named_steps["preprocess"]
+            lgbm = lgbm.named_steps["model"]
+        else:
+            self.preprocessor = joblib.load(os.path.join(model_dir, "preprocessor.joblib"))
+        if isinstance(knn, Pipeline):
+            knn = knn.named_steps["model"]
+
+        self.lgbm_model = lgbm
+        self.knn_model = knn
         self.feature_cols = joblib.load(
-            f"{MODEL_DIR}/feature_columns.joblib"
+            os.path.join(model_dir, "feature_columns.joblib")
         )
         self.efficiency_threshold_ = joblib.load(
-            f"{MODEL_DIR}/eff_threshold.joblib"
+            os.path.join(model_dir, "eff_threshold.joblib")
         )
+        # norm_stats is optional (older artifacts); load if exists
+        norm_stats_path = os.path.join(model_dir, "norm_stats.joblib")
+        if os.path.exists(norm_stats_path):
+            self.norm_stats_ = joblib.load(norm_stats_path)
+
+        # comparables index is optional (older artifacts); load if exists
+        comparables_path = os.path.join(model_dir, "comparables.joblib")
+        if os.path.exists(comparables_path):
+            self.comparables_ = joblib.load(comparables_path)
+
+        # native LightGBM export is optional (older artifacts); load if exists
+        if os.path.exists(os.path.join(model_dir, NATIVE_MODEL_FILE)):
+            self.native_lgbm_ = NativeLgbmPredictor.load(model_dir)
+
         # train_years is optional; load if exists
-        train_years_path = f"{MODEL_DIR}/train_years.joblib"
+        train_years_path = os.path.join(model_dir, "train_years.joblib")
         if os.path.exists(train_years_path):
             self.train_years_ = joblib.load(train_years_path)
 
+        # Tuned hyperparameters (blend weight) live in the registry manifest;
+        # unregistered / older artifacts keep the defaults
+        manifest = read_manifest(model_dir)
+        if manifest is not None and "params" in manifest:
+            self.params_ = merge_params(manifest["params"])
+            self.blend_weight_ = self.params_["blend_weight"]
+
+
+def train_and_register(
+    prediction_year: int = PREDICTION_YEAR,
+    train_years: list[int] | None = None,
+    progress: Optional[Callable[[str], None]] = None,
+    params: dict | None = None,
+    info: dict | None = None,
+) -> tuple["AuctionPriceModel", ModelKey, str, pd.DataFrame]:
+    """
+    Train a model for one prediction year and save it as a registry entry.
+
+    - Only rows up to prediction_year are used (no look-ahead for backtests)
+    - train_years defaults to TRAIN_YEARS for PREDICTION_YEAR, otherwise
+      the two auction years before prediction_year
+    - params (see DEFAULT_MODEL_PARAMS) defaults to the params already in
+      this key's manifest, so a retrain keeps a tuned config
+    - info: extra manifest fields (e.g. the tuning report)
+    - Returns (model, key, model_dir, predictions for all years used)
+
+    progress(stage) is called as each stage starts:
+    loading, cv, fit, threshold, save, predict.
+    """
+    progress = progress or (lambda stage: None)
+
+    progress("loading")
+    master_df = load_and_prepare_master()
+    master_df = master_df[master_df["year"] <= prediction_year]
+    if train_years is None:
+        train_years = default_train_years(
+            master_df["year"].dropna().unique(), prediction_year
+        )
+
+    key = make_key(train_years, prediction_year)
+    model_dir = model_dir_for(key)
+    if params is None:
+        previous = read_manifest(model_dir) or {}
+        params = previous.get("params")
+        if info is None and "tuning" in previous:
+            info = {"tuning": previous["tuning"]}
+
+    model = AuctionPriceModel(params)
+    rmse_log = model.fit(
+        master_df,
+        train_years=train_years,
+        progress=progress,
+        prediction_year=prediction_year,
+    )
+    print(f"Trained hybrid model on years {train_years}. Log RMSE:", rmse_log)
+
+    progress("save")
+    model.save(model_dir)
+    write_manifest(
+        model_dir,
+        key,
+        {
+            "cv_rmse_log": float(rmse_log),
+            "params": model.params_,
+            "fit_timings": model.fit_timings_,
+            **(info or {}),
+        },
+    )
+
+    progress("predict")
+    preds_df = model.predict_prices(master_df)
+    return model, key, model_dir, preds_df
+
 
-def train_full_model() -> pd.DataFrame:
+def train_full_model(
+    progress: Optional[Callable[[str], None]] = None,
+) -> pd.DataFrame:
     """
     Full training helper:
     - Loads all data into master_df
     - Trains on fixed TRAIN_YEARS (e.g. [2023, 2024])
-    - Saves models to disk
+    - Saves models to the registry
     - Returns master_df with predictions for ALL years
       (API will filter to PREDICTION_YEAR = 2025).
     """
-    master_df = load_and_prepare_master()
-    model = AuctionPriceModel()
-    rmse_log = model.fit(master_df, train_years=TRAIN_YEARS)
-    print(f"Trained hybrid model on years {TRAIN_YEARS}. Log RMSE:", rmse_log)
-    model.save()
-    preds_df = model.predict_prices(master_df)
+    _, _, _, preds_df = train_and_register(progress=progress)
     return preds_df
-
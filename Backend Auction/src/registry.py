@@ -0,0 +1,153 @@
+# src/registry.py
+
+import glob
+import json
+import os
+import time
+import uuid
+from typing import NamedTuple, Optional
+
+from .config import (
+    MODEL_DIR,
+    REGISTRY_DIR,
+    FEATURE_SET_VERSION,
+    TRAIN_YEARS,
+    PREDICTION_YEAR,
+)
+
+MANIFEST_NAME = "manifest.json"
+
+# Artifacts every loadable model directory must contain
+REQUIRED_FILES = [
+    "lgbm_price_model.joblib",
+    "knn_price_model.joblib",
+    "feature_columns.joblib",
+    "eff_threshold.joblib",
+]
+
+
+class ModelKey(NamedTuple):
+    """
+    Identity of one trained artifact set.
+    """
+
+    train_years: tuple
+    prediction_year: int
+    feature_set_version: str
+
+    @property
+    def dirname(self) -> str:
+        years = "-".join(str(y) for y in self.train_years)
+        return f"pred{self.prediction_year}_train{years}_fs{self.feature_set_version}"
+
+    def to_dict(self) -> dict:
+        return {
+            "train_years": list(self.train_years),
+            "prediction_year": self.prediction_year,
+            "feature_set_version": self.feature_set_version,
+        }
+
+
+def make_key(
+    train_years: list[int],
+    prediction_year: int,
+    feature_set_version: str = FEATURE_SET_VERSION,
+) -> ModelKey:
+    return ModelKey(
+        tuple(int(y) for y in sorted(train_years)),
+        int(prediction_year),
+        str(feature_set_version),
+    )
+
+
+def default_train_years(available_years, prediction_year: int) -> list[int]:
+    """
+    The locked TRAIN_YEARS for PREDICTION_YEAR; otherwise the last two
+    auction years before prediction_year.
+    """
+    if int(prediction_year) == PREDICTION_YEAR:
+        return list(TRAIN_YEARS)
+
+    past = sorted(int(y) for y in set(available_years) if y < prediction_year)
+    if not past:
+        raise ValueError(
+            f"No completed auction years before {prediction_year} to train on."
+        )
+    return past[-2:]
+
+
+def model_dir_for(key: ModelKey) -> str:
+    return os.path.join(REGISTRY_DIR, key.dirname)
+
+
+def has_artifacts(model_dir: str) -> bool:
+    return all(os.path.exists(os.path.join(model_dir, f)) for f in REQUIRED_FILES)
+
+
+def write_manifest(model_dir: str, key: ModelKey, info: Optional[dict] = None) -> dict:
+    manifest = {
+        **key.to_dict(),
+        "created_at": time.time(),
+        "files": sorted(
+            f for f in os.listdir(model_dir)
+            if f != MANIFEST_NAME and not f.endswith(".tmp")
+        ),
+        **(info or {}),
+    }
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def read_manifest(model_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(model_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def list_models() -> list[dict]:
+    """
+    Every registered artifact set (manifest + directory), newest first.
+    """
+    entries = []
+    pattern = os.path.join(REGISTRY_DIR, "*", MANIFEST_NAME)
+    for path in glob.glob(pattern):
+        model_dir = os.path.dirname(path)
+        manifest = read_manifest(model_dir)
+        if manifest is not None and has_artifacts(model_dir):
+            entries.append({**manifest, "model_dir": model_dir})
+    entries.sort(key=lambda m: m.get("created_at", 0), reverse=True)
+    return entries
+
+
+def _key_from_manifest(manifest: dict) -> ModelKey:
+    return make_key(
+        manifest["train_years"],
+        manifest["prediction_year"],
+        manifest["feature_set_version"],
+    )
+
+
+def resolve(prediction_year: int) -> Optional[tuple[ModelKey, str]]:
+    """
+    (key, model_dir) of the model serving `prediction_year`: the newest
+    registered set for the current feature version. For PREDICTION_YEAR the
+    flat artifacts in MODEL_DIR (saved before the registry existed) are
+    used when nothing is registered.
+    """
+    for manifest in list_models():
+        if (
+            int(manifest["prediction_year"]) == int(prediction_year)
+            and str(manifest["feature_set_version"]) == FEATURE_SET_VERSION
+        ):
+            return _key_from_manifest(manifest), manifest["model_dir"]
+
+    if int(prediction_year) == PREDICTION_YEAR and has_artifacts(MODEL_DIR):
+        return make_key(TRAIN_YEARS, PREDICTION_YEAR), MODEL_DIR
+
+    return None
@@ -1,7 +1,11 @@
 # backend_auction/src/schemas.py
 
-from pydantic import BaseModel
-from typing import List, Optional
+import math
+
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
+
+from .config import EXACT_MAX_TIME_LIMIT_SECONDS
 
 
 class TrainResponse(BaseModel):
@@ -37,3 +41,92 @@ class SquadResponse(BaseModel):
     players: List[SquadPlayer]
     overseas_count: int
     total_players: int
+
+
+class PlayerBatchRequest(BaseModel):
+    names: List[str] = Field(..., min_length=1, max_length=1000)
+
+
+# Sweepable /squad parameters, in grid order
+SWEEP_AXES = ("total_purse", "squad_size", "max_overseas", "min_overseas")
+
+
+class SweepRange(BaseModel):
+    """Inclusive numeric range: start, start + step, ..., <= stop."""
+
+    start: float
+    stop: float
+    step: float = Field(..., gt=0)
+
+    def count(self) -> int:
+        """Number of values, without building them."""
+        # Tolerance so an inclusive stop survives float error (0.3 / 0.1)
+        steps = (self.stop - self.start) / self.step
+        return max(math.floor(steps + 1e-9 * max(1.0, abs(steps))) + 1, 0)
+
+    def values(self) -> List[float]:
+        return [self.start + i * self.step for i in range(self.count())]
+
+
+class SquadSweepRequest(BaseModel):
+    total_purse: Union[List[float], SweepRange] = [500_000_000]
+    squad_size: Union[List[int], SweepRange] = [9]
+    max_overseas: Union[List[int], SweepRange] = [3]
+    min_overseas: Union[List[int], SweepRange] = [1]
+    mode: str = "greedy"
+    time_limit: float = Field(2.0, gt=0, le=EXACT_MAX_TIME_LIMIT_SECONDS)
+
+    def axis_counts(self) -> dict:
+        """Parameter name -> number of values, without expanding ranges."""
+        return {
+            name: value.count() if isinstance(value, SweepRange) else len(value)
+            for name, value in ((n, getattr(self, n)) for n in SWEEP_AXES)
+        }
+
+    def grid(self) -> dict:
+        """Parameter name -> list of values (ranges expanded)."""
+        out = {}
+        for name in SWEEP_AXES:
+            value = getattr(self, name)
+            values = value.values() if isinstance(value, SweepRange) else list(value)
+            if name != "total_purse":
+                values = [int(v) for v in values]
+            out[name] = values
+        return out
+
+
+class PlayerFeaturesRequest(BaseModel):
+    """
+    Raw model features for a player who is not in the auction data.
+    Omitted values are imputed like missing values at training time;
+    rate stats (runs_per_match, bowling_economy, ...) are derived from
+    matches_played and the totals when not given.
+    """
+
+    name: Optional[str] = None
+
+    base_price: Optional[float] = None
+    age_at_auction: Optional[float] = None
+    matches_played: Optional[float] = None
+    innings_batted: Optional[float] = None
+    innings_bowled: Optional[float] = None
+    total_runs: Optional[float] = None
+    total_balls_batted: Optional[float] = None
+    total_wickets: Optional[float] = None
+    total_balls_bowled: Optional[float] = None
+    total_runs_conceded: Optional[float] = None
+    outs: Optional[float] = None
+    runs_per_match: Optional[float] = None
+    wickets_per_match: Optional[float] = None
+    batting_average: Optional[float] = None
+    batting_strike_rate: Optional[float] = None
+    overs_bowled_total: Optional[float] = None
+    bowling_economy: Optional[float] = None
+    overs_per_match: Optional[float] = None
+
+    batting_hand: Optional[str] = None
+    bowling_hand: Optional[str] = None
+    batting_type: Optional[str] = None
+    bowling_type: Optional[str] = None
+    country_bucket: Optional[str] = None  # "Indian" / "Overseas"
+    role: Optional[str] = None
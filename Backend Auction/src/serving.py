@@ -0,0 +1,160 @@
+# src/serving.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .config import MODEL_CACHE_MAX_LOADED
+from .metrics import (
+    MODEL_CACHE_EVICTIONS,
+    MODEL_CACHE_LOADED,
+    MODEL_CACHE_REQUESTS,
+    MODEL_LOAD_SECONDS,
+)
+from .inference import SingleRowPredictor, build_predictor
+from .model import AuctionPriceModel
+from .registry import ModelKey, read_manifest, resolve
+from .snapshot import PredictionSnapshot
+
+
+class ServingModel:
+    """
+    Everything the API serves for one prediction year, loaded together and
+    replaced together: the model, its scored snapshot and the /predict
+    single-row predictor.
+    """
+
+    def __init__(
+        self,
+        key: ModelKey,
+        model_dir: str,
+        model: AuctionPriceModel,
+        snapshot: PredictionSnapshot,
+        load_seconds: Optional[float] = None,
+    ) -> None:
+        self.key = key
+        self.year = key.prediction_year
+        self.model_dir = model_dir
+        self.model = model
+        self.snapshot = snapshot
+        self.predictor: Optional[SingleRowPredictor] = build_predictor(model)
+        self.manifest = read_manifest(model_dir)
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+
+    @classmethod
+    def load(cls, key: ModelKey, model_dir: str) -> "ServingModel":
+        t0 = time.perf_counter()
+        model = AuctionPriceModel()
+        model.load(model_dir)
+        model.prediction_year_ = key.prediction_year
+        snapshot = PredictionSnapshot.build(model, year=key.prediction_year)
+        load_seconds = time.perf_counter() - t0
+        MODEL_LOAD_SECONDS.labels(year=str(key.prediction_year)).observe(load_seconds)
+        return cls(key, model_dir, model, snapshot, load_seconds)
+
+    def info(self) -> dict:
+        return {
+            **self.key.to_dict(),
+            "model_dir": self.model_dir,
+            "registered": self.manifest is not None,
+            "players": len(self.snapshot),
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+        }
+
+
+class ModelCache:
+    """
+    Prediction year -> ServingModel, loaded lazily from the registry and
+    kept in a bounded LRU (least recently used year is evicted first).
+
+    A year is loaded at most once at a time; requests for other years are
+    not blocked while it loads.
+    """
+
+    def __init__(self, max_loaded: int = MODEL_CACHE_MAX_LOADED) -> None:
+        self.max_loaded = max(1, int(max_loaded))
+        self._loaded: "OrderedDict[int, ServingModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[int, threading.Lock] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, year: int) -> Optional[ServingModel]:
+        # Caller holds self._lock
+        serving = self._loaded.get(year)
+        if serving is not None:
+            self._loaded.move_to_end(year)
+        return serving
+
+    def get_loaded(self, year: int) -> Optional[ServingModel]:
+        """
+        Serving model for `year` if it is already loaded, else None (never
+        loads). Lets async handlers skip the executor on a cache hit.
+        """
+        with self._lock:
+            serving = self._lookup(int(year))
+            if serving is not None:
+                self.hits += 1
+                MODEL_CACHE_REQUESTS.labels(result="hit").inc()
+            return serving
+
+    def get(self, year: int) -> Optional[ServingModel]:
+        """
+        Serving model for `year`, loading it if needed; None if no model
+        is registered for that year.
+        """
+        year = int(year)
+        with self._lock:
+            serving = self._lookup(year)
+            if serving is not None:
+                self.hits += 1
+                MODEL_CACHE_REQUESTS.labels(result="hit").inc()
+                return serving
+            load_lock = self._load_locks.setdefault(year, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                serving = self._lookup(year)
+                if serving is not None:
+                    # Loaded by a concurrent request while we waited
+                    self.hits += 1
+                    MODEL_CACHE_REQUESTS.labels(result="hit").inc()
+                    return serving
+
+            resolved = resolve(year)
+            if resolved is None:
+                return None
+            serving = ServingModel.load(*resolved)
+            with self._lock:
+                self.misses += 1
+            MODEL_CACHE_REQUESTS.labels(result="miss").inc()
+            self.put(serving)
+            return serving
+
+    def put(self, serving: ServingModel) -> None:
+        """
+        Insert or hot-swap the model for serving.year.
+        """
+        with self._lock:
+            self._loaded[serving.year] = serving
+            self._loaded.move_to_end(serving.year)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+                self.evictions += 1
+                MODEL_CACHE_EVICTIONS.inc()
+            MODEL_CACHE_LOADED.set(len(self._loaded))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "max_loaded": self.max_loaded,
+                "loaded": [s.info() for s in self._loaded.values()],
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,130 @@
+# src/snapshot.py
+
+import threading
+import pandas as pd  # dataframes
+from typing import Optional
+
+from .config import PREDICTION_YEAR
+from .features import load_and_prepare_master
+from .squad import SquadCandidates
+from .table import TablePayload
+
+
+def normalize_name(name) -> str:
+    """
+    Lookup key for player names: case-insensitive, whitespace-collapsed.
+    """
+    return " ".join(str(name).split()).lower()
+
+
+def _optional_float(row: pd.Series, col: str) -> Optional[float]:
+    if col in row and not pd.isna(row[col]):
+        return float(row[col])
+    return None
+
+
+def player_record(row: pd.Series) -> dict:
+    """
+    JSON-ready single-player payload (same fields as /players/2025).
+    """
+    outcome = row["predicted_auction_outcome"]
+    predicted_price = (
+        float(row["predicted_price"]) if outcome == "SOLD" else None
+    )
+
+    return {
+        "name": row["name"],
+        "year": int(row["year"]),
+        "base_price": _optional_float(row, "base_price"),
+        "predicted_auction_outcome": outcome,
+        "predicted_price": predicted_price,
+        "impact_score": _optional_float(row, "impact_score"),
+        "efficiency_score": _optional_float(row, "efficiency_score"),
+    }
+
+
+class PredictionSnapshot:
+    """
+    Read-only result of one scoring run, built once and shared by requests.
+
+    - preds_df: predict_prices output for ALL years (squad selection input)
+    - year_df: rows for the prediction year only
+    - players: normalized name -> player_record, for O(1) lookups
+    - squad_candidates: array-backed squad candidates for the year
+    - table(): the serialized /players/{year}/table response, built on
+      first use
+
+    A snapshot is never mutated after construction; retraining builds a new
+    one and the API swaps the reference in a single assignment.
+    """
+
+    def __init__(self, preds_df: pd.DataFrame, year: int = PREDICTION_YEAR) -> None:
+        self.year = int(year)
+        self.preds_df = preds_df
+        self.year_df = preds_df[preds_df["year"] == self.year].reset_index(drop=True)
+
+        self.players: dict[str, dict] = {}
+        for _, row in self.year_df.iterrows():
+            key = normalize_name(row["name"])
+            # Keep the first row per name (matches the old iloc[0] behaviour)
+            if key not in self.players:
+                self.players[key] = player_record(row)
+
+        self.squad_candidates = SquadCandidates(preds_df, self.year)
+
+        self._table: Optional[TablePayload] = None
+        self._table_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, model, year: int = PREDICTION_YEAR) -> "PredictionSnapshot":
+        """
+        Load the master table and score it with an already-loaded model.
+        """
+        master_df = load_and_prepare_master()
+        preds_df = model.predict_prices(master_df)
+        return cls(preds_df, year=year)
+
+    def table(self) -> TablePayload:
+        """
+        Pre-serialized table bytes (every content coding + ETags). Built once;
+        a retrain produces a new snapshot and therefore a new payload.
+        """
+        if self._table is None:
+            with self._table_lock:
+                if self._table is None:
+                    self._table = TablePayload(self.year, self.year_df)
+        return self._table
+
+    def cached_table(self) -> Optional[TablePayload]:
+        """
+        The table payload if table() already built it, else None (never builds).
+        """
+        return self._table
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.players.get(normalize_name(name))
+
+    def get_many(self, names: list[str]) -> tuple[list[dict], list[str]]:
+        """
+        Resolve many names in one pass over the name index.
+
+        Returns (records in request order, names that were not found).
+        """
+        keys = (
+            pd.Series(names, dtype=object)
+            .astype(str)
+            .str.split()
+            .str.join(" ")
+            .str.lower()
+        )
+        matched = keys.map(self.players)
+
+        found = [rec for rec in matched.tolist() if isinstance(rec, dict)]
+        not_found = [
+            name for name, rec in zip(names, matched.tolist())
+            if not isinstance(rec, dict)
+        ]
+        return found, not_found
+
+    def __len__(self) -> int:
+        return len(self.year_df)
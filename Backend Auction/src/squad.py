@@ -1,6 +1,299 @@
 # src/squad.py
 
+import copy  # for frame-less candidate copies
+import time  # for solve timing
+
+import numpy as np  # for candidate arrays
 import pandas as pd  # for DataFrame typing
+from scipy.optimize import Bounds, LinearConstraint, milp  # exact solver
+
+from .metrics import span  # per-stage latency histograms
+
+SQUAD_MODES = ("greedy", "exact")
+
+DEFAULT_ROLE_REQUIREMENTS = {
+    "Batter": 3,
+    "Bowler": 3,
+    "Allrounder": 2,
+}
+
+# Wall-clock budget for the exact solver before it returns its best incumbent
+EXACT_TIME_LIMIT_SECONDS = 2.0
+
+
+def constraint_errors(
+    squad_size: int,
+    max_overseas: int,
+    min_overseas: int,
+    role_requirements=None,
+    mode: str = "greedy",
+) -> list[str]:
+    """
+    Reasons the constraints can never be met, whatever the candidates
+    (empty if they can). In exact mode the role minimums are hard
+    constraints, so they and min_overseas must fit in squad_size.
+    """
+    if role_requirements is None:
+        role_requirements = DEFAULT_ROLE_REQUIREMENTS
+
+    errors = []
+    if squad_size < 1:
+        errors.append(f"squad_size must be at least 1 (got {squad_size}).")
+    if min_overseas > max_overseas:
+        errors.append(f"min_overseas ({min_overseas}) exceeds max_overseas ({max_overseas}).")
+    if min_overseas > squad_size:
+        errors.append(f"min_overseas ({min_overseas}) exceeds squad_size ({squad_size}).")
+    if mode == "exact":
+        required = min_overseas + sum(role_requirements.values())
+        if required > squad_size:
+            errors.append(
+                f"Exact mode needs at least {required} players "
+                f"(min_overseas {min_overseas} + domestic role minimums "
+                f"{dict(role_requirements)}) but squad_size is {squad_size}."
+            )
+    return errors
+
+
+def squad_candidates(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """
+    Players of `year` the model predicts as SOLD with a usable efficiency,
+    sorted by efficiency_score descending.
+    """
+    candidates = df[
+        (df["year"] == year)
+        & (df["predicted_auction_outcome"] == "SOLD")
+        & df["efficiency_score"].notna()
+    ].copy()
+
+    return candidates.sort_values("efficiency_score", ascending=False)
+
+
+class SquadCandidates:
+    """
+    Candidate table for one year held as NumPy arrays.
+
+    Built once per scored table (the API keeps one on the prediction
+    snapshot) so repeated squad builds skip filtering, sorting and
+    iterrows. Rows are in efficiency_score-descending order; every index
+    list below preserves that order.
+    """
+
+    def __init__(self, df: pd.DataFrame, year: int) -> None:
+        self.year = year
+        self.frame = squad_candidates(df, year)
+
+        bucket = self.frame["country_bucket"]
+        self.price = self.frame["predicted_price"].to_numpy(dtype=float)
+        self.impact = self.frame["impact_score"].fillna(0).to_numpy(dtype=float)
+        self.efficiency = self.frame["efficiency_score"].to_numpy(dtype=float)
+        if "player_id" in self.frame.columns:
+            self.player_ids = self.frame["player_id"].to_numpy(dtype=float)
+        else:
+            self.player_ids = np.full(len(self.frame), np.nan)
+        self.is_overseas = (bucket == "Overseas").to_numpy()
+        self.is_domestic = (bucket == "Indian").to_numpy()
+
+        # Role / name codes (name code -1 = missing name, never deduplicated)
+        self.role_codes, self.roles = pd.factorize(self.frame["role"])
+        self.name_codes, self.names = pd.factorize(self.frame["name"])
+
+        # Per-role / per-bucket index lists, already in efficiency order
+        self.overseas_idx = np.flatnonzero(self.is_overseas)
+        self.domestic_idx = np.flatnonzero(self.is_domestic)
+        self.domestic_by_role = {
+            role: np.flatnonzero(self.is_domestic & (self.role_codes == code))
+            for code, role in enumerate(self.roles)
+        }
+
+        # Plain-Python copies for the scalar greedy loop
+        self._price_list = self.price.tolist()
+        self._name_list = self.name_codes.tolist()
+        self._overseas_list = self.overseas_idx.tolist()
+        self._domestic_list = self.domestic_idx.tolist()
+        self._role_lists = {r: idx.tolist() for r, idx in self.domestic_by_role.items()}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def greedy_positions(
+        self,
+        total_purse: float,
+        squad_size: int,
+        max_overseas: int,
+        min_overseas: int,
+        role_requirements: dict,
+    ) -> tuple[list[int], float]:
+        """
+        Greedy selection as candidate positions (selection order) + spend.
+        """
+        price = self._price_list
+        name_code = self._name_list
+        selected: list[int] = []
+        taken_names = np.zeros(len(self.names) + 1, dtype=bool)  # [-1] = unused
+        spent = 0.0
+        overseas_count = 0
+
+        # --- Phase 1: ensure MINIMUM overseas players ---
+        for i in self._overseas_list:
+            if overseas_count >= min_overseas:
+                break  # already satisfied min_overseas
+
+            if (
+                spent + price[i] <= total_purse
+                and len(selected) < squad_size
+                and overseas_count < max_overseas
+            ):
+                selected.append(i)
+                spent += price[i]
+                overseas_count += 1
+
+        # Track selected names to avoid duplicates later
+        for i in selected:
+            if name_code[i] >= 0:
+                taken_names[name_code[i]] = True
+
+        def try_add(i: int) -> None:
+            nonlocal spent
+            code = name_code[i]
+            if (
+                (code < 0 or not taken_names[code])
+                and spent + price[i] <= total_purse
+                and len(selected) < squad_size
+            ):
+                selected.append(i)
+                if code >= 0:
+                    taken_names[code] = True
+                spent += price[i]
+
+        # --- Phase 2: role fulfilment with DOMESTIC players ---
+        for role, needed in role_requirements.items():
+            for i in self._role_lists.get(role, []):
+                try_add(i)
+                if len(selected) >= squad_size:
+                    break
+            if len(selected) >= squad_size:
+                break
+
+        # --- Phase 3: efficiency-based filling with DOMESTIC players ---
+        for i in self._domestic_list:
+            if len(selected) >= squad_size:
+                break
+            try_add(i)
+
+        return selected, spent
+
+    def exact_positions(
+        self,
+        total_purse: float,
+        squad_size: int,
+        max_overseas: int,
+        min_overseas: int,
+        role_requirements: dict,
+        time_limit: float = EXACT_TIME_LIMIT_SECONDS,
+    ) -> tuple[np.ndarray | None, str, str | None]:
+        """
+        Impact-maximizing selection via MILP.
+
+        Returns (positions or None if no feasible squad, status, solver message).
+        """
+        n = len(self.price)
+        if n == 0:
+            return None, "infeasible", "No candidates."
+
+        rows = [
+            (self.price, -np.inf, total_purse),
+            (np.ones(n), squad_size, squad_size),
+            (self.is_overseas.astype(float), min_overseas, max_overseas),
+        ]
+        for role_name, needed in role_requirements.items():
+            role_mask = np.zeros(n)
+            role_mask[self.domestic_by_role.get(role_name, [])] = 1.0
+            rows.append((role_mask, needed, np.inf))
+
+        name_codes = self.name_codes
+        if len(self.names) < n:
+            counts = np.bincount(name_codes[name_codes >= 0])
+            for code in np.flatnonzero(counts > 1):
+                rows.append(((name_codes == code).astype(float), 0, 1))
+
+        result = milp(
+            c=-self.impact,
+            constraints=LinearConstraint(
+                np.vstack([r[0] for r in rows]),
+                [r[1] for r in rows],
+                [r[2] for r in rows],
+            ),
+            integrality=np.ones(n),
+            bounds=Bounds(0, 1),
+            options={"time_limit": time_limit},
+        )
+
+        if result.x is None:
+            return None, "infeasible", result.message
+        status = "optimal" if result.status == 0 else "time_limit"
+        return np.flatnonzero(result.x > 0.5), status, result.message
+
+    def evaluate(
+        self,
+        total_purse: float,
+        squad_size: int,
+        max_overseas: int,
+        min_overseas: int,
+        role_requirements: dict,
+        mode: str = "greedy",
+        time_limit: float = EXACT_TIME_LIMIT_SECONDS,
+    ) -> dict:
+        """
+        Squad summary without building a DataFrame (used by sweeps).
+        """
+        positions = None
+        if mode == "exact":
+            positions, status, _ = self.exact_positions(
+                total_purse,
+                squad_size,
+                max_overseas,
+                min_overseas,
+                role_requirements,
+                time_limit,
+            )
+            if positions is None:
+                status = "fallback_greedy"
+        if positions is None:
+            positions, _ = self.greedy_positions(
+                total_purse, squad_size, max_overseas, min_overseas, role_requirements
+            )
+            if mode == "greedy":
+                status = "heuristic"
+        positions = np.asarray(positions, dtype=np.int64)
+
+        return {
+            "spend": float(self.price[positions].sum()),
+            "impact": float(self.impact[positions].sum()),
+            "positions": positions.tolist(),
+            "status": status,
+        }
+
+    def without_frame(self) -> "SquadCandidates":
+        """
+        Shallow copy minus the DataFrame: cheap to pickle to worker processes.
+        """
+        light = copy.copy(self)
+        light.frame = None
+        return light
+
+    def to_squad(self, positions) -> pd.DataFrame:
+        """
+        Materialize the chosen rows, sorted by efficiency_score.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        # Order on the small efficiency vector first (same ordering as
+        # sort_values on the squad), then take the rows in one go
+        order = (
+            pd.Series(self.efficiency[positions])
+            .sort_values(ascending=False)
+            .index.to_numpy()
+        )
+        return self.frame.take(positions[order]).reset_index(drop=True)
 
 
 def select_squad(
@@ -11,6 +304,7 @@ def select_squad(
     max_overseas: int = 3,
     min_overseas: int = 1,
     role_requirements=None,
+    candidates: SquadCandidates | None = None,
 ) -> pd.DataFrame:
     """
     Select a squad under purse + overseas constraints, using efficiency_score.
@@ -24,111 +318,153 @@ def select_squad(
         min_overseas: Minimum number of overseas players to target.
         role_requirements: Optional dict of role -> minimum domestic count.
                            Example: {"Batter": 3, "Bowler": 3, "Allrounder": 2}
+        candidates: Optional prebuilt SquadCandidates for (df, year).
 
     Returns:
         squad_df: DataFrame with selected players sorted by efficiency_score.
     """
     if role_requirements is None:
-        role_requirements = {
-            "Batter": 3,
-            "Bowler": 3,
-            "Allrounder": 2,
-        }
+        role_requirements = DEFAULT_ROLE_REQUIREMENTS
 
-    # Filter players for the given year and only those that the model predicts as SOLD
-    candidates = df[
-        (df["year"] == year)
-        & (df["predicted_auction_outcome"] == "SOLD")
-        & df["efficiency_score"].notna()
-    ].copy()
+    if candidates is None:
+        with span("squad.candidates"):
+            candidates = SquadCandidates(df, year)
 
-    # Sort by efficiency descending
-    candidates = candidates.sort_values("efficiency_score", ascending=False)
+    with span("squad.greedy"):
+        positions, spent = candidates.greedy_positions(
+            total_purse=total_purse,
+            squad_size=squad_size,
+            max_overseas=max_overseas,
+            min_overseas=min_overseas,
+            role_requirements=role_requirements,
+        )
+    with span("squad.to_frame"):
+        squad_df = candidates.to_squad(positions)
 
-    selected_rows = []
-    spent = 0.0
-    overseas_count = 0
+    # Simple debug prints (optional)
+    print(f"Total players: {len(squad_df)} / {squad_size}")
+    print(f"Total spent: {spent}")
+    print(f"Purse remaining: {total_purse - spent}")
+    print(f"Overseas count: {(squad_df['country_bucket'] == 'Overseas').sum()}")
 
-    def can_afford(price: float) -> bool:
-        return spent + price <= total_purse
+    return squad_df
 
-    def row_key(r) -> tuple:
-        return (r["name"], r["year"])
 
-    # --- Phase 1: ensure MINIMUM overseas players ---
-    overseas_candidates = candidates[candidates["country_bucket"] == "Overseas"]
+def select_squad_exact(
+    df: pd.DataFrame,
+    year: int,
+    total_purse: float,
+    squad_size: int = 9,
+    max_overseas: int = 3,
+    min_overseas: int = 1,
+    role_requirements=None,
+    time_limit: float = EXACT_TIME_LIMIT_SECONDS,
+    candidates: SquadCandidates | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Squad that maximizes total impact_score, solved as a 0/1 integer program.
 
-    for _, row in overseas_candidates.iterrows():
-        if overseas_count >= min_overseas:
-            break  # already satisfied min_overseas
+    Constraints (over the same candidates as select_squad):
+    - total predicted_price <= total_purse
+    - exactly squad_size players
+    - min_overseas <= overseas players <= max_overseas
+    - at least role_requirements[role] domestic players per role
+    - at most one row per player name
 
-        price = row["predicted_price"]
-        if (
-            can_afford(price)
-            and len(selected_rows) < squad_size
-            and overseas_count < max_overseas
-        ):
-            selected_rows.append(row)
-            spent += price
-            overseas_count += 1
+    Returns (squad_df, info). If the solver finds no feasible squad within
+    time_limit seconds, falls back to the greedy select_squad.
+    """
+    if role_requirements is None:
+        role_requirements = DEFAULT_ROLE_REQUIREMENTS
 
-    # Track selected keys to avoid duplicates later
-    selected_keys = {row_key(r) for r in selected_rows}
+    start = time.perf_counter()
+    if candidates is None:
+        with span("squad.candidates"):
+            candidates = SquadCandidates(df, year)
 
-    # --- Phase 2: role fulfilment with DOMESTIC players ---
-    for role, needed in role_requirements.items():
-        role_cands = candidates[
-            (candidates["country_bucket"] == "Indian")
-            & (candidates["role"] == role)
-        ]
+    with span("squad.exact_solve"):
+        positions, status, message = candidates.exact_positions(
+            total_purse=total_purse,
+            squad_size=squad_size,
+            max_overseas=max_overseas,
+            min_overseas=min_overseas,
+            role_requirements=role_requirements,
+            time_limit=time_limit,
+        )
 
-        for _, row in role_cands.iterrows():
-            key = row_key(row)
-            price = row["predicted_price"]
+    if positions is not None:
+        with span("squad.to_frame"):
+            squad_df = candidates.to_squad(positions)
+    else:
+        squad_df = select_squad(
+            df,
+            year=year,
+            total_purse=total_purse,
+            squad_size=squad_size,
+            max_overseas=max_overseas,
+            min_overseas=min_overseas,
+            role_requirements=role_requirements,
+            candidates=candidates,
+        )
+        status = "fallback_greedy"
 
-            if (
-                key not in selected_keys
-                and can_afford(price)
-                and len(selected_rows) < squad_size
-            ):
-                selected_rows.append(row)
-                selected_keys.add(key)
-                spent += price
+    info = {
+        "mode": "exact",
+        "status": status,
+        "solver_message": message,
+        "solve_seconds": time.perf_counter() - start,
+        "total_impact": float(squad_df["impact_score"].sum()) if len(squad_df) else 0.0,
+    }
+    return squad_df, info
 
-                if len(selected_rows) >= squad_size:
-                    break
-        if len(selected_rows) >= squad_size:
-            break
-
-    # --- Phase 3: efficiency-based filling with DOMESTIC players ---
-    filler_cands = candidates[candidates["country_bucket"] == "Indian"]
-
-    for _, row in filler_cands.iterrows():
-        key = row_key(row)
-        price = row["predicted_price"]
-
-        if (
-            key not in selected_keys
-            and can_afford(price)
-            and len(selected_rows) < squad_size
-        ):
-            selected_rows.append(row)
-            selected_keys.add(key)
-            spent += price
-
-        if len(selected_rows) >= squad_size:
-            break
-
-    squad_df = (
-        pd.DataFrame(selected_rows)
-        .sort_values("efficiency_score", ascending=False)
-        .reset_index(drop=True)
-    )
 
-    # Simple debug prints (optional)
-    print(f"Total players: {len(squad_df)} / {squad_size}")
-    print(f"Total spent: {spent}")
-    print(f"Purse remaining: {total_purse - spent}")
-    print(f"Overseas count: {(squad_df['country_bucket'] == 'Overseas').sum()}")
+def build_squad(
+    df: pd.DataFrame,
+    year: int,
+    total_purse: float,
+    squad_size: int = 9,
+    max_overseas: int = 3,
+    min_overseas: int = 1,
+    role_requirements=None,
+    mode: str = "greedy",
+    time_limit: float = EXACT_TIME_LIMIT_SECONDS,
+    candidates: SquadCandidates | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Dispatch to the greedy or exact selector; returns (squad_df, info).
+    """
+    if mode not in SQUAD_MODES:
+        raise ValueError(f"Unknown squad mode '{mode}'. Use one of {SQUAD_MODES}.")
 
-    return squad_df
+    if mode == "exact":
+        return select_squad_exact(
+            df,
+            year=year,
+            total_purse=total_purse,
+            squad_size=squad_size,
+            max_overseas=max_overseas,
+            min_overseas=min_overseas,
+            role_requirements=role_requirements,
+            time_limit=time_limit,
+            candidates=candidates,
+        )
+
+    start = time.perf_counter()
+    squad_df = select_squad(
+        df,
+        year=year,
+        total_purse=total_purse,
+        squad_size=squad_size,
+        max_overseas=max_overseas,
+        min_overseas=min_overseas,
+        role_requirements=role_requirements,
+        candidates=candidates,
+    )
+    info = {
+        "mode": "greedy",
+        "status": "heuristic",
+        "solver_message": None,
+        "solve_seconds": time.perf_counter() - start,
+        "total_impact": float(squad_df["impact_score"].sum()) if len(squad_df) else 0.0,
+    }
+    return squad_df, info
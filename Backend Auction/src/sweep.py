@@ -0,0 +1,111 @@
+# src/sweep.py
+
+import itertools  # scenario grid
+import multiprocessing  # spawn context for the worker pool
+import threading  # pool creation lock
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np  # chunking
+
+from .config import SWEEP_MAX_WORKERS, SWEEP_INLINE_MAX_SCENARIOS
+from .squad import DEFAULT_ROLE_REQUIREMENTS, SquadCandidates
+
+SWEEP_PARAMS = ["total_purse", "squad_size", "max_overseas", "min_overseas"]
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all sweeps, created on first use.
+
+    Uses the spawn start method: forking a server that already runs
+    LightGBM/OpenMP threads can deadlock the children.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=SWEEP_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def scenario_grid(grid: dict) -> list[tuple]:
+    """
+    Cartesian product of the SWEEP_PARAMS value lists, in SWEEP_PARAMS order.
+    """
+    return list(itertools.product(*(grid[p] for p in SWEEP_PARAMS)))
+
+
+def _evaluate_chunk(
+    candidates: SquadCandidates,
+    scenarios: list[tuple],
+    role_requirements: dict,
+    mode: str,
+    time_limit: float,
+) -> list[dict]:
+    return [
+        candidates.evaluate(
+            total_purse=purse,
+            squad_size=int(size),
+            max_overseas=int(max_os),
+            min_overseas=int(min_os),
+            role_requirements=role_requirements,
+            mode=mode,
+            time_limit=time_limit,
+        )
+        for purse, size, max_os, min_os in scenarios
+    ]
+
+
+def run_sweep(
+    candidates: SquadCandidates,
+    scenarios: list[tuple],
+    mode: str = "greedy",
+    role_requirements=None,
+    time_limit: float = 2.0,
+) -> list[dict]:
+    """
+    Evaluate every scenario against one candidate table.
+
+    Small greedy grids run inline (a greedy squad takes microseconds);
+    otherwise scenarios are split into chunks across the process pool and
+    each chunk ships a frame-less copy of the candidates once.
+    """
+    if role_requirements is None:
+        role_requirements = DEFAULT_ROLE_REQUIREMENTS
+
+    if mode == "greedy" and len(scenarios) <= SWEEP_INLINE_MAX_SCENARIOS:
+        return _evaluate_chunk(
+            candidates, scenarios, role_requirements, mode, time_limit
+        )
+
+    light = candidates.without_frame()
+    n_chunks = min(len(scenarios), SWEEP_MAX_WORKERS * 4)
+    chunks = [
+        [scenarios[i] for i in idx]
+        for idx in np.array_split(np.arange(len(scenarios)), n_chunks)
+        if len(idx)
+    ]
+
+    pool = get_pool()
+    futures = [
+        pool.submit(_evaluate_chunk, light, chunk, role_requirements, mode, time_limit)
+        for chunk in chunks
+    ]
+
+    results: list[dict] = []
+    for future in futures:
+        results.extend(future.result())
+    return results
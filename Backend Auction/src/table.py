@@ -0,0 +1,355 @@
+# src/table.py
+
+import base64
+import gzip
+import hashlib
+import json
+from typing import Optional
+
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+
+from .metrics import span  # per-stage latency histograms
+
+try:
+    import brotli  # in requirements.txt; without it only gzip/identity are served
+except ImportError:
+    brotli = None
+
+# Columns of the Auction page table, in response order
+TABLE_COLUMNS = [
+    "name",
+    "role",
+    "country_bucket",
+    "base_price_cr",
+    "predicted_price_cr",
+    "impact_score",
+    "efficiency_score",
+    "predicted_auction_outcome",
+]
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip", "identity") if brotli is not None else ("gzip", "identity")
+
+
+def _json_column(values: pd.Series) -> list:
+    # Missing -> None, NumPy scalars -> plain Python, column-at-a-time
+    if pd.api.types.is_integer_dtype(values) and not values.hasnans:
+        return values.to_numpy().tolist()
+    if pd.api.types.is_float_dtype(values):
+        arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        out = arr.tolist()
+        if np.isnan(arr).any():
+            out = [None if v != v else v for v in out]
+        return out
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def table_records(year_df: pd.DataFrame) -> list[dict]:
+    """
+    One JSON-ready dict per player row: prices in crore, NaN as None.
+    """
+    cols = {}
+    for price_col in ("base_price", "predicted_price"):
+        if price_col in year_df.columns:
+            crore = pd.to_numeric(year_df[price_col], errors="coerce") / 1e7
+            cols[f"{price_col}_cr"] = _json_column(crore)
+        else:
+            cols[f"{price_col}_cr"] = [None] * len(year_df)
+
+    for col in TABLE_COLUMNS:
+        if col not in cols and col in year_df.columns:
+            cols[col] = _json_column(year_df[col])
+
+    out_cols = [c for c in TABLE_COLUMNS if c in cols]
+    return [dict(zip(out_cols, row)) for row in zip(*(cols[c] for c in out_cols))]
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    """
+    coding -> q value from an Accept-Encoding header.
+    """
+    accepted: dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 requires for it).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return any(t.removeprefix("W/") == etag for t in tags)
+
+
+class TablePayload:
+    """
+    The full /players/{year}/table response, serialized once per snapshot
+    (i.e. per model version) in every supported content coding, each with
+    its own strong ETag, plus the TableIndex for filtered pages.
+    """
+
+    def __init__(self, year: int, year_df: pd.DataFrame) -> None:
+        with span("table.records"):
+            players = table_records(year_df)
+        with span("table.encode"):
+            # Same bytes FastAPI's JSONResponse would produce
+            body = json.dumps(
+                {"year": int(year), "players": players},
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+
+            self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(body, quality=11)
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # A strong ETag names exact bytes, so every coding gets its own
+        self.etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in self.bodies
+        }
+        self.rows = len(players)
+
+        with span("table.index"):
+            self.index = TableIndex(players, version=digest[:12])
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> str:
+        accepted = parse_accept_encoding(accept_encoding)
+        for coding in ENCODINGS:
+            q = accepted.get(coding, accepted.get("*", 1.0 if coding == "identity" else 0.0))
+            if q > 0:
+                return coding
+        return "identity"
+
+    def sizes(self) -> dict[str, int]:
+        return {coding: len(body) for coding, body in self.bodies.items()}
+
+
+# Filterable categorical columns (query param -> table column)
+CATEGORY_FILTERS = {
+    "role": "role",
+    "country_bucket": "country_bucket",
+    "outcome": "predicted_auction_outcome",
+}
+
+# Range-filterable numeric columns (prefix of the min_/max_ query params)
+RANGE_FILTERS = ["base_price_cr", "predicted_price_cr", "impact_score", "efficiency_score"]
+
+# Sort keys: any table column, or "row" for the unsorted table order
+SORT_KEYS = ["row"] + TABLE_COLUMNS
+
+TABLE_PAGE_SIZE = 50  # default page size for filtered / paginated requests
+
+
+def _category_key(value) -> Optional[str]:
+    # Filter matching ignores case and stray whitespace ("Batter " == "batter")
+    return None if value is None else " ".join(str(value).split()).lower()
+
+
+def encode_cursor(version: str, sort: str, order: str, rank: int) -> str:
+    raw = f"{version}:{sort}:{order}:{rank}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str, str, int]:
+    """
+    (version, sort, order, rank) from an opaque cursor; ValueError if malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        version, sort, order, rank = (
+            base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").split(":")
+        )
+        return version, sort, order, int(rank)
+    except Exception:
+        raise ValueError("Malformed cursor.")
+
+
+class TableIndex:
+    """
+    Precomputed lookups over the table rows, so a filtered, sorted page
+    never scans the whole table:
+
+    - postings: column -> category -> sorted row ids (plus a boolean row
+      bitmap per category, for intersecting with other filters)
+    - numeric: column -> values, row ids in ascending value order (NaN
+      excluded) and those values, for binary-searched ranges
+    - ranks: (sort key, order) -> row ids in sort order, and each row's
+      position in it; ties keep table order and missing values sort last
+      in both directions
+
+    A page costs O(matches) to filter + sort the matching ids, or O(page)
+    with no filters.
+    """
+
+    def __init__(self, records: list[dict], version: str) -> None:
+        self.version = version
+        self.records = records
+        n = len(records)
+        self.n = n
+        row_ids = np.arange(n)
+
+        self.postings: dict[str, dict[str, np.ndarray]] = {}
+        self.bitmaps: dict[str, dict[str, np.ndarray]] = {}
+        for col in CATEGORY_FILTERS.values():
+            keys = pd.Series([_category_key(r.get(col)) for r in records], dtype=object)
+            self.postings[col] = {}
+            self.bitmaps[col] = {}
+            for key, ids in keys.groupby(keys, sort=False).indices.items():
+                self.postings[col][key] = np.sort(ids)
+                bitmap = np.zeros(n, dtype=bool)
+                bitmap[ids] = True
+                self.bitmaps[col][key] = bitmap
+
+        self.numeric: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        for col in RANGE_FILTERS:
+            values = np.array(
+                [np.nan if r.get(col) is None else r[col] for r in records], dtype=np.float64
+            )
+            present = row_ids[~np.isnan(values)]
+            order = present[np.argsort(values[present], kind="stable")]
+            self.numeric[col] = (values, order, values[order])
+
+        self.orders: dict[tuple[str, str], np.ndarray] = {}
+        self.ranks: dict[tuple[str, str], np.ndarray] = {}
+        for key in SORT_KEYS:
+            for direction in ("asc", "desc"):
+                order = self._sort_order(key, direction)
+                rank = np.empty(n, dtype=np.int64)
+                rank[order] = row_ids
+                self.orders[(key, direction)] = order
+                self.ranks[(key, direction)] = rank
+
+    def _sort_order(self, key: str, direction: str) -> np.ndarray:
+        n = self.n
+        if key == "row":
+            order = np.arange(n)
+            return order if direction == "asc" else order[::-1].copy()
+
+        values = [r.get(key) for r in self.records]
+        missing = np.array([v is None for v in values])
+        if key in self.numeric:
+            sort_values = self.numeric[key][0]
+        else:
+            sort_values = np.array(["" if v is None else str(v).lower() for v in values], dtype=object)
+
+        present = np.flatnonzero(~missing)
+        if direction == "asc":
+            ranked = present[np.argsort(sort_values[present], kind="stable")]
+        else:
+            # Stable descending: sort the reversed ids ascending, then flip
+            rev = present[::-1]
+            ranked = rev[np.argsort(sort_values[rev], kind="stable")][::-1]
+        return np.concatenate([ranked, np.flatnonzero(missing)])
+
+    def _range_ids(self, col: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        _, order, sorted_values = self.numeric[col]
+        lo = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        hi = len(order) if high is None else np.searchsorted(sorted_values, high, side="right")
+        return order[lo:hi]
+
+    def query(
+        self,
+        categories: dict[str, list[str]],
+        ranges: dict[str, tuple[Optional[float], Optional[float]]],
+        sort: str = "row",
+        order: str = "asc",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """
+        One page of rows matching every filter (values within a category
+        filter are OR-ed), in (sort, order), after `cursor`.
+
+        categories: table column -> accepted values
+        ranges: numeric table column -> (min, max), either side optional
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'. Use one of {SORT_KEYS}.")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'.")
+
+        after = -1
+        if cursor:
+            version, c_sort, c_order, after = decode_cursor(cursor)
+            if version != self.version:
+                raise ValueError("Cursor is from an older version of the table; start again.")
+            if (c_sort, c_order) != (sort, order):
+                raise ValueError("Cursor was issued for a different sort; start again.")
+
+        rank = self.ranks[(sort, order)]
+
+        # Candidate ids from each filter; the smallest seeds the result and
+        # the rest are applied as bitmaps / value checks on it
+        sources = []
+        for col, wanted in categories.items():
+            keys = {_category_key(v) for v in wanted}
+            ids = [self.postings[col][k] for k in keys if k in self.postings[col]]
+            ids = np.unique(np.concatenate(ids)) if ids else np.empty(0, dtype=np.int64)
+            sources.append(("category", col, keys, ids))
+        for col, (low, high) in ranges.items():
+            sources.append(("range", col, (low, high), self._range_ids(col, low, high)))
+
+        if not sources:
+            # No filter: the page is a slice of the precomputed order
+            page_ids = self.orders[(sort, order)][after + 1 : after + 1 + limit]
+            total = self.n
+            last_rank = after + len(page_ids)
+            has_more = last_rank + 1 < self.n
+        else:
+            sources.sort(key=lambda s: len(s[3]))
+            ids = sources[0][3]
+            for kind, col, spec, _ in sources[1:]:
+                if not len(ids):
+                    break
+                if kind == "category":
+                    mask = np.zeros(len(ids), dtype=bool)
+                    for key in spec:
+                        bitmap = self.bitmaps[col].get(key)
+                        if bitmap is not None:
+                            mask |= bitmap[ids]
+                else:
+                    values = self.numeric[col][0][ids]
+                    low, high = spec
+                    mask = ~np.isnan(values)
+                    if low is not None:
+                        mask &= values >= low
+                    if high is not None:
+                        mask &= values <= high
+                ids = ids[mask]
+
+            total = int(len(ids))
+            ids_rank = rank[ids]
+            ids_rank = ids_rank[ids_rank > after]
+            ids_rank.sort()
+            page_ranks = ids_rank[:limit]
+            page_ids = self.orders[(sort, order)][page_ranks]
+            last_rank = int(page_ranks[-1]) if len(page_ranks) else after
+            has_more = len(ids_rank) > limit
+
+        return {
+            "players": [self.records[i] for i in page_ids.tolist()],
+            "total": total,
+            "next_cursor": (
+                encode_cursor(self.version, sort, order, last_rank) if has_more else None
+            ),
+        }
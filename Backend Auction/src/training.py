@@ -0,0 +1,121 @@
+# src/training.py
+
+import multiprocessing  # spawn context for the worker pool
+import os
+import threading  # pool creation lock
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+from sklearn.base import clone  # fresh per-task estimators
+
+from .config import TRAIN_MAX_WORKERS
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all training runs, created on first use and kept
+    so repeated retrains do not pay the worker start-up again.
+
+    Spawned, not forked, for the same reason as the sweep pool: forking a
+    process that already runs LightGBM/OpenMP threads can deadlock.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=TRAIN_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def lgbm_threads(workers: int) -> int:
+    """
+    OpenMP threads per LightGBM fit when `workers` fits run at once, so
+    workers x threads never exceeds the machine's cores.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _with_threads(estimator, n_jobs: int):
+    return clone(estimator).set_params(n_jobs=n_jobs)
+
+
+def fit_fold(
+    preprocessor,
+    lgbm_model,
+    knn_model,
+    X_fit: pd.DataFrame,
+    y_fit: np.ndarray,
+    X_held: pd.DataFrame,
+    n_jobs: int = 1,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    One CV fold: fit a fresh preprocessor + both regressors on X_fit and
+    predict the held-out rows.
+
+    Returns (log_pred_lgbm, log_pred_knn, seconds).
+    """
+    t0 = time.perf_counter()
+    pre = clone(preprocessor)
+    Xt_fit = pre.fit_transform(X_fit)
+    Xt_held = pre.transform(X_held)
+
+    lgbm = _with_threads(lgbm_model, n_jobs).fit(Xt_fit, y_fit)
+    knn = _with_threads(knn_model, n_jobs).fit(Xt_fit, y_fit)
+    return lgbm.predict(Xt_held), knn.predict(Xt_held), time.perf_counter() - t0
+
+
+def fit_estimator(estimator, Xt, y: np.ndarray, n_jobs: int = 1) -> tuple[object, float]:
+    """
+    Fit a clone of `estimator` with n_jobs threads; the fitted copy keeps
+    the estimator's own n_jobs for serving. Returns (fitted, seconds).
+    """
+    t0 = time.perf_counter()
+    fitted = _with_threads(estimator, n_jobs).fit(Xt, y)
+    fitted.set_params(n_jobs=estimator.get_params()["n_jobs"])
+    return fitted, time.perf_counter() - t0
+
+
+class _Done(Future):
+    # Already-finished future, so inline runs share the pool code path
+    def __init__(self, fn, *args) -> None:
+        super().__init__()
+        try:
+            self.set_result(fn(*args))
+        except BaseException as e:
+            self.set_exception(e)
+
+
+class TrainingScheduler:
+    """
+    Runs the independent pieces of AuctionPriceModel.fit (the CV folds and
+    the final LightGBM / KNN fits) concurrently in the shared process pool.
+
+    workers <= 1 runs every task inline, in submission order, which is
+    also what happens on a single-core machine. n_jobs (threads per fit)
+    defaults to the cores left per worker.
+    """
+
+    def __init__(self, workers: int | None = None, n_jobs: int | None = None) -> None:
+        workers = TRAIN_MAX_WORKERS if workers is None else min(workers, TRAIN_MAX_WORKERS)
+        self.workers = max(1, int(workers))
+        self.n_jobs = int(n_jobs) if n_jobs else lgbm_threads(self.workers)
+
+    def submit(self, fn, *args) -> Future:
+        if self.workers <= 1:
+            return _Done(fn, *args, self.n_jobs)
+        return get_pool().submit(fn, *args, self.n_jobs)
@@ -0,0 +1,299 @@
+# src/tuning.py
+
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import lightgbm as lgb  # early stopping callback
+import numpy as np  # numeric arrays
+import pandas as pd  # dataframes
+from lightgbm import LGBMRegressor
+from sklearn.base import clone  # fresh per-fold preprocessors
+from sklearn.model_selection import KFold, train_test_split
+from sklearn.neighbors import KNeighborsRegressor
+
+from .model import AuctionPriceModel, DEFAULT_MODEL_PARAMS, blend_prices, merge_params
+from .training import TrainingScheduler
+
+# Blend weights tried for every evaluated config (LightGBM's share)
+BLEND_WEIGHTS = np.round(np.linspace(0.0, 1.0, 21), 2)
+
+EARLY_STOPPING_ROUNDS = 50
+
+# Share of each fold's training rows held back for early stopping / blending
+VALIDATION_FRACTION = 0.2
+
+
+def sample_params(rng: np.random.Generator) -> dict:
+    """
+    One random config from the search space. n_estimators is left to the
+    successive-halving rung (it is the budget being allocated).
+    """
+    return {
+        "lgbm": {
+            "learning_rate": float(np.exp(rng.uniform(np.log(0.01), np.log(0.2)))),
+            "num_leaves": int(rng.choice([7, 15, 31, 63])),
+            "min_child_samples": int(rng.choice([5, 10, 20, 40])),
+            "subsample": float(rng.uniform(0.6, 1.0)),
+            "subsample_freq": 1,
+            "colsample_bytree": float(rng.uniform(0.5, 1.0)),
+            "reg_lambda": float(np.exp(rng.uniform(np.log(1e-3), np.log(10.0)))),
+        },
+        "knn": {"n_neighbors": int(rng.integers(3, 51))},
+    }
+
+
+def build_folds(
+    master_df: pd.DataFrame, train_years: list[int], n_splits: int = 5
+) -> list[dict]:
+    """
+    The same 5-fold split of the sold training rows as AuctionPriceModel.fit,
+    transformed once per fold so every evaluation reuses it.
+
+    Each fold's training part is split again: a VALIDATION_FRACTION inner
+    validation set drives early stopping and the blend weight, so nothing
+    is chosen on the held-out rows the fold is scored on.
+
+    Returns one dict per fold with Xt / y for "train", "val" and "held",
+    plus base_price for "val" and "held".
+    """
+    model = AuctionPriceModel()
+    sold_mask = (master_df["final_price"] > 0) & (master_df["year"].isin(train_years))
+    train_df = master_df.loc[sold_mask]
+    if train_df.empty:
+        raise ValueError(f"No sold players found for training years: {train_years}")
+
+    X = train_df[model.feature_cols]
+    y = np.log1p(train_df["final_price"].values)
+    base_price = train_df["base_price"].fillna(0).values
+
+    folds = []
+    kf = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+    for fit_idx, held_idx in kf.split(X):
+        train_idx, val_idx = train_test_split(
+            fit_idx, test_size=VALIDATION_FRACTION, random_state=42
+        )
+        pre = clone(model.preprocessor)
+        folds.append(
+            {
+                "Xt_train": pre.fit_transform(X.iloc[train_idx]),
+                "y_train": y[train_idx],
+                "Xt_val": pre.transform(X.iloc[val_idx]),
+                "y_val": y[val_idx],
+                "base_val": base_price[val_idx],
+                "Xt_held": pre.transform(X.iloc[held_idx]),
+                "y_held": y[held_idx],
+                "base_held": base_price[held_idx],
+            }
+        )
+    return folds
+
+
+def _log_rmse(log_pred_lgbm, log_pred_knn, base_price, y, weight: float) -> float:
+    price = blend_prices(log_pred_lgbm, log_pred_knn, base_price, weight)
+    return math.sqrt(np.mean((np.log1p(price) - y) ** 2))
+
+
+def evaluate_params(
+    params: dict,
+    folds: list[dict],
+    max_rounds: int,
+    deadline: float | None = None,
+    n_jobs: int = 1,
+    early_stopping: bool = True,
+    blend_weights=BLEND_WEIGHTS,
+) -> dict | None:
+    """
+    Out-of-fold score of one config with at most max_rounds boosting rounds.
+
+    Both regressors are fit on each fold's inner training rows. Early
+    stopping (unless disabled) and the blend weight (best of blend_weights)
+    are picked on the inner validation rows; the score is then the log
+    RMSE of the blended, base-price-floored price on the held-out rows,
+    the same metric the backtest reports.
+
+    Returns None when `deadline` (time.time()) passes between folds.
+    """
+    t0 = time.perf_counter()
+    params = merge_params(params)
+    lgbm_params = {**params["lgbm"], "n_estimators": int(max_rounds)}
+
+    preds = {"val": ([], [], [], []), "held": ([], [], [], [])}  # y, base, lgbm, knn
+    best_rounds = []
+    for fold in folds:
+        if deadline is not None and time.time() >= deadline:
+            return None
+
+        lgbm = LGBMRegressor(**lgbm_params, random_state=42, n_jobs=n_jobs, verbose=-1)
+        if early_stopping:
+            lgbm.fit(
+                fold["Xt_train"],
+                fold["y_train"],
+                eval_set=[(fold["Xt_val"], fold["y_val"])],
+                callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+            )
+        else:
+            lgbm.fit(fold["Xt_train"], fold["y_train"])
+        best_rounds.append(int(lgbm.best_iteration_ or max_rounds))
+
+        knn = KNeighborsRegressor(**params["knn"], weights="distance", n_jobs=n_jobs)
+        knn.fit(fold["Xt_train"], fold["y_train"])
+
+        for part, (y_all, base_all, lgbm_all, knn_all) in preds.items():
+            y_all.append(fold[f"y_{part}"])
+            base_all.append(fold[f"base_{part}"])
+            lgbm_all.append(lgbm.predict(fold[f"Xt_{part}"]))
+            knn_all.append(knn.predict(fold[f"Xt_{part}"]))
+
+    val = [np.concatenate(p) for p in preds["val"]]
+    held = [np.concatenate(p) for p in preds["held"]]
+
+    val_scores = [_log_rmse(val[2], val[3], val[1], val[0], w) for w in blend_weights]
+    weight = float(blend_weights[int(np.argmin(val_scores))])
+    return {
+        "params": params,
+        "max_rounds": int(max_rounds),
+        "best_rounds": best_rounds,
+        "blend_weight": weight,
+        "val_log_rmse": float(min(val_scores)),
+        "log_rmse": _log_rmse(held[2], held[3], held[1], held[0], weight),
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def rung_rounds(n_configs: int, eta: int, max_rounds: int, min_rounds: int) -> list[int]:
+    """
+    Boosting-round budget per successive-halving rung: the last rung gets
+    max_rounds, each earlier one 1/eta of the next, until one config is left.
+    """
+    n_rungs = max(1, int(math.floor(math.log(max(n_configs, 1), eta) + 1e-9)) + 1)
+    return [
+        max(min_rounds, int(round(max_rounds / eta ** (n_rungs - 1 - i))))
+        for i in range(n_rungs)
+    ]
+
+
+def _run_rung(
+    scheduler: TrainingScheduler,
+    configs: list[dict],
+    folds: list[dict],
+    max_rounds: int,
+    deadline: float,
+) -> list[dict]:
+    # Evaluate configs until done or out of time; unfinished ones are dropped.
+    # At most `workers` evaluations are in the pool at once, so nothing is
+    # left queued at the deadline; running ones give up at their next fold.
+    results = []
+    queue = list(configs)
+    running = set()
+    try:
+        while queue or running:
+            while queue and len(running) < scheduler.workers and time.time() < deadline:
+                running.add(
+                    scheduler.submit(evaluate_params, queue.pop(0), folds, max_rounds, deadline)
+                )
+            remaining = deadline - time.time()
+            if remaining <= 0 or not running:
+                break
+            done, running = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            results.extend(r for r in (f.result() for f in done) if r is not None)
+    finally:
+        for future in running:
+            future.cancel()
+    return results
+
+
+def successive_halving(
+    master_df: pd.DataFrame,
+    train_years: list[int],
+    budget_seconds: float = 300.0,
+    n_configs: int = 27,
+    eta: int = 3,
+    max_rounds: int = 2000,
+    min_rounds: int = 50,
+    workers: int | None = None,
+    seed: int = 42,
+) -> dict:
+    """
+    Successive halving over sample_params configs (plus the current
+    defaults): every rung evaluates the surviving configs with a larger
+    boosting-round budget and keeps the best 1/eta. Evaluations run on the
+    training process pool; nothing new starts after budget_seconds.
+
+    Returns a JSON-ready report; report["best"]["params"] is the winning
+    config, with n_estimators set from its early-stopped rounds and the
+    blend weight chosen for it.
+    """
+    t_start = time.perf_counter()
+    # Wall clock, not perf_counter: pool workers check it too
+    deadline = time.time() + budget_seconds
+    rng = np.random.default_rng(seed)
+    scheduler = TrainingScheduler(workers)
+
+    folds = build_folds(master_df, train_years)
+
+    # Current hand-picked config, evaluated like every candidate (its
+    # n_estimators as the round cap), so the comparison is like for like
+    baseline = evaluate_params(
+        DEFAULT_MODEL_PARAMS,
+        folds,
+        DEFAULT_MODEL_PARAMS["lgbm"]["n_estimators"],
+        n_jobs=scheduler.n_jobs,
+    )
+    default_search = {
+        "lgbm": {k: v for k, v in DEFAULT_MODEL_PARAMS["lgbm"].items() if k != "n_estimators"},
+        "knn": dict(DEFAULT_MODEL_PARAMS["knn"]),
+    }
+    configs = [default_search] + [sample_params(rng) for _ in range(max(0, n_configs - 1))]
+
+    rungs = []
+    best = None
+    stopped_by_budget = False
+    for rounds in rung_rounds(len(configs), eta, max_rounds, min_rounds):
+        results = _run_rung(scheduler, configs, folds, rounds, deadline)
+        if not results:
+            break
+        results.sort(key=lambda r: r["log_rmse"])
+        best = results[0]
+        rungs.append(
+            {
+                "max_rounds": rounds,
+                "configs": len(configs),
+                "evaluated": len(results),
+                "best_log_rmse": best["log_rmse"],
+            }
+        )
+        if len(results) < len(configs):
+            stopped_by_budget = True  # ran out mid-rung
+            break
+        configs = [r["params"] for r in results[: max(1, len(results) // eta)]]
+
+    if best is None:
+        raise TimeoutError("Tuning budget ran out before any config was evaluated.")
+
+    winner = merge_params(best["params"])
+    winner["lgbm"]["n_estimators"] = int(np.median(best["best_rounds"]))
+    winner["blend_weight"] = best["blend_weight"]
+
+    return {
+        "train_years": [int(y) for y in train_years],
+        "budget_seconds": budget_seconds,
+        "wall_seconds": time.perf_counter() - t_start,
+        "stopped_by_budget": stopped_by_budget,
+        "workers": scheduler.workers,
+        "lgbm_threads": scheduler.n_jobs,
+        "eta": eta,
+        "seed": seed,
+        "baseline": {
+            "params": baseline["params"],
+            "log_rmse": baseline["log_rmse"],
+            "blend_weight": baseline["blend_weight"],
+            "best_rounds": baseline["best_rounds"],
+        },
+        "rungs": rungs,
+        "best": {
+            "params": winner,
+            "log_rmse": best["log_rmse"],
+            "max_rounds": best["max_rounds"],
+        },
+    }
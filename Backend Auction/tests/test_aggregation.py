@@ -0,0 +1,125 @@
+# tests/test_aggregation.py
+#
+# PlayerStatsAggregator must reproduce the original groupby aggregation
+# exactly (values and dtypes). The reference below is the implementation
+# build_aggregated_stats used before it moved to src/aggregation.py.
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.aggregation import PlayerStatsAggregator
+from src.config import MATCH_STATS_PATH
+from src.features import build_aggregated_stats
+
+
+def reference_overs_to_balls_series(s):
+    s = s.fillna(0)
+    overs = np.floor(s).astype(int)
+    balls = np.rint((s - overs) * 10).astype(int)
+    return overs * 6 + balls
+
+
+def reference_build_aggregated_stats(match_stats: pd.DataFrame) -> pd.DataFrame:
+    df = match_stats.copy()
+    df["balls_bowled"] = reference_overs_to_balls_series(df["overs_bowled"])
+
+    agg = (
+        df.groupby(["player_id", "player_name"])
+        .agg(
+            matches_played=("match_id", "nunique"),
+            innings_batted=("balls_faced", lambda x: (x > 0).sum()),
+            innings_bowled=("balls_bowled", lambda x: (x > 0).sum()),
+            total_runs=("runs_scored", "sum"),
+            total_balls_batted=("balls_faced", "sum"),
+            total_wickets=("wicket_taken", "sum"),
+            total_balls_bowled=("balls_bowled", "sum"),
+            total_runs_conceded=("runs_conceded", "sum"),
+            outs=("Dismissal_Status", lambda x: (x != 0).sum()),
+        )
+        .reset_index()
+    )
+
+    agg["runs_per_match"] = agg["total_runs"] / agg["matches_played"]
+    agg["wickets_per_match"] = agg["total_wickets"] / agg["matches_played"]
+    agg["batting_average"] = agg["total_runs"] / agg["outs"].replace(0, np.nan)
+    agg["batting_strike_rate"] = (
+        100 * agg["total_runs"] / agg["total_balls_batted"].replace(0, np.nan)
+    )
+    agg["overs_bowled_total"] = agg["total_balls_bowled"] / 6.0
+    agg["bowling_economy"] = (
+        agg["total_runs_conceded"] / agg["overs_bowled_total"].replace(0, np.nan)
+    )
+    agg["overs_per_match"] = agg["overs_bowled_total"] / agg["matches_played"]
+    return agg
+
+
+def assert_same_aggregate(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=True,
+        check_exact=False,
+        rtol=1e-12,
+    )
+
+
+@pytest.fixture(scope="module")
+def match_stats() -> pd.DataFrame:
+    if not os.path.exists(MATCH_STATS_PATH):
+        pytest.skip(f"{MATCH_STATS_PATH} not available")
+    return pd.read_csv(MATCH_STATS_PATH)
+
+
+@pytest.fixture
+def edge_case_stats() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "match_id": [1, 1, 2, 3, np.nan, np.nan, 4, 5, 5, 6],
+            # 10: duplicate row for match 1; 20: only rows without a match id;
+            # 30: all-NaN stats; 40: never batted or bowled
+            "player_id": [10, 10, 10, 10, 20, 20, 30, 40, 40, np.nan],
+            "player_name": ["A", "A", "A", "A", "B", "B", "C", "D", "D", "E"],
+            "runs_scored": [12, 12, np.nan, 40, 5, 0, np.nan, 0, 0, 7],
+            "balls_faced": [10, 10, 0, 30, 4, np.nan, np.nan, 0, 0, 6],
+            "overs_bowled": [2.3, 2.3, 4.0, np.nan, 0.0, 1.5, np.nan, 0.0, np.nan, 1.0],
+            "wicket_taken": [1, 1, 0, np.nan, 0, 1, np.nan, 0, 0, 0],
+            "runs_conceded": [20, 20, 31, 0, np.nan, 9, np.nan, 0, 0, 4],
+            "Dismissal_Status": [1, 1, 0, np.nan, 0, 1, np.nan, 0, 0, 1],
+        }
+    )
+
+
+def test_matches_reference_on_real_data(match_stats):
+    assert_same_aggregate(
+        build_aggregated_stats(match_stats),
+        reference_build_aggregated_stats(match_stats),
+    )
+
+
+def test_split_batches_match_reference_on_real_data(match_stats):
+    aggregator = PlayerStatsAggregator()
+    for batch in np.array_split(np.arange(len(match_stats)), 7):
+        aggregator.update(match_stats.iloc[batch])
+    assert_same_aggregate(
+        aggregator.to_frame(), reference_build_aggregated_stats(match_stats)
+    )
+
+
+def test_matches_reference_on_edge_cases(edge_case_stats):
+    expected = reference_build_aggregated_stats(edge_case_stats)
+    assert_same_aggregate(build_aggregated_stats(edge_case_stats), expected)
+
+    # Player 20 has rows but no match id: zero matches, rates inf / NaN
+    assert expected.loc[expected["player_id"] == 20, "matches_played"].item() == 0
+
+
+def test_split_batches_match_reference_on_edge_cases(edge_case_stats):
+    aggregator = PlayerStatsAggregator()
+    for i in range(len(edge_case_stats)):
+        aggregator.update(edge_case_stats.iloc[[i]])
+    assert_same_aggregate(
+        aggregator.to_frame(), reference_build_aggregated_stats(edge_case_stats)
+    )
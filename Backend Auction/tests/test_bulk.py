@@ -0,0 +1,109 @@
+# tests/test_bulk.py
+#
+# Bulk scoring of player files: same scores as predict_prices on the
+# master table, whatever the chunking.
+
+import os
+import shutil
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bulk import prepare_features, score_file
+from src.config import PREDICTION_YEAR
+from src.export import EXPORT_COLUMNS, export_frame
+from src.features import load_and_prepare_master
+from src.model import AuctionPriceModel
+from src.registry import resolve
+
+
+@pytest.fixture(scope="module")
+def model_dir():
+    resolved = resolve(PREDICTION_YEAR)
+    if resolved is None:
+        pytest.skip(f"No trained model for {PREDICTION_YEAR}")
+    return resolved[1]
+
+
+@pytest.fixture(scope="module")
+def master():
+    return load_and_prepare_master().reset_index(drop=True)
+
+
+def load_model(model_dir: str) -> AuctionPriceModel:
+    model = AuctionPriceModel()
+    model.load(model_dir)
+    return model
+
+
+def expected_scores(model: AuctionPriceModel, master: pd.DataFrame) -> pd.DataFrame:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN impact stats
+        return export_frame(model.predict_prices(master)).reset_index(drop=True)
+
+
+def assert_same_scores(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    for col in EXPORT_COLUMNS:
+        if pd.api.types.is_float_dtype(expected[col]):
+            np.testing.assert_allclose(
+                actual[col], expected[col], rtol=1e-9, equal_nan=True, err_msg=col
+            )
+        else:
+            pd.testing.assert_series_equal(actual[col], expected[col], check_dtype=False)
+
+
+def score_csv(model_dir: str, master: pd.DataFrame, tmp_path) -> pd.DataFrame:
+    input_path = str(tmp_path / "players.csv")
+    output_path = str(tmp_path / "scored.parquet")
+    master.drop(columns=["date_of_birth_parsed"]).to_csv(input_path, index=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        score_file(model_dir, input_path, output_path, chunk_rows=100, workers=1)
+    return pd.read_parquet(output_path)
+
+
+def test_prepare_features_keeps_missing_categories_missing(model_dir):
+    model = load_model(model_dir)
+    df = pd.DataFrame(
+        {
+            "role": ["Batter", np.nan, None],
+            "batting_hand": [np.nan, np.nan, np.nan],  # all-missing: read as float
+            "country": ["India", None, "England"],
+        }
+    )
+    out = prepare_features(model, df)
+    for col in model.categorical_features:
+        assert not out[col].isin(["nan", "None", "<NA>"]).any(), col
+    assert out["role"].isna().tolist() == [False, True, True]
+    assert out["batting_hand"].isna().all()
+    assert out["country_bucket"].tolist() == ["Indian", "Overseas", "Overseas"]
+
+
+def test_prepare_features_fills_rates_without_every_total(model_dir):
+    model = load_model(model_dir)
+    df = pd.DataFrame(
+        {"matches_played": [10, 4], "total_runs": [300, np.nan], "total_balls_batted": [240, 0]}
+    )
+    out = prepare_features(model, df)
+    assert out["runs_per_match"].tolist()[0] == 30.0
+    assert out["batting_strike_rate"].tolist()[0] == 125.0
+    assert out.loc[1, ["runs_per_match", "batting_strike_rate"]].isna().all()
+    assert out["batting_average"].isna().all()  # needs outs
+
+
+def test_chunked_file_matches_predict_prices(model_dir, master, tmp_path):
+    expected = expected_scores(load_model(model_dir), master)
+    assert_same_scores(score_csv(model_dir, master, tmp_path), expected)
+
+
+def test_legacy_model_normalizes_over_whole_file(model_dir, master, tmp_path):
+    legacy_dir = str(tmp_path / "legacy_model")
+    shutil.copytree(model_dir, legacy_dir)
+    os.remove(os.path.join(legacy_dir, "norm_stats.joblib"))
+
+    legacy = load_model(legacy_dir)
+    assert legacy.norm_stats_ is None
+    expected = expected_scores(legacy, master)  # normalized over the full table
+    assert_same_scores(score_csv(legacy_dir, master, tmp_path), expected)
@@ -0,0 +1,71 @@
+# tests/test_features.py
+#
+# Streaming ingest (chunked, narrow dtypes) must give the same aggregate
+# table as the in-memory path, dtypes included.
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import features
+from src.config import MATCH_STATS_PATH
+from src.features import build_aggregated_stats, stream_aggregated_stats
+
+
+def assert_stream_matches_memory(path: str, chunksize: int) -> None:
+    expected = build_aggregated_stats(pd.read_csv(path))
+    actual = stream_aggregated_stats(path, chunksize=chunksize)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=True)
+
+
+@pytest.mark.parametrize("chunksize", [1_000, 50_000, 10_000_000])
+def test_stream_matches_memory_on_real_data(chunksize):
+    if not os.path.exists(MATCH_STATS_PATH):
+        pytest.skip(f"{MATCH_STATS_PATH} not available")
+    assert_stream_matches_memory(MATCH_STATS_PATH, chunksize)
+
+
+@pytest.mark.parametrize("chunksize", [2, 3, 100])
+def test_stream_matches_memory_with_missing_values(tmp_path, chunksize):
+    path = tmp_path / "player_match_stats.csv"
+    pd.DataFrame(
+        {
+            "match_id": [1, 1, 2, np.nan, 3, 3, 4, 4],
+            "player_id": [10, 10, 10, 20, np.nan, 30, 30, 40],
+            "player_name": ["A", "A", "A", "B", "X", "C", "C", "D"],
+            "runs_scored": [12, 12, np.nan, 5, 9, 7, 0, 3],
+            "balls_faced": [10, 10, 0, 4, 8, 6, 0, 2],
+            "overs_bowled": [2.3, 2.3, 4.0, 0.0, 1.0, np.nan, 3.5, 0.0],
+            "wicket_taken": [1, 1, 0, 0, 1, 0, 2, 0],
+            "runs_conceded": [20, 20, 31, np.nan, 4, 0, 25, 0],
+            "Dismissal_Status": [1, 1, 0, 0, 1, 1, np.nan, 0],
+        }
+    ).to_csv(path, index=False)
+    assert_stream_matches_memory(str(path), chunksize)
+
+
+def test_stream_matches_memory_with_integer_columns(tmp_path):
+    path = tmp_path / "player_match_stats.csv"
+    pd.DataFrame(
+        {
+            "match_id": [1, 2, 2, 3],
+            "player_id": [10, 10, 20, 20],
+            "player_name": ["A", "A", "B", "B"],
+            "runs_scored": [12, 0, 5, 40],
+            "balls_faced": [10, 0, 4, 30],
+            "overs_bowled": [2, 4, 0, 1],
+            "wicket_taken": [1, 0, 0, 2],
+            "runs_conceded": [20, 31, 0, 9],
+            "Dismissal_Status": [1, 0, 0, 1],
+        }
+    ).to_csv(path, index=False)
+    assert_stream_matches_memory(str(path), chunksize=1)
+
+
+def test_cache_version_depends_on_ingest_mode(monkeypatch):
+    monkeypatch.setattr(features, "MATCH_STATS_STREAMING", False)
+    memory = features.master_cache_version()
+    monkeypatch.setattr(features, "MATCH_STATS_STREAMING", True)
+    assert features.master_cache_version() != memory
@@ -0,0 +1,118 @@
+# tests/test_inference.py
+#
+# SingleRowPredictor against AuctionPriceModel.predict_prices over the
+# full master table, using the registered model for PREDICTION_YEAR.
+
+import warnings
+
+import numpy as np
+import pytest
+
+from src.config import PREDICTION_YEAR
+from src.features import load_and_prepare_master
+from src.inference import SingleRowPredictor, fill_rates
+from src.model import AuctionPriceModel
+from src.registry import resolve
+
+PRICE_COLS = ["predicted_price_lgbm", "predicted_price_knn", "predicted_price"]
+
+
+@pytest.fixture(scope="module")
+def model():
+    resolved = resolve(PREDICTION_YEAR)
+    if resolved is None:
+        pytest.skip(f"No trained model for {PREDICTION_YEAR}")
+    model = AuctionPriceModel()
+    model.load(resolved[1])
+    return model
+
+
+@pytest.fixture(scope="module")
+def master():
+    return load_and_prepare_master().reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def single_row(model, master):
+    predictor = SingleRowPredictor(model)
+    rows = [predictor.predict(r) for r in master.to_dict("records")]
+    return {c: np.array([r[c] for r in rows]) for c in PRICE_COLS}
+
+
+def test_matches_one_row_predict_prices(model, master, single_row):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN impact stats
+        expected = [model.predict_prices(master.iloc[[i]]) for i in range(len(master))]
+    for col in PRICE_COLS:
+        np.testing.assert_allclose(
+            single_row[col], [e[col].iloc[0] for e in expected], rtol=1e-9, err_msg=col
+        )
+
+
+def test_knn_matches_batch_except_ties(model, master, single_row):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        batch = model.predict_prices(master)["predicted_price_knn"].to_numpy()
+
+    predictor = SingleRowPredictor(model)
+    Xt = model.preprocessor.transform(master[model.feature_cols])
+    tied = np.array(
+        [
+            predictor._knn_ambiguous(np.sort(np.linalg.norm(predictor._knn_X - x, axis=1)))
+            for x in Xt
+        ]
+    )
+    differs = ~np.isclose(single_row["predicted_price_knn"], batch, rtol=1e-9)
+    assert not (differs & ~tied).any()
+
+
+def test_native_lgbm_matches_sklearn(model, master):
+    assert model.native_lgbm_ is not None
+    X = master[model.feature_cols]
+    expected = model.lgbm_model.predict(model.preprocessor.transform(X))
+
+    np.testing.assert_allclose(model.native_lgbm_.predict_frame(X), expected, rtol=0, atol=1e-6)
+    rows = [model.native_lgbm_.predict_row(r) for r in X.to_dict("records")]
+    np.testing.assert_allclose(rows, expected, rtol=0, atol=1e-6)
+
+
+def test_predict_prices_uses_native_lgbm(model, master):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        scored = model.predict_prices(master)
+    native = model.native_lgbm_.predict_frame(master[model.feature_cols])
+    np.testing.assert_array_equal(scored["predicted_price_lgbm"].to_numpy(), np.expm1(native))
+
+
+def test_fitted_and_reloaded_model_score_the_same(master, tmp_path):
+    fitted = AuctionPriceModel()
+    fitted.fit(master, train_years=[2023, 2024], workers=1)
+    assert fitted.native_lgbm_ is not None
+    fitted.save(str(tmp_path))
+
+    reloaded = AuctionPriceModel()
+    reloaded.load(str(tmp_path))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        before = fitted.predict_prices(master)
+        after = reloaded.predict_prices(master)
+    for col in PRICE_COLS:
+        np.testing.assert_array_equal(before[col].to_numpy(), after[col].to_numpy(), err_msg=col)
+
+
+def test_fill_rates_derives_each_rate_from_its_own_inputs():
+    # No outs, no bowling totals: batting_average and the bowling rates stay missing
+    filled = fill_rates(
+        {"matches_played": 10, "total_runs": 300, "total_balls_batted": 240, "total_wickets": 5}
+    )
+    assert filled["runs_per_match"] == 30.0
+    assert filled["wickets_per_match"] == 0.5
+    assert filled["batting_strike_rate"] == 125.0
+    for col in ("batting_average", "overs_bowled_total", "bowling_economy", "overs_per_match"):
+        assert filled.get(col) is None, col
+
+    # Supplied rates are kept; no matches_played still gives per-ball rates
+    filled = fill_rates({"total_balls_bowled": 60, "total_runs_conceded": 80, "bowling_economy": 7.5})
+    assert filled["overs_bowled_total"] == 10.0
+    assert filled["bowling_economy"] == 7.5
+    assert filled.get("overs_per_match") is None
@@ -0,0 +1,55 @@
+# tests/test_jobs.py
+#
+# TrainingJobs coalesces only identical requests while a job is active.
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.jobs import JobConflict, TrainingJobs
+
+
+@pytest.fixture
+def blocked_jobs():
+    jobs = TrainingJobs()
+    release = threading.Event()
+    yield jobs, (lambda job: release.wait(10) and {"ok": True})
+    release.set()
+    jobs.shutdown()
+
+
+def test_same_params_join_the_active_job(blocked_jobs):
+    jobs, run = blocked_jobs
+    first, created = jobs.submit(run, params={"year": 2025})
+    again, created_again = jobs.submit(run, params={"year": 2025})
+    assert created and not created_again
+    assert again is first
+
+
+def test_other_params_conflict_with_the_active_job(blocked_jobs):
+    jobs, run = blocked_jobs
+    first, _ = jobs.submit(run, params={"year": 2025})
+    with pytest.raises(JobConflict) as info:
+        jobs.submit(run, params={"year": 2024})
+    assert info.value.job is first
+
+
+def test_train_endpoint_returns_409_for_another_year(monkeypatch, blocked_jobs):
+    jobs, run = blocked_jobs
+    monkeypatch.setattr(main, "training_jobs", jobs)
+    monkeypatch.setattr(main, "run_training", lambda job, year: run(job))
+    client = TestClient(main.app)
+
+    first = client.post("/train", params={"year": 2025})
+    assert first.status_code == 202 and first.json()["created"]
+
+    same = client.post("/train", params={"year": 2025})
+    assert same.status_code == 202
+    assert same.json()["job_id"] == first.json()["job_id"]
+    assert not same.json()["created"]
+
+    other = client.post("/train", params={"year": 2024})
+    assert other.status_code == 409
+    assert other.json()["detail"]["job_id"] == first.json()["job_id"]
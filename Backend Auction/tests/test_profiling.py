@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+import main
+from src import profiling
+
+
+async def slow_endpoint():
+    await asyncio.sleep(0.5)
+    return {"ok": True}
+
+
+main.app.add_api_route("/_test/slow", slow_endpoint)
+
+
+def test_overlapping_profiled_requests_do_not_block_the_loop(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ALLOWED_CLIENTS", ["*"])
+
+    # Entered explicitly: one event loop serves both requests (like one
+    # server worker), and a hung loop must fail the test, not hang __exit__
+    client = TestClient(main.app)
+    client.__enter__()
+    results = {}
+
+    def call(key):
+        results[key] = client.get("/_test/slow", params={"profile": 1})
+
+    threads = [threading.Thread(target=call, args=(i,), daemon=True) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=15)
+    assert not any(t.is_alive() for t in threads), "event loop hung on overlapping profiles"
+
+    try:
+        by_status = {r.status_code: r for r in results.values()}
+        assert sorted(by_status) == [200, 503]
+        assert "X-Profile-Url" in by_status[200].headers
+        assert by_status[503].headers["Retry-After"] == "1"
+        assert "X-Profile-Url" not in by_status[503].headers
+        assert client.get("/").status_code == 200
+    finally:
+        client.__exit__(None, None, None)
@@ -0,0 +1,35 @@
+# tests/test_serving.py
+#
+# ModelCache counts every cache hit, including requests that waited on a load.
+
+import threading
+import time
+from types import SimpleNamespace
+
+from src import serving as serving_module
+from src.serving import ModelCache
+
+
+def test_concurrent_load_counts_as_hit(monkeypatch):
+    def fail_resolve(year):
+        raise AssertionError("waiting request should not reload the model")
+
+    monkeypatch.setattr(serving_module, "resolve", fail_resolve)
+
+    cache = ModelCache(max_loaded=2)
+    year = 2099
+    loaded = SimpleNamespace(year=year)
+    load_lock = cache._load_locks.setdefault(year, threading.Lock())
+
+    result = {}
+    with load_lock:
+        # Another request is "loading": this one misses, then waits on the lock
+        waiter = threading.Thread(target=lambda: result.update(serving=cache.get(year)))
+        waiter.start()
+        time.sleep(0.1)
+        cache.put(loaded)
+    waiter.join(timeout=5)
+
+    assert result["serving"] is loaded
+    assert cache.hits == 1
+    assert cache.misses == 0
@@ -0,0 +1,115 @@
+# tests/test_squad.py
+#
+# Sweep grids and up-front squad constraint validation.
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.config import EXACT_MAX_TIME_LIMIT_SECONDS, PREDICTION_YEAR
+from src.registry import resolve
+from src.schemas import SweepRange
+from src.squad import DEFAULT_ROLE_REQUIREMENTS, constraint_errors
+
+
+@pytest.mark.parametrize(
+    "start, stop, step, count",
+    [(0.1, 0.3, 0.1, 3), (0.0, 1.0, 0.1, 11), (1, 10, 1, 10), (0.1, 0.35, 0.1, 3), (5, 1, 1, 0)],
+)
+def test_sweep_range_keeps_inclusive_stop(start, stop, step, count):
+    values = SweepRange(start=start, stop=stop, step=step).values()
+    assert len(values) == count
+    if count:
+        assert values[-1] == pytest.approx(start + (count - 1) * step)
+
+
+def test_exact_mode_role_minimums_must_fit():
+    required = sum(DEFAULT_ROLE_REQUIREMENTS.values())
+    assert constraint_errors(required + 1, 3, 1, mode="exact") == []
+    assert constraint_errors(required + 1, 3, 2, mode="exact")
+    # Greedy treats role minimums as targets, not constraints
+    assert constraint_errors(required + 1, 3, 2, mode="greedy") == []
+
+
+def test_contradictory_overseas_limits():
+    assert constraint_errors(9, 1, 2)
+    assert constraint_errors(2, 5, 3)
+    assert constraint_errors(0, 0, 0)
+
+
+@pytest.fixture
+def client():
+    if resolve(PREDICTION_YEAR) is None:
+        pytest.skip(f"No trained model for {PREDICTION_YEAR}")
+    return TestClient(main.app)
+
+
+def test_squad_rejects_infeasible_exact_request(client):
+    r = client.get(
+        f"/squad/{PREDICTION_YEAR}",
+        params={"mode": "exact", "squad_size": 9, "min_overseas": 2},
+    )
+    assert r.status_code == 422
+    assert "squad_size is 9" in r.json()["detail"]
+
+
+def test_sweep_limits_exact_mode_by_solver_time(client):
+    r = client.post(
+        f"/squad/{PREDICTION_YEAR}/sweep",
+        json={
+            "mode": "exact",
+            "time_limit": 2.0,
+            "total_purse": {"start": 1e8, "stop": 1e9, "step": 1e6},
+            "squad_size": [11],
+        },
+    )
+    assert r.status_code == 400
+    assert "time_limit" in r.json()["detail"]
+
+
+def test_sweep_rejects_infeasible_scenarios(client):
+    r = client.post(
+        f"/squad/{PREDICTION_YEAR}/sweep",
+        json={"mode": "exact", "squad_size": [9, 10], "min_overseas": [1, 2]},
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"].startswith("1 of 4 scenarios")
+
+
+def test_sweep_rejects_huge_range_without_expanding_it(client):
+    start = time.perf_counter()
+    r = client.post(
+        f"/squad/{PREDICTION_YEAR}/sweep",
+        json={"total_purse": {"start": 0, "stop": 1e12, "step": 1}},
+    )
+    assert r.status_code == 400
+    assert "total_purse has" in r.json()["detail"]
+    assert time.perf_counter() - start < 2.0
+
+
+def test_sweep_rejects_grid_product_over_the_limit(client):
+    r = client.post(
+        f"/squad/{PREDICTION_YEAR}/sweep",
+        json={
+            "total_purse": {"start": 0, "stop": 999, "step": 1},
+            "squad_size": {"start": 1, "stop": 100, "step": 1},
+        },
+    )
+    assert r.status_code == 400
+    assert "100000 scenarios" in r.json()["detail"]
+
+
+@pytest.mark.parametrize("time_limit", [0, -1, EXACT_MAX_TIME_LIMIT_SECONDS + 1])
+def test_squad_rejects_out_of_range_time_limit(client, time_limit):
+    r = client.get(f"/squad/{PREDICTION_YEAR}", params={"mode": "exact", "time_limit": time_limit})
+    assert r.status_code == 422
+
+
+def test_sweep_rejects_out_of_range_time_limit(client):
+    r = client.post(
+        f"/squad/{PREDICTION_YEAR}/sweep",
+        json={"mode": "exact", "time_limit": EXACT_MAX_TIME_LIMIT_SECONDS + 1},
+    )
+    assert r.status_code == 422
@@ -0,0 +1,48 @@
+# tests/test_table.py
+#
+# Once the table payload is built, full-table requests (and their 304
+# revalidations) must not depend on the compute executor.
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.config import PREDICTION_YEAR
+from src.executor import Overloaded
+from src.registry import resolve
+
+
+@pytest.fixture
+def client():
+    if resolve(PREDICTION_YEAR) is None:
+        pytest.skip(f"No trained model for {PREDICTION_YEAR}")
+    return TestClient(main.app)
+
+
+def test_revalidation_is_not_shed_when_executor_is_full(client, monkeypatch):
+    url = f"/players/{PREDICTION_YEAR}/table"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    async def overloaded(*args, **kwargs):
+        raise Overloaded("compute")
+
+    monkeypatch.setattr(main.compute, "run", overloaded)
+
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+
+    assert client.get(url).status_code == 200
+    assert client.get(url, params={"limit": 10}).status_code == 503  # pages still run on it
+
+
+def test_brotli_is_served_when_accepted(client):
+    pytest.importorskip("brotli")
+    url = f"/players/{PREDICTION_YEAR}/table"
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    resp = client.get(url, headers={"Accept-Encoding": "br, gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "br"
+    assert resp.content == plain.content  # decoded by the test client
@@ -0,0 +1,45 @@
+# tests/test_tuning.py
+#
+# Config selection must not look at the rows a fold is scored on.
+
+import time
+
+import numpy as np
+import pytest
+
+from src.features import load_and_prepare_master
+from src.model import DEFAULT_MODEL_PARAMS
+from src.tuning import build_folds, evaluate_params
+
+TRAIN_YEARS = [2023, 2024]
+
+
+@pytest.fixture(scope="module")
+def folds():
+    return build_folds(load_and_prepare_master(), TRAIN_YEARS)
+
+
+def test_folds_partition_sold_rows(folds):
+    master = load_and_prepare_master()
+    sold = ((master["final_price"] > 0) & master["year"].isin(TRAIN_YEARS)).sum()
+    assert sum(len(f["y_held"]) for f in folds) == sold
+    for fold in folds:
+        assert len(fold["y_train"]) + len(fold["y_val"]) + len(fold["y_held"]) == sold
+        assert len(fold["y_val"]) > 0
+
+
+def test_selection_ignores_held_out_targets(folds):
+    rng = np.random.default_rng(0)
+    scrambled = [{**f, "y_held": rng.permutation(f["y_held"]) + 3.0} for f in folds]
+
+    clean = evaluate_params(DEFAULT_MODEL_PARAMS, folds, 200)
+    noisy = evaluate_params(DEFAULT_MODEL_PARAMS, scrambled, 200)
+
+    assert noisy["best_rounds"] == clean["best_rounds"]
+    assert noisy["blend_weight"] == clean["blend_weight"]
+    assert noisy["val_log_rmse"] == clean["val_log_rmse"]
+    assert noisy["log_rmse"] != clean["log_rmse"]
+
+
+def test_gives_up_after_deadline(folds):
+    assert evaluate_params(DEFAULT_MODEL_PARAMS, folds, 200, deadline=time.time() - 1) is None
@@ -0,0 +1,71 @@
+import argparse  # CLI flags
+import json  # machine-readable report
+
+import pandas as pd  # rung table
+
+from src.config import PREDICTION_YEAR
+from src.features import load_and_prepare_master
+from src.model import train_and_register
+from src.registry import default_train_years
+from src.tuning import successive_halving
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Tune LightGBM, KNN k and the blend weight, then train and register the winner."
+    )
+    parser.add_argument("--year", type=int, default=PREDICTION_YEAR, help="prediction year")
+    parser.add_argument(
+        "--budget", type=float, default=300.0, help="wall-clock budget for the search, in seconds"
+    )
+    parser.add_argument("--configs", type=int, default=27, help="configs in the first rung")
+    parser.add_argument("--eta", type=int, default=3, help="keep the best 1/eta per rung")
+    parser.add_argument(
+        "--max-rounds", type=int, default=2000, help="boosting rounds in the last rung"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: TRAIN_MAX_WORKERS)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="also write the tuning report here (JSON)")
+    parser.add_argument(
+        "--no-train", action="store_true", help="only search; do not train or register a model"
+    )
+    args = parser.parse_args()
+
+    master_df = load_and_prepare_master()
+    master_df = master_df[master_df["year"] <= args.year]
+    train_years = default_train_years(master_df["year"].dropna().unique(), args.year)
+
+    report = successive_halving(
+        master_df,
+        train_years,
+        budget_seconds=args.budget,
+        n_configs=args.configs,
+        eta=args.eta,
+        max_rounds=args.max_rounds,
+        workers=args.workers,
+        seed=args.seed,
+    )
+
+    print("\nSuccessive halving rungs:")
+    print(pd.DataFrame(report["rungs"]).to_string(index=False))
+    print(f"\nBaseline log RMSE: {report['baseline']['log_rmse']:.4f}")
+    print(f"Best log RMSE:     {report['best']['log_rmse']:.4f}")
+    print(json.dumps(report["best"]["params"], indent=2))
+    print(
+        f"\nSearch took {report['wall_seconds']:.1f}s of a {report['budget_seconds']:.0f}s budget"
+        + (" (stopped by budget)" if report["stopped_by_budget"] else "")
+    )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.no_train:
+        _, key, model_dir, _ = train_and_register(
+            prediction_year=args.year,
+            train_years=train_years,
+            params=report["best"]["params"],
+            info={"tuning": {k: v for k, v in report.items() if k != "best"}},
+        )
+        print(f"\nRegistered tuned model {key.dirname} in {model_dir}")
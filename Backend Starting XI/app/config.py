@@ -2,6 +2,7 @@
 Global config: paths, constants, team codes, wicket-keepers.
 """
 
+import os
 from pathlib import Path
 
 # Root project directory (this file is in app/, so go up one level)
@@ -25,6 +26,22 @@ PLAYERS_XI_CSV = DATA_DIR / "players.csv"
 # Model path
 PLAYER_SCORE_MODEL_PATH = MODELS_DIR / "player_score_model.joblib"
 
+# On-demand request profiling (X-Profile: 1 header or ?profile=1).
+# Comma-separated client hosts allowed to use it; "*" = any, empty = off.
+PROFILING_ALLOWED_CLIENTS = [
+    h.strip() for h in os.environ.get("XI_PROFILING_ALLOWED_CLIENTS", "").split(",") if h.strip()
+]
+PROFILE_STORE_SIZE = 50  # reports kept in memory
+PROFILE_TOP_N = 25  # rows per table in a report
+
+# Request executors: CPU-bound handler work runs here, off the event loop.
+# Calls beyond workers + queue are shed with 503 (Retry-After below).
+COMPUTE_MAX_WORKERS = max(2, os.cpu_count() or 1)  # threads: XI selection, stats load
+COMPUTE_MAX_QUEUE = 32
+HEAVY_MAX_WORKERS = 1  # processes: model training (the forest already uses every core)
+HEAVY_MAX_QUEUE = 1
+OVERLOAD_RETRY_AFTER_SECONDS = 1
+
 # Known IPL team codes (must match TEAM column values in stats CSV)
 TEAM_CODES = ["CSK", "DC", "GT", "KKR", "LSG", "MI", "PK", "RCB", "RR", "SRH"]
 
@@ -0,0 +1,40 @@
+"""
+executor.py
+
+Bounded executors (shared/executor.py) reporting to this app's executor
+metrics, with its Retry-After.
+"""
+
+from shared.executor import BoundedExecutor as _BoundedExecutor
+from shared.executor import ExecutorMetrics, Overloaded
+
+from .config import OVERLOAD_RETRY_AFTER_SECONDS
+from .metrics import (
+    EXECUTOR_COMPUTE_SECONDS,
+    EXECUTOR_IN_FLIGHT,
+    EXECUTOR_QUEUE_WAIT_SECONDS,
+    EXECUTOR_REJECTED,
+)
+
+EXECUTOR_METRICS = ExecutorMetrics(
+    queue_wait=EXECUTOR_QUEUE_WAIT_SECONDS,
+    compute=EXECUTOR_COMPUTE_SECONDS,
+    in_flight=EXECUTOR_IN_FLIGHT,
+    rejected=EXECUTOR_REJECTED,
+)
+
+
+class BoundedExecutor(_BoundedExecutor):
+    """
+    shared.executor.BoundedExecutor on the xi_executor_* metrics.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, kind: str = "thread") -> None:
+        super().__init__(
+            name,
+            max_workers,
+            max_queue,
+            kind,
+            metrics=EXECUTOR_METRICS,
+            retry_after=OVERLOAD_RETRY_AFTER_SECONDS,
+        )
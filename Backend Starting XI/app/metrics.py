@@ -0,0 +1,119 @@
+"""
+metrics.py
+
+Prometheus metrics for the Starting XI API:
+- per-stage latency of loading stats, scoring a team and selecting the XI
+- per-route request latency
+- player stats cache hits / misses and model load times
+- executor queue wait vs compute time, in-flight calls and shed requests
+
+Exposed on GET /metrics.
+"""
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Latency buckets (seconds)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+STAGE_SECONDS = Histogram(
+    "xi_stage_seconds",
+    "Time spent in one stage of stats loading, team scoring or XI selection.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "xi_http_request_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+PLAYERS_CACHE_REQUESTS = Counter(
+    "xi_players_cache_requests_total",
+    "In-memory player stats lookups by result (hit / miss = reload from CSV).",
+    ["result"],
+)
+
+MODEL_LOAD_SECONDS = Histogram(
+    "xi_model_load_seconds",
+    "Time to load the player score model bundle from disk.",
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_LOADED = Gauge(
+    "xi_model_loaded",
+    "1 if a trained player score model is loaded, else 0 (rule-based scoring).",
+)
+
+EXECUTOR_QUEUE_WAIT_SECONDS = Histogram(
+    "xi_executor_queue_wait_seconds",
+    "Time a request's CPU work waited for a free executor worker.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+EXECUTOR_COMPUTE_SECONDS = Histogram(
+    "xi_executor_compute_seconds",
+    "Time a request's CPU work ran on an executor worker.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+EXECUTOR_IN_FLIGHT = Gauge(
+    "xi_executor_in_flight",
+    "Calls queued or running per executor.",
+    ["pool"],
+)
+EXECUTOR_REJECTED = Counter(
+    "xi_executor_rejected_total",
+    "Calls shed with 503 because the executor was at its queue limit.",
+    ["pool"],
+)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    Time the enclosed block into xi_stage_seconds{stage=...}.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+class StageClock:
+    """
+    Consecutive stages of one long function: lap(stage) records the time
+    since the previous lap (or since the clock was created).
+    """
+
+    def __init__(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        STAGE_SECONDS.labels(stage=stage).observe(now - self._last)
+        self._last = now
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=str(status)).observe(seconds)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    (body, content type) of the current metrics in Prometheus text format.
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -13,6 +13,7 @@ from joblib import dump, load
 from sklearn.ensemble import RandomForestRegressor
 
 from .config import PLAYER_SCORE_MODEL_PATH
+from .metrics import MODEL_LOADED, MODEL_LOAD_SECONDS
 from .scoring import compute_player_score
 
 
@@ -87,9 +88,11 @@ def load_player_score_model() -> Dict[str, Any]:
     Load model bundle {model, feature_cols} if exists; else return {}.
     """
     try:
-        bundle = load(PLAYER_SCORE_MODEL_PATH)
+        with MODEL_LOAD_SECONDS.time():
+            bundle = load(PLAYER_SCORE_MODEL_PATH)
         if not isinstance(bundle, dict):
             return {}
+        MODEL_LOADED.set(1 if bundle.get("model") is not None else 0)
         return bundle
     except FileNotFoundError:
         return {}
@@ -0,0 +1,37 @@
+"""
+profiling.py
+
+Request profiling (shared/profiling.py) with this app's allowlist and
+report sizes from config.
+"""
+
+from typing import Optional
+
+from shared import profiling as _shared
+from shared.profiling import (
+    REQUEST_ID_HEADER,
+    ProfiledRoute,
+    ProfileSession,
+    ProfileStore,
+    current_session,
+)
+
+from .config import PROFILING_ALLOWED_CLIENTS, PROFILE_STORE_SIZE, PROFILE_TOP_N
+
+profiles = ProfileStore(PROFILE_STORE_SIZE)
+
+
+def profiling_allowed(client_host: Optional[str]) -> bool:
+    """
+    Server-side allowlist (PROFILING_ALLOWED_CLIENTS); empty disables
+    profiling, "*" allows any client.
+    """
+    return _shared.client_allowed(client_host, PROFILING_ALLOWED_CLIENTS)
+
+
+def start_session(request) -> Optional[ProfileSession]:
+    """
+    Called by the HTTP middleware: a ProfileSession for this request if it
+    asked for profiling and the client is allowlisted, else None.
+    """
+    return _shared.start_session(request, PROFILING_ALLOWED_CLIENTS, PROFILE_TOP_N)
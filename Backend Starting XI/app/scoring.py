@@ -17,6 +17,7 @@ import pandas as pd
 from pathlib import Path
 from typing import Optional, Dict, Any, Any as AnyType
 
+from .metrics import StageClock
 from .config import (
     PLAYERS_STATS_CSV,
     CURRENT_SEASON_STATS_CSV,
@@ -56,8 +57,10 @@ def load_players_stats() -> pd.DataFrame:
     Final player stats DataFrame:
       base stats + current-season override if file exists.
     """
+    clock = StageClock()
     base_df = pd.read_csv(PLAYERS_STATS_CSV)
     base_df = _clean_players_df(base_df)
+    clock.lap("stats.load_base")
 
     current_path: Path = CURRENT_SEASON_STATS_CSV
     if current_path.exists():
@@ -88,6 +91,7 @@ def load_players_stats() -> pd.DataFrame:
             final_df = base_df
     else:
         final_df = base_df
+    clock.lap("stats.merge_current_season")
 
     return final_df
 
@@ -290,11 +294,15 @@ def compute_scores_for_team(
     current squad for that team.
     """
 
+    clock = StageClock()
+
     # Filter team
     df_team = players_df[players_df["TEAM"] == team_code].copy()
+    clock.lap("scores.filter_team")
 
     # Apply current squad filter if players.csv exists
     df_team = _apply_squad_filter(df_team, team_code)
+    clock.lap("scores.squad_filter")
 
     if df_team.empty:
         # Safety net: still don't break
@@ -311,18 +319,22 @@ def compute_scores_for_team(
         if model is not None and feature_cols:
             X = df_team[feature_cols].fillna(0.0)
             df_team["final_score"] = model.predict(X)
+            clock.lap("scores.predict_model")
         else:
             df_team["final_score"] = df_team.apply(
                 lambda r: compute_player_score(r, pitch_type, toss_decision), axis=1
             )
+            clock.lap("scores.predict_rules")
     else:
         df_team["final_score"] = df_team.apply(
             lambda r: compute_player_score(r, pitch_type, toss_decision), axis=1
         )
+        clock.lap("scores.predict_rules")
 
     # Mark overseas + keeper flags
     df_team["is_overseas"] = df_team["COUNTRY"] != "IND"
     df_team["is_keeper"] = df_team["Player"].isin(WICKET_KEEPERS)
 
     df_team = df_team.sort_values("final_score", ascending=False)
+    clock.lap("scores.flags_sort")
     return df_team
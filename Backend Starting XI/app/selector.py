@@ -19,6 +19,7 @@ from typing import Tuple, Optional, Dict, Any
 
 import pandas as pd
 
+from .metrics import StageClock
 from .scoring import compute_scores_for_team
 from .stadiums import get_pitch_info_smart
 
@@ -56,6 +57,8 @@ def select_starting_xi(
       - pitch_notes: textual description of the pitch
     """
 
+    clock = StageClock()
+
     # 1) Resolve pitch context
     pitch_info = get_pitch_info_smart(venue_query)
     if pitch_info is None:
@@ -64,6 +67,7 @@ def select_starting_xi(
     else:
         pitch_type = pitch_info["pitch_type"]
         pitch_notes = pitch_info["notes"]
+    clock.lap("xi.pitch_lookup")
 
     # 2) Compute scores for all players of the team (after any squad filter)
     df_team = compute_scores_for_team(
@@ -73,6 +77,7 @@ def select_starting_xi(
         toss_decision=toss_decision,
         model_bundle=model_bundle,
     )
+    clock.lap("xi.score_team")
 
     if df_team.empty:
         # Nothing to pick, return empty
@@ -114,6 +119,7 @@ def select_starting_xi(
     xi_df = df_team[df_team["Player"].isin(selected_names)].copy()
     xi_df = xi_df.sort_values("final_score", ascending=False)
     remaining = df_team[~df_team["Player"].isin(selected_names)].copy()
+    clock.lap("xi.initial_pick")
 
     # If somehow we still have < 11 (not enough players), just proceed with what we have
     if xi_df.empty:
@@ -261,6 +267,8 @@ def select_starting_xi(
             # No more adjustments possible
             break
 
+    clock.lap("xi.bowler_swaps")
+
     # 6) Enforce allrounder rule: if exactly 4 bowlers, need at least 2 allrounders
     counts = _recompute_counts(xi_df)
     bowler_count = counts["bowlers"]
@@ -324,6 +332,8 @@ def select_starting_xi(
             if not swapped:
                 break
 
+    clock.lap("xi.allrounder_swaps")
+
     # 7) Ensure at least 1 keeper if team has a keeper at all
     counts = _recompute_counts(xi_df)
     keeper_count = counts["keepers"]
@@ -366,6 +376,8 @@ def select_starting_xi(
                         )
                         break
 
+    clock.lap("xi.keeper_swap")
+
     # 8) Final XI sorted by score
     xi_df = xi_df.sort_values("final_score", ascending=False)
 
@@ -389,5 +401,6 @@ def select_starting_xi(
             ).iloc[0]
         else:
             impact_row = preferred.iloc[0]
+    clock.lap("xi.impact_pick")
 
     return xi_df, impact_row, pitch_type, pitch_notes
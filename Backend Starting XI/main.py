@@ -9,12 +9,28 @@ Run with:
     uvicorn main:app --reload
 """
 
+import time
 from typing import List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config import TEAM_CODES
+from app.config import (
+    COMPUTE_MAX_QUEUE,
+    COMPUTE_MAX_WORKERS,
+    HEAVY_MAX_QUEUE,
+    HEAVY_MAX_WORKERS,
+    TEAM_CODES,
+)
+from app.executor import BoundedExecutor
+from app.metrics import MODEL_LOADED, PLAYERS_CACHE_REQUESTS, observe_request, render_latest
+from app.profiling import (
+    REQUEST_ID_HEADER,
+    ProfiledRoute,
+    profiles,
+    profiling_allowed,
+    start_session,
+)
 from app.scoring import load_players_stats
 from app.selector import select_starting_xi
 from app.model_service import train_player_score_model, load_player_score_model
@@ -31,6 +47,9 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Every route declared below can be profiled on request (see app/profiling.py)
+app.router.route_class = ProfiledRoute
+
 # -------------------------------------------------------------------
 # ✅ CORS: allow React Frontend to call this API
 # -------------------------------------------------------------------
@@ -42,12 +61,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Request latency histogram per route template."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    observe_request(
+        request.method,
+        getattr(route, "path", "unmatched"),
+        response.status_code,
+        time.perf_counter() - start,
+    )
+    return response
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Store a profile for requests that asked for one (allowlisted clients)."""
+    session = start_session(request)
+    response = await call_next(request)
+    if session is not None:
+        response.headers[REQUEST_ID_HEADER] = session.request_id
+        if session.report is not None:
+            profiles.put(session.report)
+            response.headers["X-Profile-Url"] = f"/profiles/{session.request_id}"
+    return response
+
+
 # -------------------------------------------------------------------
 # Global in-memory state
 # -------------------------------------------------------------------
 players_df = None
 model_bundle = {}  # {"model": ..., "feature_cols": [...]}
 
+# CPU-bound handler work runs here instead of on the event loop; beyond
+# workers + queue, requests get 503 (see app/executor.py)
+compute = BoundedExecutor("compute", COMPUTE_MAX_WORKERS, COMPUTE_MAX_QUEUE)
+heavy = BoundedExecutor("heavy", HEAVY_MAX_WORKERS, HEAVY_MAX_QUEUE, kind="process")
+
 
 @app.on_event("startup")
 def startup_event():
@@ -57,37 +110,84 @@ def startup_event():
     model_bundle = load_player_score_model()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    compute.shutdown()
+    heavy.shutdown()
+
+
+async def get_players_df():
+    """In-memory player stats, reloaded from CSV on the compute executor if missing."""
+    global players_df
+    if players_df is None:
+        PLAYERS_CACHE_REQUESTS.labels(result="miss").inc()
+        players_df = await compute.run(load_players_stats)
+    else:
+        PLAYERS_CACHE_REQUESTS.labels(result="hit").inc()
+    return players_df
+
+
 @app.get("/")
-def root():
+async def root():
     return {
         "message": "IPL Starting XI Predictor is running. Visit /docs for interactive API docs."
     }
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage / route latency, cache hits, model load times."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+def require_profiling_client(request: Request) -> None:
+    client = request.client.host if request.client else None
+    if not profiling_allowed(client):
+        raise HTTPException(status_code=403, detail="Profiling is not enabled for this client.")
+
+
+@app.get("/profiles")
+async def list_profiles(request: Request):
+    """Stored request profiles, newest first (allowlisted clients only)."""
+    require_profiling_client(request)
+    return {"profiles": profiles.list()}
+
+
+@app.get("/profiles/{request_id}")
+async def get_profile(request_id: str, request: Request):
+    """Top functions, pandas call counts and allocations for one request."""
+    require_profiling_client(request)
+    report = profiles.get(request_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"No profile stored for request {request_id}.")
+    return report
+
+
 # -------------------------------------------------------------------
 # 🚀 Train Model
 # -------------------------------------------------------------------
 @app.post("/train-model", response_model=TrainResponse)
-def train_model():
+async def train_model():
     """
     Train the player score ML model and save it to disk.
     Uses merged (base + current season) player stats.
+    Runs in the heavy (process) executor; one training at a time.
     """
-    global players_df, model_bundle
-
-    if players_df is None:
-        players_df = load_players_stats()
+    global model_bundle
 
-    model_bundle = train_player_score_model(players_df)
+    df = await get_players_df()
+    model_bundle = await heavy.run(train_player_score_model, df)
+    MODEL_LOADED.set(1)
 
     return TrainResponse(
         message="Model trained and saved successfully.",
-        used_players=len(players_df),
+        used_players=len(df),
     )
 
 
@@ -95,7 +195,7 @@ def train_model():
 # 🎯 Predict Starting XI + Impact Player
 # -------------------------------------------------------------------
 @app.post("/predict-xi", response_model=PredictXIResponse)
-def predict_xi(payload: PredictXIRequest):
+async def predict_xi(payload: PredictXIRequest):
     """
     Predict starting XI + Impact player for:
     - team_code
@@ -103,17 +203,15 @@ def predict_xi(payload: PredictXIRequest):
     - toss_decision ("bat" / "bowl")
     """
 
-    global players_df, model_bundle
-
     team_code = payload.team_code.upper()
     if team_code not in TEAM_CODES:
         raise HTTPException(status_code=400, detail=f"Unknown team_code: {team_code}")
 
-    if players_df is None:
-        players_df = load_players_stats()
+    df = await get_players_df()
 
-    xi_df, impact_row, pitch_type, pitch_notes = select_starting_xi(
-        players_df=players_df,
+    xi_df, impact_row, pitch_type, pitch_notes = await compute.run(
+        select_starting_xi,
+        players_df=df,
         team_code=team_code,
         venue_query=payload.venue,
         toss_decision=payload.toss_decision.lower(),
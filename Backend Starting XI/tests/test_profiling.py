@@ -0,0 +1,30 @@
+# tests/test_profiling.py
+#
+# The profiler itself is shared/profiling.py (covered by the Auction app's
+# tests); this checks the Starting XI wiring: allowlist, middleware and
+# the /profiles routes.
+
+from fastapi.testclient import TestClient
+
+import main
+from app import profiling
+from app.config import PROFILE_TOP_N
+
+
+def test_profiled_request_is_stored_for_allowlisted_clients(monkeypatch):
+    client = TestClient(main.app)
+
+    monkeypatch.setattr(profiling, "PROFILING_ALLOWED_CLIENTS", [])
+    resp = client.get("/health", params={"profile": 1})
+    assert resp.status_code == 200
+    assert "X-Profile-Url" not in resp.headers
+
+    monkeypatch.setattr(profiling, "PROFILING_ALLOWED_CLIENTS", ["*"])
+    resp = client.get("/health", headers={"X-Profile": "1", "X-Request-Id": "xi-test"})
+    assert resp.status_code == 200
+    assert resp.headers["X-Profile-Url"] == "/profiles/xi-test"
+
+    report = client.get("/profiles/xi-test").json()
+    assert report["path"] == "/health"
+    assert 0 < len(report["top_cumulative"]) <= PROFILE_TOP_N
+    assert any(p["request_id"] == "xi-test" for p in client.get("/profiles").json()["profiles"])
@@ -0,0 +1,2 @@
+# Code used by both backends (Backend Auction, Backend Starting XI); each
+# app's package puts the repo root on sys.path so this imports as `shared`.
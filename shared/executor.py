@@ -0,0 +1,165 @@
+# shared/executor.py
+#
+# Bounded executors for the CPU-bound part of request handlers, shared by
+# both backends. Each app passes its own metrics and Retry-After (its
+# executor.py).
+
+import asyncio
+import cProfile
+import multiprocessing  # spawn context for the process pool
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+
+from .profiling import current_session
+
+
+class ExecutorMetrics(NamedTuple):
+    """
+    The app's Prometheus collectors for executor calls, each labelled by pool.
+    """
+
+    queue_wait: object  # Histogram, seconds from submit to start
+    compute: object  # Histogram, seconds running on the worker
+    in_flight: object  # Gauge, calls queued or running
+    rejected: object  # Counter, calls shed with 503
+
+
+class Overloaded(HTTPException):
+    """
+    503 + Retry-After: the executor already has max_workers calls running
+    and max_queue waiting. An HTTPException, so handlers' `except
+    HTTPException: raise` lets it through unchanged.
+    """
+
+    def __init__(self, pool: str, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({pool} queue full). Retry shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _timed_call(fn, args: tuple, kwargs: dict, profile: bool = False):
+    # Runs on the worker: (start wall time, compute seconds, result, profiler).
+    # Wall time, not perf_counter, so process workers compare with the parent.
+    started = time.time()
+    t0 = time.perf_counter()
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None  # another profiler owns this thread (3.12+)
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    return started, time.perf_counter() - t0, result, profiler
+
+
+class BoundedExecutor:
+    """
+    Fixed-size worker pool for the CPU-bound part of request handlers, so
+    it never runs on the event loop (health checks and cheap lookups stay
+    responsive) and never queues without bound.
+
+    - at most max_workers calls run at once and max_queue more wait; past
+      that, run() raises Overloaded (503) instead of queueing
+    - queue wait (submit -> start) and compute time are recorded separately
+    - kind="process": spawned process pool for heavy jobs (fn and
+      arguments must be picklable; stage spans inside it are not exported)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        kind: str = "thread",
+        *,
+        metrics: ExecutorMetrics,
+        retry_after: int = 1,
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError("kind must be 'thread' or 'process'.")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.metrics = metrics
+        self.retry_after = retry_after
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def _get_pool(self) -> Executor:
+        # Caller holds self._lock
+        if self._pool is None:
+            if self.kind == "thread":
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            else:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._pool
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.metrics.in_flight.labels(pool=self.name).set(self._in_flight)
+
+    async def run(self, fn, *args, shed: bool = True, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the pool and await its result.
+
+        shed=False skips the queue limit, for follow-up work of a request
+        that was already admitted (e.g. the next chunk of a stream).
+        """
+        session = current_session() if self.kind == "thread" else None
+        with self._lock:
+            if shed and self._in_flight >= self.max_workers + self.max_queue:
+                self.metrics.rejected.labels(pool=self.name).inc()
+                raise Overloaded(self.name, self.retry_after)
+            self._in_flight += 1
+            self.metrics.in_flight.labels(pool=self.name).set(self._in_flight)
+            try:
+                submitted = time.time()
+                future = self._get_pool().submit(
+                    _timed_call, fn, args, kwargs, session is not None
+                )
+            except BaseException:
+                self._in_flight -= 1
+                self.metrics.in_flight.labels(pool=self.name).set(self._in_flight)
+                raise
+        future.add_done_callback(self._release)
+
+        started, compute, result, profiler = await asyncio.wrap_future(future)
+        queue_wait = max(0.0, started - submitted)
+        self.metrics.queue_wait.labels(pool=self.name).observe(queue_wait)
+        self.metrics.compute.labels(pool=self.name).observe(compute)
+        if session is not None:
+            session.add_offloaded(self.name, queue_wait, compute, profiler)
+        return result
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,307 @@
+# shared/profiling.py
+#
+# On-demand request profiling, shared by both backends: with an
+# `X-Profile: 1` header (or `?profile=1`) from an allowlisted client, the
+# endpoint runs under cProfile + tracemalloc and a report is stored under
+# the request id. Each app binds its own allowlist and sizes (its
+# profiling.py).
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+REQUEST_ID_HEADER = "X-Request-Id"
+
+# Defaults; each app passes its own from its config
+PROFILE_STORE_SIZE = 50  # reports kept in memory
+PROFILE_TOP_N = 25  # rows per table in a report
+
+# Only one request is profiled at a time: tracemalloc is process-wide and
+# overlapping cProfile sessions would mix their samples. Never waited on:
+# async endpoints take it on the event-loop thread, where blocking would
+# stall the loop the holder needs to finish (see ProfilerBusy)
+_profile_lock = threading.Lock()
+
+# Set by the middleware for requests that asked for (and may use) profiling
+_current_session: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+class ProfilerBusy(HTTPException):
+    """
+    503 + Retry-After for a profiled request that overlaps another one.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=503,
+            detail="Profiler busy with another request. Retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _func_label(func: tuple) -> str:
+    filename, line, name = func
+    return f"{filename}:{line}({name})"
+
+
+class ProfileSession:
+    """
+    One profiled request: runs the endpoint under cProfile + tracemalloc and
+    keeps the summarized report.
+    """
+
+    def __init__(self, request_id: str, method: str, path: str, top_n: int = PROFILE_TOP_N) -> None:
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.top_n = max(1, int(top_n))
+        self.report: Optional[dict] = None
+        # Work the endpoint handed to an executor (see shared/executor.py)
+        self.offloaded: list[dict] = []
+        self._worker_profilers: list[cProfile.Profile] = []
+
+    def _start(self):
+        if not _profile_lock.acquire(blocking=False):
+            raise ProfilerBusy()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        t0 = time.perf_counter()
+        profiler.enable()
+        return profiler, before, started_tracing, t0
+
+    def _stop(self, profiler, before, started_tracing, t0) -> None:
+        try:
+            profiler.disable()
+            seconds = time.perf_counter() - t0
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self.report = self._summarize(profiler, before, after, peak, seconds)
+        finally:
+            _profile_lock.release()
+
+    def run(self, fn, *args, **kwargs):
+        state = self._start()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._stop(*state)
+
+    async def run_async(self, fn, *args, **kwargs):
+        # Coroutine endpoints: profiles the event-loop thread while awaiting,
+        # so work other requests do meanwhile can show up too. Work sent to
+        # a thread executor is profiled there and merged in (add_offloaded)
+        state = self._start()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            self._stop(*state)
+
+    def add_offloaded(
+        self,
+        pool: str,
+        queue_wait: float,
+        compute: float,
+        profiler: Optional[cProfile.Profile] = None,
+    ) -> None:
+        """
+        Record one executor call made by the profiled endpoint. A profiler
+        from the worker thread is merged into the report; process pool
+        work is only timed.
+        """
+        self.offloaded.append(
+            {
+                "pool": pool,
+                "queue_wait_seconds": queue_wait,
+                "compute_seconds": compute,
+                "profiled": profiler is not None,
+            }
+        )
+        if profiler is not None:
+            self._worker_profilers.append(profiler)
+
+    def _summarize(self, profiler, before, after, peak_bytes: int, seconds: float) -> dict:
+        stats = pstats.Stats(profiler)
+        for worker_profiler in self._worker_profilers:
+            stats.add(worker_profiler)
+        rows = []
+        for func, (cc, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append(
+                {
+                    "function": _func_label(func),
+                    "ncalls": ncalls,
+                    "primitive_calls": cc,
+                    "tottime": tottime,
+                    "cumtime": cumtime,
+                }
+            )
+
+        def top(key: str, subset=None) -> list[dict]:
+            return sorted(subset if subset is not None else rows, key=lambda r: r[key], reverse=True)[
+                : self.top_n
+            ]
+
+        pandas_rows = [r for r in rows if "/pandas/" in r["function"].replace("\\", "/")]
+
+        alloc = after.compare_to(before, "lineno")
+        allocations = [
+            {
+                "location": str(stat.traceback),
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in alloc[: self.top_n]
+        ]
+
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "profiled_at": time.time(),
+            "seconds": seconds,
+            "total_calls": stats.total_calls,
+            "top_cumulative": top("cumtime"),
+            "top_self": top("tottime"),
+            "pandas": {
+                "calls": sum(r["ncalls"] for r in pandas_rows),
+                "functions": len(pandas_rows),
+                "seconds_self": sum(r["tottime"] for r in pandas_rows),
+                "top_by_calls": top("ncalls", pandas_rows),
+            },
+            "allocations": {
+                "peak_traced_bytes": peak_bytes,
+                "top_lines": allocations,
+            },
+            "offloaded": self.offloaded,
+        }
+
+
+class ProfileStore:
+    """
+    Last `max_size` reports, keyed by request id.
+    """
+
+    def __init__(self, max_size: int = PROFILE_STORE_SIZE) -> None:
+        self.max_size = max(1, int(max_size))
+        self._reports: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, report: dict) -> None:
+        with self._lock:
+            self._reports[report["request_id"]] = report
+            self._reports.move_to_end(report["request_id"])
+            while len(self._reports) > self.max_size:
+                self._reports.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._reports.get(request_id)
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "request_id": r["request_id"],
+                    "method": r["method"],
+                    "path": r["path"],
+                    "profiled_at": r["profiled_at"],
+                    "seconds": r["seconds"],
+                }
+                for r in reversed(self._reports.values())
+            ]
+
+
+def client_allowed(client_host: Optional[str], allowed_clients) -> bool:
+    """
+    Server-side allowlist check; an empty allowlist disables profiling,
+    "*" allows any client.
+    """
+    if not allowed_clients:
+        return False
+    return "*" in allowed_clients or client_host in allowed_clients
+
+
+def profiling_requested(headers, query_params) -> bool:
+    flag = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM)
+    return flag is not None and flag.strip().lower() in ("1", "true", "yes", "on")
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _current_session.get()
+
+
+def start_session(
+    request, allowed_clients, top_n: int = PROFILE_TOP_N
+) -> Optional[ProfileSession]:
+    """
+    Called by the HTTP middleware: a ProfileSession for this request if it
+    asked for profiling and the client is in `allowed_clients`, else None.
+    """
+    if not profiling_requested(request.headers, request.query_params):
+        return None
+    client = request.client.host if request.client else None
+    if not client_allowed(client, allowed_clients):
+        return None
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    session = ProfileSession(request_id, request.method, request.url.path, top_n)
+    _current_session.set(session)
+    return session
+
+
+def profiled(endpoint):
+    """
+    Wrap an endpoint so it runs under the request's ProfileSession, if any.
+    Keeps the signature (FastAPI reads it through __wrapped__) and whether
+    the endpoint is sync or async.
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            session = _current_session.get()
+            if session is None:
+                return await endpoint(*args, **kwargs)
+            return await session.run_async(endpoint, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        # Sync endpoints run in the threadpool; the context (and session)
+        # is copied into the worker thread
+        session = _current_session.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        return session.run(endpoint, *args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route class that makes every endpoint profilable on request.
+    Use as app.router.route_class before declaring routes.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs) -> None:
+        super().__init__(path, profiled(endpoint), **kwargs)